@@ -11,6 +11,13 @@ from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+# orjson serializes row lists and datetimes natively and much faster than json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
 # Load environment variables
 load_dotenv()
 
@@ -45,7 +52,7 @@ async def lifespan(app: FastAPI):
     logger.info("Initializing Zero Gate ESO Platform...")
     
     # Initialize resource monitoring
-    resource_monitor.start()
+    await resource_monitor.start()
     
     # Initialize database
     db_manager = DatabaseManager()
@@ -67,7 +74,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown: Clean up resources
     logger.info("Shutting down Zero Gate platform...")
-    resource_monitor.stop()
+    await resource_monitor.stop()
     await db_manager.close()
 
 # Create FastAPI application
@@ -75,7 +82,8 @@ app = FastAPI(
     title="Zero Gate ESO Platform",
     description="Multi-Tenant Platform for Entrepreneur Support Organizations",
     version="2.5.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=DefaultResponse
 )
 
 # Add middleware
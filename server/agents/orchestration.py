@@ -4,16 +4,18 @@ Manages workflow tasks with intelligent resource monitoring and feature toggling
 """
 
 import asyncio
+import itertools
 import json
 import logging
 import time
 from datetime import datetime, timedelta
-from enum import Enum
+from enum import Enum, IntFlag, auto
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, field, asdict
 from concurrent.futures import ThreadPoolExecutor
 import psutil
 import threading
+from collections import deque
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,15 +35,29 @@ class Priority(Enum):
     HIGH = 3
     CRITICAL = 4
 
-class FeatureFlag(Enum):
-    SPONSOR_ANALYSIS = "sponsor_analysis"
-    GRANT_TIMELINE = "grant_timeline"
-    RELATIONSHIP_MAPPING = "relationship_mapping"
-    ADVANCED_ANALYTICS = "advanced_analytics"
-    EXCEL_PROCESSING = "excel_processing"
-    EMAIL_ANALYSIS = "email_analysis"
+class FeatureFlag(IntFlag):
+    SPONSOR_ANALYSIS = auto()
+    GRANT_TIMELINE = auto()
+    RELATIONSHIP_MAPPING = auto()
+    ADVANCED_ANALYTICS = auto()
+    EXCEL_PROCESSING = auto()
+    EMAIL_ANALYSIS = auto()
 
-@dataclass
+    @property
+    def key(self) -> str:
+        """Lower-case feature name used in logs and status payloads"""
+        return self.name.lower()
+
+ALL_FEATURES = FeatureFlag(sum(FeatureFlag))
+INTENSIVE_FEATURES = FeatureFlag.ADVANCED_ANALYTICS | FeatureFlag.EXCEL_PROCESSING
+NON_ESSENTIAL_FEATURES = (
+    INTENSIVE_FEATURES | FeatureFlag.EMAIL_ANALYSIS | FeatureFlag.RELATIONSHIP_MAPPING
+)
+STANDARD_FEATURES = (
+    FeatureFlag.SPONSOR_ANALYSIS | FeatureFlag.GRANT_TIMELINE | FeatureFlag.RELATIONSHIP_MAPPING
+)
+
+@dataclass(frozen=True, slots=True)
 class ResourceThresholds:
     """Resource usage thresholds per attached asset specifications"""
     cpu_high: float = 65.0      # As specified in attached assets
@@ -70,6 +86,7 @@ class WorkflowTask:
     max_retries: int = 3
     estimated_duration: int = 300  # seconds
     dependencies: List[str] = field(default_factory=list)
+    done_event: asyncio.Event = field(default_factory=asyncio.Event, repr=False, compare=False)
 
 @dataclass
 class ResourceMetrics:
@@ -82,17 +99,39 @@ class ResourceMetrics:
     active_processes: int
     load_average: List[float]
 
+def sample_system_metrics() -> ResourceMetrics:
+    """Sample current system resource metrics via psutil (blocking)"""
+    cpu_percent = psutil.cpu_percent(interval=1)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    network = psutil.net_io_counters()._asdict()
+    load_avg = psutil.getloadavg() if hasattr(psutil, 'getloadavg') else [0, 0, 0]
+    active_processes = len(psutil.pids())
+    
+    return ResourceMetrics(
+        cpu_percent=cpu_percent,
+        memory_percent=memory.percent,
+        disk_percent=disk.percent,
+        network_io=network,
+        timestamp=datetime.now(),
+        active_processes=active_processes,
+        load_average=list(map(float, load_avg))
+    )
+
 class ResourceMonitor:
     """Intelligent resource monitoring with feature management"""
     
-    def __init__(self, thresholds: ResourceThresholds):
+    METRICS_HISTORY_SIZE = 100
+    
+    def __init__(self, thresholds: ResourceThresholds,
+                 sampler: Callable[[], ResourceMetrics] = sample_system_metrics):
         self.thresholds = thresholds
-        self.enabled_features: Dict[FeatureFlag, bool] = {
-            feature: True for feature in FeatureFlag
-        }
-        self.metrics_history: List[ResourceMetrics] = []
+        self.sampler = sampler
+        self.enabled_mask: FeatureFlag = ALL_FEATURES
+        self.metrics_history: deque[ResourceMetrics] = deque(maxlen=self.METRICS_HISTORY_SIZE)
         self.monitoring_active = False
         self._monitor_task = None
+        self._first_sample = asyncio.Event()
         
     async def start_monitoring(self, interval: int = 30):
         """Start continuous resource monitoring"""
@@ -116,11 +155,8 @@ class ResourceMonitor:
         while self.monitoring_active:
             try:
                 metrics = await self._collect_metrics()
-                self.metrics_history.append(metrics)
-                
-                # Keep only last 100 metrics entries
-                if len(self.metrics_history) > 100:
-                    self.metrics_history = self.metrics_history[-100:]
+                self.metrics_history.append(metrics)  # Oldest entries are evicted automatically
+                self._first_sample.set()
                 
                 await self._evaluate_feature_toggles(metrics)
                 await asyncio.sleep(interval)
@@ -131,28 +167,10 @@ class ResourceMonitor:
     
     async def _collect_metrics(self) -> ResourceMetrics:
         """Collect current system resource metrics"""
-        def get_sync_metrics():
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            network = psutil.net_io_counters()._asdict()
-            load_avg = psutil.getloadavg() if hasattr(psutil, 'getloadavg') else [0, 0, 0]
-            active_processes = len(psutil.pids())
-            
-            return ResourceMetrics(
-                cpu_percent=cpu_percent,
-                memory_percent=memory.percent,
-                disk_percent=disk.percent,
-                network_io=network,
-                timestamp=datetime.now(),
-                active_processes=active_processes,
-                load_average=list(map(float, load_avg))
-            )
-        
         # Run CPU-intensive operations in thread pool
         loop = asyncio.get_event_loop()
         with ThreadPoolExecutor() as executor:
-            metrics = await loop.run_in_executor(executor, get_sync_metrics)
+            metrics = await loop.run_in_executor(executor, self.sampler)
             
         return metrics
     
@@ -177,48 +195,38 @@ class ResourceMonitor:
         else:
             await self._enable_standard_features()
     
+    @property
+    def enabled_features(self) -> Dict[FeatureFlag, bool]:
+        """Per-feature view of the enabled mask"""
+        return {feature: bool(self.enabled_mask & feature) for feature in FeatureFlag}
+    
     async def _disable_non_essential_features(self):
         """Disable non-essential features during critical resource usage"""
-        features_to_disable = [
-            FeatureFlag.ADVANCED_ANALYTICS,
-            FeatureFlag.EXCEL_PROCESSING,
-            FeatureFlag.EMAIL_ANALYSIS,
-            FeatureFlag.RELATIONSHIP_MAPPING
-        ]
-        
-        for feature in features_to_disable:
-            if self.enabled_features[feature]:
-                self.enabled_features[feature] = False
-                logger.warning(f"Disabled feature: {feature.value}")
+        changed = self.enabled_mask & NON_ESSENTIAL_FEATURES
+        self.enabled_mask &= ~NON_ESSENTIAL_FEATURES
+        
+        for feature in changed:
+            logger.warning(f"Disabled feature: {feature.key}")
     
     async def _disable_intensive_features(self):
         """Disable resource-intensive features during high usage"""
-        features_to_disable = [
-            FeatureFlag.ADVANCED_ANALYTICS,
-            FeatureFlag.EXCEL_PROCESSING
-        ]
+        changed = self.enabled_mask & INTENSIVE_FEATURES
+        self.enabled_mask &= ~INTENSIVE_FEATURES
         
-        for feature in features_to_disable:
-            if self.enabled_features[feature]:
-                self.enabled_features[feature] = False
-                logger.info(f"Disabled intensive feature: {feature.value}")
+        for feature in changed:
+            logger.info(f"Disabled intensive feature: {feature.key}")
     
     async def _enable_standard_features(self):
         """Re-enable standard features when resources are available"""
-        standard_features = [
-            FeatureFlag.SPONSOR_ANALYSIS,
-            FeatureFlag.GRANT_TIMELINE,
-            FeatureFlag.RELATIONSHIP_MAPPING
-        ]
+        changed = STANDARD_FEATURES & ~self.enabled_mask
+        self.enabled_mask |= STANDARD_FEATURES
         
-        for feature in standard_features:
-            if not self.enabled_features[feature]:
-                self.enabled_features[feature] = True
-                logger.info(f"Enabled feature: {feature.value}")
+        for feature in changed:
+            logger.info(f"Enabled feature: {feature.key}")
     
     def is_feature_enabled(self, feature: FeatureFlag) -> bool:
         """Check if a feature is currently enabled"""
-        return self.enabled_features.get(feature, False)
+        return bool(self.enabled_mask & feature)
     
     def get_current_metrics(self) -> Optional[ResourceMetrics]:
         """Get the most recent resource metrics"""
@@ -233,6 +241,17 @@ class WorkflowQueue:
         self.running_tasks: Dict[str, asyncio.Task] = {}
         self.completed_tasks: List[str] = []
         self.failed_tasks: List[str] = []
+    
+    def clear(self):
+        """Cancel running tasks and drop all queued and finished task state"""
+        for task in self.running_tasks.values():
+            task.cancel()
+        self.running_tasks.clear()
+        while not self.pending_queue.empty():
+            self.pending_queue.get_nowait()
+        self.tasks.clear()
+        self.completed_tasks.clear()
+        self.failed_tasks.clear()
         
     async def add_task(self, task: WorkflowTask):
         """Add a task to the workflow queue"""
@@ -270,6 +289,7 @@ class WorkflowQueue:
             self.tasks[task_id].status = WorkflowStatus.COMPLETED
             self.tasks[task_id].completed_at = datetime.now()
             self.completed_tasks.append(task_id)
+            self.tasks[task_id].done_event.set()
             
             # Check for tasks waiting on this dependency
             await self._check_dependent_tasks(task_id)
@@ -304,6 +324,8 @@ class OrchestrationAgent:
         self.workflow_queue = WorkflowQueue()
         self.workflow_handlers: Dict[str, Callable] = {}
         self.running = False
+        self._running_changed = asyncio.Condition()
+        self._task_counter = itertools.count()
         self.stats = {
             'total_tasks': 0,
             'completed_tasks': 0,
@@ -348,9 +370,12 @@ class OrchestrationAgent:
         await self.resource_monitor.stop_monitoring()
         
         # Cancel running tasks
-        for task_id, task in self.workflow_queue.running_tasks.items():
+        running_tasks = list(self.workflow_queue.running_tasks.items())
+        for task_id, task in running_tasks:
             task.cancel()
             logger.info(f"Cancelled running task: {task_id}")
+        await asyncio.gather(*(task for _, task in running_tasks), return_exceptions=True)
+        self.workflow_queue.running_tasks.clear()
         
         logger.info("Orchestration agent stopped")
     
@@ -377,7 +402,7 @@ class OrchestrationAgent:
                         required_feature = feature_map.get(workflow_task.workflow_type)
                         if required_feature and not self.resource_monitor.is_feature_enabled(required_feature):
                             # Postpone task if feature is disabled due to resource constraints
-                            logger.info(f"Postponing task {workflow_task.id} - feature {required_feature.value} disabled")
+                            logger.info(f"Postponing task {workflow_task.id} - feature {required_feature.key} disabled")
                             await asyncio.sleep(30)  # Wait before checking again
                             continue
                         
@@ -388,10 +413,14 @@ class OrchestrationAgent:
                         
                         workflow_task.status = WorkflowStatus.RUNNING
                         workflow_task.started_at = datetime.now()
+                        await self._notify_running_changed()
                         
                         logger.info(f"Started executing task: {workflow_task.name}")
+                    
+                    # get_next_task already blocks while the queue is empty
+                    continue
                 
-                await asyncio.sleep(5)  # Check every 5 seconds
+                await self._wait_for_free_slot(timeout=5)  # Re-check at least every 5 seconds
                 
             except Exception as e:
                 logger.error(f"Error in execution loop: {e}")
@@ -418,6 +447,7 @@ class OrchestrationAgent:
             # Remove from running tasks
             if workflow_task.id in self.workflow_queue.running_tasks:
                 del self.workflow_queue.running_tasks[workflow_task.id]
+            await self._notify_running_changed()
             
             logger.info(f"Task execution completed: {workflow_task.name}")
             return result
@@ -433,6 +463,7 @@ class OrchestrationAgent:
             # Remove from running tasks
             if workflow_task.id in self.workflow_queue.running_tasks:
                 del self.workflow_queue.running_tasks[workflow_task.id]
+            await self._notify_running_changed()
             
             # Retry logic
             if workflow_task.retry_count < workflow_task.max_retries:
@@ -441,8 +472,27 @@ class OrchestrationAgent:
                 await self.workflow_queue.add_task(workflow_task)
                 logger.info(f"Retrying task: {workflow_task.name} (attempt {workflow_task.retry_count})")
             else:
+                workflow_task.done_event.set()
                 logger.error(f"Task failed permanently: {workflow_task.name} - {error_message}")
     
+    async def _wait_for_free_slot(self, timeout: float):
+        """Wait until a running task finishes or the timeout elapses"""
+        try:
+            async with self._running_changed:
+                await asyncio.wait_for(
+                    self._running_changed.wait_for(
+                        lambda: len(self.workflow_queue.running_tasks) < self.max_concurrent_tasks
+                    ),
+                    timeout=timeout
+                )
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _notify_running_changed(self):
+        """Wake up coroutines waiting on the set of running tasks"""
+        async with self._running_changed:
+            self._running_changed.notify_all()
+    
     def _update_average_execution_time(self, execution_time: float):
         """Update running average of execution times"""
         total_completed = self.stats['completed_tasks']
@@ -452,7 +502,7 @@ class OrchestrationAgent:
     async def submit_workflow(self, workflow_type: str, tenant_id: str, payload: Dict[str, Any], 
                             priority: Priority = Priority.MEDIUM, dependencies: Optional[List[str]] = None) -> str:
         """Submit a new workflow task"""
-        task_id = f"{workflow_type}_{tenant_id}_{int(time.time() * 1000)}"
+        task_id = f"{workflow_type}_{tenant_id}_{int(time.time() * 1000)}_{next(self._task_counter)}"
         
         task = WorkflowTask(
             id=task_id,
@@ -472,6 +522,25 @@ class OrchestrationAgent:
         logger.info(f"Submitted workflow: {workflow_type} for tenant {tenant_id}")
         return task_id
     
+    async def wait_for_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Wait until a workflow task completes or fails permanently and return its status"""
+        task = self.workflow_queue.tasks.get(task_id)
+        if task is None:
+            return None
+        await task.done_event.wait()
+        return await self.get_workflow_status(task_id)
+    
+    async def wait_all(self, task_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Wait until every given workflow task has finished and return their statuses in order"""
+        return list(await asyncio.gather(*(self.wait_for_task(task_id) for task_id in task_ids)))
+    
+    async def wait_for_running_tasks(self, count: int):
+        """Wait until exactly `count` workflow tasks are running"""
+        async with self._running_changed:
+            await self._running_changed.wait_for(
+                lambda: len(self.workflow_queue.running_tasks) == count
+            )
+    
     def register_workflow_handler(self, workflow_type: str, handler: Callable):
         """Register a custom workflow handler"""
         self.workflow_handlers[workflow_type] = handler
@@ -520,7 +589,7 @@ class OrchestrationAgent:
                 'failed_tasks': len(self.workflow_queue.failed_tasks)
             },
             'resource_metrics': asdict(current_metrics) if current_metrics else None,
-            'enabled_features': {flag.value: enabled for flag, enabled in self.resource_monitor.enabled_features.items()},
+            'enabled_features': {flag.key: enabled for flag, enabled in self.resource_monitor.enabled_features.items()},
             'max_concurrent_tasks': self.max_concurrent_tasks
         }
     
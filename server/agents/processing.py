@@ -4,16 +4,233 @@ Handles NetworkX-based relationship graph management, sponsor metrics, and grant
 """
 import logging
 import networkx as nx
-import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Any, Optional, Tuple, Union
 import json
+import os
 import asyncio
+import threading
+import heapq
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import cached_property, lru_cache, partial
 from concurrent.futures import ThreadPoolExecutor
 
+# SciPy and FastAPI are imported where they are used: together they take
+# longer to import than the rest of this module, and most callers (the
+# Node.js wrapper, scoring-only tests) never reach that code
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+
 logger = logging.getLogger("zero-gate.processing")
 
+# nx-parallel spreads betweenness centrality across cores when it is installed
+try:
+    import nx_parallel  # noqa: F401
+    CENTRALITY_BACKEND: Optional[str] = "parallel"
+except ImportError:
+    CENTRALITY_BACKEND = None
+
+# Path searches run here so concurrent queries don't serialize on the event loop;
+# shared by every ProcessingAgent, whose threads start lazily and live for the process
+_path_discovery_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="path-discovery")
+
+# Adjacency map: node id -> [(neighbor id, relationship strength), ...]
+Adjacency = Dict[str, List[Tuple[str, float]]]
+
+class RelType(IntEnum):
+    """Relationship types interned to small integers for the indexed network"""
+    COLLEAGUE = 0
+    PROFESSIONAL = 1
+    BUSINESS_PARTNER = 2
+    MENTOR = 3
+    ACQUAINTANCE = 4
+    ADVISOR = 5
+    COLLABORATION = 6
+    MANAGER = 7
+    DIRECT_REPORT = 8
+    PERSONAL = 9
+    ORGANIZATIONAL = 10
+
+# Type string -> code; types outside RelType are stored as -1
+_REL_TYPE_CODES = {rel_type.name.lower(): rel_type.value for rel_type in RelType}
+
+STRENGTH_SCALE = 255
+
+def _quantize_strength(strength: np.ndarray) -> np.ndarray:
+    """Store [0, 1] strengths as uint8; path scoring still reads exact strengths from the edges"""
+    return np.round(np.clip(strength, 0.0, 1.0) * STRENGTH_SCALE).astype(np.uint8)
+
+@dataclass
+class _NetworkArrays:
+    """Indexed form of one network snapshot
+    
+    Node ids are interned to row numbers and the undirected edges are kept in
+    CSR layout (row v's neighbors are indices[indptr[v]:indptr[v + 1]]), so
+    whole-network statistics are array operations. Path searches walk the
+    equivalent adjacency lists, which are cheaper to iterate from Python than
+    NumPy scalars.
+    """
+    node_idx: Dict[str, int]
+    idx_node: List[str]
+    indptr: np.ndarray
+    indices: np.ndarray
+    strength: np.ndarray  # uint8, strength quantized to steps of 1/255
+    rel_type: np.ndarray  # int8 RelType codes parallel to strength
+    adjacency: Adjacency
+    edges: Dict[Tuple[str, str], Dict[str, Any]]
+    # landmark ids -> (landmarks, nodes) hop-distance table, inf where unreachable
+    landmark_distances: Dict[Tuple[str, ...], np.ndarray] = field(default_factory=dict)
+    
+    @classmethod
+    def from_edge_arrays(cls, node_ids: List[str], sources: np.ndarray, targets: np.ndarray,
+                         strength: np.ndarray, relationship_type: str = "connection") -> "_NetworkArrays":
+        """Index a network given as parallel arrays of unique edges between node positions
+        
+        Skips the nodes/relationships dict form, so large synthetic networks
+        can be built without one dict per node.
+        """
+        n = len(node_ids)
+        rows = np.concatenate([sources, targets])
+        cols = np.concatenate([targets, sources])
+        weights = np.concatenate([strength, strength])
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        indices = cols[order].astype(np.int32)
+        weights = weights[order]
+        quantized = _quantize_strength(weights)
+        rel_type = np.full(indices.size, _REL_TYPE_CODES.get(relationship_type, -1), dtype=np.int8)
+        
+        idx_node = list(node_ids)
+        neighbor_ids = [idx_node[i] for i in indices.tolist()]
+        neighbor_strengths = weights.tolist()
+        bounds = indptr.tolist()
+        adjacency: Adjacency = {
+            node: list(zip(neighbor_ids[bounds[i]:bounds[i + 1]], neighbor_strengths[bounds[i]:bounds[i + 1]]))
+            for i, node in enumerate(idx_node)
+        }
+        edges: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for source, target, edge_strength in zip(sources.tolist(), targets.tolist(), strength.tolist()):
+            rel = {"from": idx_node[source], "to": idx_node[target], "strength": edge_strength,
+                   "type": relationship_type}
+            edges[(rel["from"], rel["to"])] = edges[(rel["to"], rel["from"])] = rel
+        
+        return cls({node: i for i, node in enumerate(idx_node)}, idx_node, indptr, indices, quantized,
+                   rel_type, adjacency, edges)
+    
+    @property
+    def num_nodes(self) -> int:
+        return len(self.idx_node)
+    
+    @property
+    def density(self) -> float:
+        """Undirected density 2m / (n(n - 1)); indices holds each edge twice"""
+        n = self.num_nodes
+        return self.indices.size / (n * (n - 1)) if n > 1 else 0.0
+    
+    @cached_property
+    def node_ids(self) -> frozenset:
+        """Every node id in the network, for membership and isolation checks"""
+        return frozenset(self.idx_node)
+    
+    @cached_property
+    def degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+    
+    @cached_property
+    def node_strength(self) -> np.ndarray:
+        """Sum of relationship strengths per node"""
+        rows = np.repeat(np.arange(self.num_nodes), self.degree)
+        return np.bincount(rows, weights=self.strength, minlength=self.num_nodes) / STRENGTH_SCALE
+    
+    @cached_property
+    def relationship_type_counts(self) -> Dict[str, int]:
+        """Number of relationships of each type; untyped or unlisted ones count as other"""
+        # Codes shift up by one so -1 lands in bin 0; each edge is stored twice
+        counts = np.bincount(self.rel_type.astype(np.int64) + 1, minlength=len(RelType) + 1) // 2
+        names = ["other"] + [rel_type.name.lower() for rel_type in RelType]
+        return {name: int(count) for name, count in zip(names, counts) if count}
+    
+    @cached_property
+    def pattern(self) -> "sp.csr_matrix":
+        """Unweighted sparse adjacency matrix"""
+        import scipy.sparse as sp
+        n = self.num_nodes
+        return sp.csr_matrix((np.ones(self.indices.size), self.indices, self.indptr), shape=(n, n))
+    
+    @cached_property
+    def average_clustering(self) -> float:
+        """Mean local clustering coefficient, triangles counted from A ∘ A²"""
+        return _average_clustering(self.pattern, self.degree)
+
+def _average_clustering(pattern: "sp.csr_matrix", degree: np.ndarray) -> float:
+    """Mean local clustering of an unweighted, loop-free symmetric adjacency matrix"""
+    n = pattern.shape[0]
+    if n == 0:
+        return 0.0
+    closed_walks = np.asarray(pattern.multiply(pattern @ pattern).sum(axis=1)).ravel()
+    possible = degree * (degree - 1)
+    clustering = np.divide(closed_walks, possible, out=np.zeros(n), where=possible > 0)
+    return float(clustering.mean())
+
+def _distance_stats(pattern: "sp.csr_matrix", chunk_size: int = 256) -> Tuple[int, np.ndarray]:
+    """Largest finite hop distance and closeness centrality of every node
+    
+    BFS runs from chunk_size sources at a time so the distance rows never
+    grow past chunk_size x n. Closeness uses NetworkX's Wasserman-Faust
+    scaling for disconnected graphs.
+    """
+    from scipy.sparse import csgraph
+    
+    n = pattern.shape[0]
+    diameter = 0
+    closeness = np.zeros(n)
+    for start in range(0, n, chunk_size):
+        rows = np.arange(start, min(start + chunk_size, n))
+        distances = csgraph.shortest_path(pattern, directed=False, unweighted=True, indices=rows)
+        reachable = np.isfinite(distances)
+        hops = np.where(reachable, distances, 0.0)
+        diameter = max(diameter, int(hops.max()))
+        others = reachable.sum(axis=1) - 1
+        total = hops.sum(axis=1)
+        closeness[rows] = np.divide(others * others, total * (n - 1), out=np.zeros(rows.size), where=total > 0)
+    return diameter, closeness
+
+# Success-probability multiplier per grant type; unlisted types use 0.9
+_GRANT_COMPLEXITY = {
+    "federal": 0.8,
+    "state": 0.9,
+    "foundation": 0.95,
+    "corporate": 1.0,
+    "research": 0.75
+}
+
+# Composite score cut-offs for _calculate_sponsor_tier; a score equal to a
+# threshold lands in the higher tier
+_SPONSOR_TIER_THRESHOLDS = np.array([0.4, 0.6, 0.8])
+_SPONSOR_TIER_NAMES = np.array(["bronze", "silver", "gold", "platinum"])
+
+# Network data as returned by _get_network_data: the nodes/relationships dict
+# form, or an already indexed network
+NetworkData = Union[Dict[str, Any], _NetworkArrays]
+
 class ProcessingAgent:
+    PATH_ALGORITHMS = ("bidirectional", "bfs", "dfs", "dijkstra")
+    NETWORK_CACHE_SIZE = 8
+    LANDMARK_CACHE_SIZE = 4
+    # Landmarks are reselected each time the graph grows past another multiple of this
+    LANDMARK_REFRESH_NODES = 100
+    
+    # id(network_data) -> (network_data, arrays), shared by every agent so a
+    # snapshot is indexed once however many agents query it; holding the
+    # snapshot keeps its id from being reused while the entry is cached
+    _network_cache: "OrderedDict[int, Tuple[Dict[str, Any], _NetworkArrays]]" = OrderedDict()
+    _network_cache_lock = threading.Lock()
+    
     def __init__(self, resource_monitor):
         """Initialize ProcessingAgent with required ResourceMonitor integration"""
         if resource_monitor is None:
@@ -23,6 +240,18 @@ class ProcessingAgent:
         self.relationship_graph = nx.Graph()
         self.landmarks = set()
         self.landmark_distances = {}
+        # Bumped on every graph change; (landmarks, version) keys the distance tables
+        self._graph_version = 0
+        self._landmark_cache: "OrderedDict[Tuple[frozenset, int], Dict[str, Dict[str, float]]]" = OrderedDict()
+        # Set when the graph changes after the landmark tables were built;
+        # _ensure_landmarks refreshes them on the next path query
+        self._landmarks_dirty = False
+        self._landmark_node_count = 0
+        # tenant_id -> (graph version, statistics) for get_network_statistics
+        self._network_stats_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        # tenant_id -> (graph version, snapshot); handing out the same snapshot
+        # until the graph changes lets _get_network_arrays find its index
+        self._network_data_cache: Dict[str, Tuple[int, Optional[Dict[str, Any]]]] = {}
         self.sponsor_cache = {}
         self.grant_cache = {}
         
@@ -32,8 +261,13 @@ class ProcessingAgent:
         
     def add_relationship(self, source: str, target: str, 
                         relationship_type: str, strength: float,
-                        tenant_id: str, metadata: Optional[Dict[str, Any]] = None):
-        """Add a relationship to the graph"""
+                        tenant_id: str, metadata: Optional[Dict[str, Any]] = None,
+                        created_at: Optional[datetime] = None):
+        """Add a relationship to the graph
+        
+        Callers inserting in a loop can pass one created_at for the whole
+        batch instead of reading the clock per edge.
+        """
         if metadata is None:
             metadata = {}
             
@@ -42,12 +276,33 @@ class ProcessingAgent:
             type=relationship_type,
             strength=strength,
             tenant_id=tenant_id,
-            created_at=datetime.now(),
+            created_at=created_at or datetime.now(),
             **metadata
         )
+        self._graph_version += 1
+        self._landmarks_dirty = True
+    
+    def add_relationships(self, edges: Iterable[Tuple[str, str, str, float]],
+                          tenant_id: str, defer_landmarks: bool = True):
+        """Add many (source, target, relationship_type, strength) relationships in one pass
+        
+        With defer_landmarks=False landmarks are recomputed once after the batch,
+        otherwise they are refreshed lazily by the next path query.
+        """
+        created_at = datetime.now()
+        self.relationship_graph.add_edges_from(
+            (source, target, {
+                'type': relationship_type,
+                'strength': strength,
+                'tenant_id': tenant_id,
+                'created_at': created_at
+            })
+            for source, target, relationship_type, strength in edges
+        )
+        self._graph_version += 1
+        self._landmarks_dirty = True
         
-        # Update landmarks if needed
-        if len(self.relationship_graph.nodes) % 100 == 0:
+        if not defer_landmarks:
             self._update_landmarks()
     
     def _update_landmarks(self):
@@ -68,19 +323,40 @@ class ProcessingAgent:
         
         # Precompute distances to landmarks
         self._precompute_landmark_distances()
+        self._landmark_node_count = len(sorted_nodes)
+    
+    def _ensure_landmarks(self):
+        """Reselect landmarks if the graph has grown past another refresh threshold since the last selection"""
+        if not self._landmarks_dirty:
+            return
+        
+        refresh = self.LANDMARK_REFRESH_NODES
+        if self.relationship_graph.number_of_nodes() // refresh > self._landmark_node_count // refresh:
+            self._update_landmarks()
     
     def _precompute_landmark_distances(self):
         """Precompute distances from each node to landmarks"""
-        self.landmark_distances = {}
+        key = (frozenset(self.landmarks), self._graph_version)
+        cached = self._landmark_cache.get(key)
+        if cached is not None:
+            self._landmark_cache.move_to_end(key)
+            self.landmark_distances = cached
+            self._landmarks_dirty = False
+            return
         
-        for node in self.relationship_graph.nodes():
-            self.landmark_distances[node] = {}
-            for landmark in self.landmarks:
-                try:
-                    path = nx.shortest_path(self.relationship_graph, node, landmark)
-                    self.landmark_distances[node][landmark] = len(path) - 1
-                except nx.NetworkXNoPath:
-                    self.landmark_distances[node][landmark] = float('inf')
+        # One BFS per landmark instead of a shortest-path query per (node, landmark)
+        distances = {node: dict.fromkeys(self.landmarks, float('inf')) for node in self.relationship_graph.nodes()}
+        for landmark in self.landmarks:
+            if landmark not in self.relationship_graph:
+                continue
+            for node, distance in nx.single_source_shortest_path_length(self.relationship_graph, landmark).items():
+                distances[node][landmark] = distance
+        
+        self.landmark_distances = distances
+        self._landmarks_dirty = False
+        self._landmark_cache[key] = distances
+        if len(self._landmark_cache) > self.LANDMARK_CACHE_SIZE:
+            self._landmark_cache.popitem(last=False)
     
     def find_relationship_path(self, source: str, target: str, 
                              tenant_id: str, max_depth: int = 7) -> Optional[List[str]]:
@@ -90,14 +366,16 @@ class ProcessingAgent:
             return None
         
         try:
+            self._ensure_landmarks()
+            
             # Use landmark-based estimation for efficiency
             if self.landmarks and source in self.landmark_distances and target in self.landmark_distances:
                 estimated_distance = self._estimate_distance(source, target)
                 if estimated_distance > max_depth:
                     return None
             
-            # Find actual shortest path
-            path = nx.shortest_path(self.relationship_graph, source, target)
+            # Find actual shortest path, searching from both ends
+            path = nx.bidirectional_shortest_path(self.relationship_graph, source, target)
             
             if len(path) - 1 <= max_depth:
                 return path
@@ -114,10 +392,27 @@ class ProcessingAgent:
                                     tenant_id: str, max_depth: int = 7) -> List[List[str]]:
         """Find all paths between two nodes within specified degrees"""
         try:
+            if source not in self.relationship_graph or target not in self.relationship_graph:
+                return []
+            if source == target:
+                return [[source]]
+            
+            # Meet in the middle: every path of length L is split at hop ceil(L/2),
+            # so each side only enumerates half-paths and each path is built once
+            forward = self._simple_paths_by_endpoint(source, math.ceil(max_depth / 2))
+            backward = self._simple_paths_by_endpoint(target, max_depth // 2)
+            
             paths = []
-            for path in nx.all_simple_paths(self.relationship_graph, source, target, cutoff=max_depth):
-                if len(path) - 1 <= max_depth:
-                    paths.append(path)
+            for node in forward.keys() & backward.keys():
+                for back_path in backward[node]:
+                    back_hops = len(back_path) - 1
+                    back_nodes = set(back_path[:-1])
+                    for front_path in forward[node]:
+                        front_hops = len(front_path) - 1
+                        if front_hops - back_hops not in (0, 1):
+                            continue
+                        if back_nodes.isdisjoint(front_path):
+                            paths.append(front_path + back_path[-2::-1])
             
             # Sort by path length and relationship strength
             paths.sort(key=lambda p: (len(p), -self._calculate_path_strength(p)))
@@ -129,6 +424,21 @@ class ProcessingAgent:
             logger.error(f"Error finding all paths: {str(e)}")
             return []
     
+    def _simple_paths_by_endpoint(self, origin: str, radius: int) -> Dict[str, List[List[str]]]:
+        """Group every simple path of at most radius hops from origin by its last node"""
+        paths_by_endpoint: Dict[str, List[List[str]]] = {origin: [[origin]]}
+        stack = [[origin]]
+        while stack:
+            path = stack.pop()
+            if len(path) > radius:
+                continue
+            for neighbor in self.relationship_graph.neighbors(path[-1]):
+                if neighbor not in path:
+                    extended = path + [neighbor]
+                    paths_by_endpoint.setdefault(neighbor, []).append(extended)
+                    stack.append(extended)
+        return paths_by_endpoint
+    
     def _calculate_path_strength(self, path: List[str]) -> float:
         """Calculate overall strength of a path"""
         if len(path) < 2:
@@ -180,8 +490,10 @@ class ProcessingAgent:
                     "created_at": (lambda x: x.isoformat() if x and hasattr(x, 'isoformat') else str(x) if x else '')(edge_data.get('created_at'))
                 })
         
-        avg_strength = sum(strengths) / len(strengths) if strengths else 0
-        min_strength = min(strengths) if strengths else 0
+        # Aggregate once; confidence reuses the same statistics
+        strength_values = np.asarray(strengths, dtype=np.float64)
+        avg_strength = float(strength_values.mean()) if strength_values.size else 0
+        min_strength = float(strength_values.min()) if strength_values.size else 0
         
         return {
             "average_strength": avg_strength,
@@ -190,7 +502,7 @@ class ProcessingAgent:
             "relationship_types": relationship_types,
             "edge_details": edge_details,
             "quality": self._assess_path_quality(avg_strength, min_strength),
-            "confidence_score": self._calculate_confidence_score(strengths, len(path))
+            "confidence_score": self._confidence_from_stats(avg_strength, min_strength, len(path)) if strength_values.size else 0
         }
     
     def _assess_path_quality(self, avg_strength: float, min_strength: float) -> str:
@@ -206,17 +518,18 @@ class ProcessingAgent:
     
     def _calculate_confidence_score(self, strengths: List[float], path_length: int) -> float:
         """Calculate confidence score for path reliability"""
-        if not strengths:
+        strength_values = np.asarray(strengths, dtype=np.float64)
+        if not strength_values.size:
             return 0
         
-        # Base score from average strength
-        avg_strength = sum(strengths) / len(strengths)
-        
+        return self._confidence_from_stats(float(strength_values.mean()), float(strength_values.min()), path_length)
+    
+    def _confidence_from_stats(self, avg_strength: float, min_strength: float, path_length: int) -> float:
+        """Confidence score from precomputed strength statistics"""
         # Penalty for path length (longer paths are less reliable)
         length_penalty = max(0, 1 - (path_length - 1) * 0.1)
         
         # Penalty for weak links
-        min_strength = min(strengths)
         weak_link_penalty = min_strength
         
         return avg_strength * length_penalty * weak_link_penalty
@@ -341,8 +654,13 @@ class ProcessingAgent:
             ]
         }
     
-    def _calculate_success_probability(self, grant_type: str, preparation_days: int) -> float:
-        """Calculate success probability based on grant type and preparation time"""
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _calculate_success_probability(grant_type: str, preparation_days: int) -> float:
+        """Calculate success probability based on grant type and preparation time
+        
+        Pure in its arguments, so results are memoized per (grant_type, days).
+        """
         base_probability = 0.7  # 70% base success rate
         
         # Adjust for preparation time
@@ -356,15 +674,7 @@ class ProcessingAgent:
             time_factor = 0.5
         
         # Adjust for grant type complexity
-        grant_complexity = {
-            "federal": 0.8,
-            "state": 0.9,
-            "foundation": 0.95,
-            "corporate": 1.0,
-            "research": 0.75
-        }
-        
-        complexity_factor = grant_complexity.get(grant_type.lower(), 0.9)
+        complexity_factor = _GRANT_COMPLEXITY.get(grant_type.lower(), 0.9)
         
         return min(0.95, base_probability * time_factor * complexity_factor)
     
@@ -374,83 +684,124 @@ class ProcessingAgent:
             return {"status": "disabled", "message": "Analytics disabled due to resource constraints"}
         
         try:
-            # Extract sponsor data
-            sponsor_id = sponsor_data.get("id", "unknown")
-            
-            # Relationship strength indicators
-            communication_frequency = sponsor_data.get("communication_frequency", 0)
-            response_time = sponsor_data.get("avg_response_time", 24)  # hours
-            engagement_quality = sponsor_data.get("engagement_quality", 50)  # 0-100 scale
-            
-            # Calculate composite relationship score
-            # Normalize communication frequency (assume max 10 contacts per month)
-            comm_score = min(1.0, communication_frequency / 10.0)
-            
-            # Normalize response time (assume 24 hours is baseline, lower is better)
-            response_score = max(0, min(1.0, (48 - response_time) / 48))
-            
-            # Normalize engagement quality (0-100 scale)
-            engagement_score = engagement_quality / 100.0
-            
-            relationship_score = (
-                (comm_score * 0.3) +
-                (response_score * 0.3) +
-                (engagement_score * 0.4)
-            )
-            
-            # Sponsorship fulfillment metrics
-            deliverables_completed = sponsor_data.get("deliverables_completed", 0)
-            total_deliverables = sponsor_data.get("total_deliverables", 1)
-            fulfillment_rate = deliverables_completed / total_deliverables if total_deliverables > 0 else 0
+            scores = self._sponsor_scores(sponsor_data)
             
             # Network centrality if sponsor is in relationship graph
             centrality_score = 0
-            if sponsor_id in self.relationship_graph.nodes:
-                centrality_score = nx.degree_centrality(self.relationship_graph).get(sponsor_id, 0)
+            if scores["sponsor_id"] in self.relationship_graph.nodes:
+                centrality_score = nx.degree_centrality(self.relationship_graph).get(scores["sponsor_id"], 0)
             
             # Calculate tier classification
-            tier = self._calculate_sponsor_tier(relationship_score, fulfillment_rate, centrality_score)
+            tier = self._calculate_sponsor_tier(scores["relationship_score"], scores["fulfillment_rate"], centrality_score)
             
-            # Risk assessment
-            risk_score = self._calculate_sponsor_risk(sponsor_data, relationship_score, fulfillment_rate)
+            return self._sponsor_metrics(sponsor_data, tenant_id, scores, centrality_score, tier)
             
-            metrics = {
-                "sponsor_id": sponsor_id,
-                "tenant_id": tenant_id,
-                "relationship_score": round(relationship_score, 3),
-                "fulfillment_rate": round(fulfillment_rate, 3),
-                "communication_effectiveness": round(comm_score, 3),
-                "response_efficiency": round(response_score, 3),
-                "engagement_quality_score": round(engagement_score, 3),
-                "network_centrality": round(centrality_score, 3),
-                "overall_health": round((relationship_score + fulfillment_rate) / 2, 3),
-                "tier_classification": tier,
-                "risk_assessment": risk_score,
-                "recommendation": self._generate_sponsor_recommendation(relationship_score, fulfillment_rate, risk_score),
-                "calculated_at": datetime.now().isoformat()
-            }
+        except Exception as e:
+            logger.error(f"Error calculating sponsor metrics: {str(e)}")
+            return {"status": "error", "message": str(e)}
+    
+    def calculate_sponsor_metrics_batch(self, sponsors: List[Dict[str, Any]], tenant_id: str) -> List[Dict[str, Any]]:
+        """Calculate sponsor metrics for many sponsors, sharing one centrality pass and one tier lookup"""
+        if self.resource_monitor and not self.resource_monitor.is_feature_enabled("advanced_analytics"):
+            return [{"status": "disabled", "message": "Analytics disabled due to resource constraints"} for _ in sponsors]
+        
+        try:
+            all_scores = [self._sponsor_scores(sponsor_data) for sponsor_data in sponsors]
+            centrality = nx.degree_centrality(self.relationship_graph) if all_scores else {}
+            centrality_scores = [centrality.get(scores["sponsor_id"], 0) for scores in all_scores]
             
-            # Cache the results
-            self.sponsor_cache[f"{tenant_id}_{sponsor_id}"] = metrics
+            tiers = self._sponsor_tiers(
+                np.array([scores["relationship_score"] for scores in all_scores], dtype=np.float64),
+                np.array([scores["fulfillment_rate"] for scores in all_scores], dtype=np.float64),
+                np.array(centrality_scores, dtype=np.float64)
+            )
             
-            return metrics
+            return [
+                self._sponsor_metrics(sponsor_data, tenant_id, scores, centrality_score, str(tier))
+                for sponsor_data, scores, centrality_score, tier in zip(sponsors, all_scores, centrality_scores, tiers)
+            ]
             
         except Exception as e:
             logger.error(f"Error calculating sponsor metrics: {str(e)}")
-            return {"status": "error", "message": str(e)}
+            return [{"status": "error", "message": str(e)} for _ in sponsors]
+    
+    def _sponsor_scores(self, sponsor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Relationship and fulfillment scores for one sponsor record"""
+        # Relationship strength indicators
+        communication_frequency = sponsor_data.get("communication_frequency", 0)
+        response_time = sponsor_data.get("avg_response_time", 24)  # hours
+        engagement_quality = sponsor_data.get("engagement_quality", 50)  # 0-100 scale
+        
+        # Calculate composite relationship score
+        # Normalize communication frequency (assume max 10 contacts per month)
+        comm_score = min(1.0, communication_frequency / 10.0)
+        
+        # Normalize response time (assume 24 hours is baseline, lower is better)
+        response_score = max(0, min(1.0, (48 - response_time) / 48))
+        
+        # Normalize engagement quality (0-100 scale)
+        engagement_score = engagement_quality / 100.0
+        
+        relationship_score = (
+            (comm_score * 0.3) +
+            (response_score * 0.3) +
+            (engagement_score * 0.4)
+        )
+        
+        # Sponsorship fulfillment metrics
+        deliverables_completed = sponsor_data.get("deliverables_completed", 0)
+        total_deliverables = sponsor_data.get("total_deliverables", 1)
+        fulfillment_rate = deliverables_completed / total_deliverables if total_deliverables > 0 else 0
+        
+        return {
+            "sponsor_id": sponsor_data.get("id", "unknown"),
+            "comm_score": comm_score,
+            "response_score": response_score,
+            "engagement_score": engagement_score,
+            "relationship_score": relationship_score,
+            "fulfillment_rate": fulfillment_rate
+        }
+    
+    def _sponsor_metrics(self, sponsor_data: Dict[str, Any], tenant_id: str, scores: Dict[str, Any],
+                         centrality_score: float, tier: str) -> Dict[str, Any]:
+        """Assemble and cache the metrics record for one sponsor"""
+        sponsor_id = scores["sponsor_id"]
+        relationship_score = scores["relationship_score"]
+        fulfillment_rate = scores["fulfillment_rate"]
+        
+        # Risk assessment
+        risk_score = self._calculate_sponsor_risk(sponsor_data, relationship_score, fulfillment_rate)
+        
+        metrics = {
+            "sponsor_id": sponsor_id,
+            "tenant_id": tenant_id,
+            "relationship_score": round(relationship_score, 3),
+            "fulfillment_rate": round(fulfillment_rate, 3),
+            "communication_effectiveness": round(scores["comm_score"], 3),
+            "response_efficiency": round(scores["response_score"], 3),
+            "engagement_quality_score": round(scores["engagement_score"], 3),
+            "network_centrality": round(centrality_score, 3),
+            "overall_health": round((relationship_score + fulfillment_rate) / 2, 3),
+            "tier_classification": tier,
+            "risk_assessment": risk_score,
+            "recommendation": self._generate_sponsor_recommendation(relationship_score, fulfillment_rate, risk_score),
+            "calculated_at": datetime.now().isoformat()
+        }
+        
+        # Cache the results
+        self.sponsor_cache[f"{tenant_id}_{sponsor_id}"] = metrics
+        
+        return metrics
     
     def _calculate_sponsor_tier(self, relationship_score: float, fulfillment_rate: float, centrality_score: float) -> str:
         """Calculate sponsor tier classification"""
-        composite_score = (relationship_score * 0.4) + (fulfillment_rate * 0.4) + (centrality_score * 0.2)
-        
-        if composite_score >= 0.8:
-            return "platinum"
-        elif composite_score >= 0.6:
-            return "gold"
-        elif composite_score >= 0.4:
-            return "silver"
-        else:
-            return "bronze"
+        return str(self._sponsor_tiers(relationship_score, fulfillment_rate, centrality_score))
+    
+    @staticmethod
+    def _sponsor_tiers(relationship_score, fulfillment_rate, centrality_score) -> np.ndarray:
+        """Tier names for scalar or array scores: bronze < 0.4 <= silver < 0.6 <= gold < 0.8 <= platinum"""
+        composite_score = (np.asarray(relationship_score) * 0.4) + (np.asarray(fulfillment_rate) * 0.4) + (np.asarray(centrality_score) * 0.2)
+        return _SPONSOR_TIER_NAMES[np.searchsorted(_SPONSOR_TIER_THRESHOLDS, composite_score, side="right")]
     
     def _calculate_sponsor_risk(self, sponsor_data: Dict[str, Any], relationship_score: float, fulfillment_rate: float) -> Dict[str, Any]:
         """Calculate risk assessment for sponsor relationship"""
@@ -513,8 +864,546 @@ class ProcessingAgent:
         
         return recommendations
     
+    async def _get_network_data(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Get the tenant's relationship network as {"nodes": [...], "relationships": [...]}"""
+        cached = self._network_data_cache.get(tenant_id)
+        if cached is not None and cached[0] == self._graph_version:
+            return cached[1]
+        if cached is not None and cached[1] is not None:
+            self._forget_network_arrays(cached[1])
+        
+        network_data = self._build_network_data(tenant_id)
+        self._network_data_cache[tenant_id] = (self._graph_version, network_data)
+        return network_data
+    
+    def _build_network_data(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot the tenant's edges from the relationship graph"""
+        relationships = [
+            {"from": source, "to": target, "strength": data.get('strength', 0), "type": data.get('type', 'unknown'),
+             "created_at": data.get('created_at')}
+            for source, target, data in self.relationship_graph.edges(data=True)
+            if data.get('tenant_id') == tenant_id
+        ]
+        if not relationships:
+            return None
+        
+        node_ids = {rel["from"] for rel in relationships} | {rel["to"] for rel in relationships}
+        return {"nodes": [{"id": node_id} for node_id in node_ids], "relationships": relationships}
+    
+    def _build_network_arrays(self, network_data: Dict[str, Any]) -> _NetworkArrays:
+        """Intern node ids and build the CSR and adjacency views of network data"""
+        edges: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for rel in network_data.get("relationships", []):
+            source, target = rel["from"], rel["to"]
+            existing = edges.get((source, target))
+            # Keep the strongest of duplicate relationships between the same pair
+            if existing is None or rel.get("strength", 0) > existing.get("strength", 0):
+                edges[(source, target)] = edges[(target, source)] = rel
+        
+        adjacency: Adjacency = {node["id"]: [] for node in network_data.get("nodes", [])}
+        for (source, target), rel in edges.items():
+            adjacency.setdefault(source, []).append((target, rel.get("strength", 0)))
+        
+        idx_node = list(adjacency)
+        node_idx = {node: index for index, node in enumerate(idx_node)}
+        indptr = np.zeros(len(idx_node) + 1, dtype=np.int64)
+        np.cumsum([len(adjacency[node]) for node in idx_node], out=indptr[1:])
+        num_entries = int(indptr[-1])
+        indices = np.fromiter(
+            (node_idx[neighbor] for node in idx_node for neighbor, _ in adjacency[node]),
+            dtype=np.int32, count=num_entries
+        )
+        strength = np.fromiter(
+            (s for node in idx_node for _, s in adjacency[node]),
+            dtype=np.float64, count=num_entries
+        )
+        rel_type = np.fromiter(
+            (_REL_TYPE_CODES.get(edges[(node, neighbor)].get("type"), -1)
+             for node in idx_node for neighbor, _ in adjacency[node]),
+            dtype=np.int8, count=num_entries
+        )
+        
+        return _NetworkArrays(node_idx, idx_node, indptr, indices, _quantize_strength(strength), rel_type,
+                              adjacency, edges)
+    
+    def _get_network_arrays(self, network_data: NetworkData) -> _NetworkArrays:
+        """Return the cached index for a network snapshot, building it on first use
+        
+        Builds happen under the cache lock so concurrent queries on one
+        snapshot share a single build. Indexed networks pass straight through.
+        """
+        if isinstance(network_data, _NetworkArrays):
+            return network_data
+        key = id(network_data)
+        with self._network_cache_lock:
+            cached = self._network_cache.get(key)
+            if cached is not None and cached[0] is network_data:
+                self._network_cache.move_to_end(key)
+                return cached[1]
+            
+            arrays = self._build_network_arrays(network_data)
+            self._network_cache[key] = (network_data, arrays)
+            if len(self._network_cache) > self.NETWORK_CACHE_SIZE:
+                self._network_cache.popitem(last=False)
+            return arrays
+    
+    def _forget_network_arrays(self, network_data: Dict[str, Any]):
+        """Drop a superseded snapshot's index so the cache doesn't keep the snapshot alive"""
+        key = id(network_data)
+        with self._network_cache_lock:
+            cached = self._network_cache.get(key)
+            if cached is not None and cached[0] is network_data:
+                del self._network_cache[key]
+    
+    def _bfs_path(self, adjacency: Adjacency, source: str, target: str,
+                  max_degrees: int) -> Tuple[Optional[List[str]], bool, int]:
+        """Level-by-level BFS that stops as soon as the target is reached
+        
+        Returns (path, truncated, explored) where truncated means the search
+        hit max_degrees with nodes still left to expand.
+        """
+        if source == target:
+            return [source], False, 1
+        
+        predecessors: Dict[str, Optional[str]] = {source: None}
+        this_level = [source]
+        level = 0
+        while this_level and level < max_degrees:
+            next_level = []
+            for node in this_level:
+                for neighbor, _ in adjacency.get(node, ()):
+                    if neighbor not in predecessors:
+                        predecessors[neighbor] = node
+                        if neighbor == target:
+                            return self._reconstruct_path(predecessors, target), False, len(predecessors)
+                        next_level.append(neighbor)
+            this_level = next_level
+            level += 1
+        
+        # A non-empty frontier here was cut off by max_degrees, not exhausted
+        return None, bool(this_level), len(predecessors)
+    
+    @staticmethod
+    def _reconstruct_path(predecessors: Dict[str, Optional[str]], node: str) -> List[str]:
+        """Walk a predecessor map back from node to the search root"""
+        path = [node]
+        while predecessors[path[-1]] is not None:
+            path.append(predecessors[path[-1]])
+        path.reverse()
+        return path
+    
+    def _bidirectional_bfs(self, adjacency: Adjacency, source: str, target: str,
+                           max_degrees: int) -> Tuple[Optional[List[str]], bool, int]:
+        """BFS from both endpoints, always expanding the smaller frontier
+        
+        Stops as soon as either frontier empties, so disconnected queries only
+        scan the smaller of the two components.
+        """
+        if source == target:
+            return [source], False, 1
+        
+        forward: Dict[str, Optional[str]] = {source: None}
+        backward: Dict[str, Optional[str]] = {target: None}
+        forward_level, backward_level = [source], [target]
+        depth = 0
+        while forward_level and backward_level:
+            if depth >= max_degrees:
+                return None, True, len(forward) + len(backward)
+            depth += 1
+            
+            expand_forward = len(forward_level) <= len(backward_level)
+            this_level = forward_level if expand_forward else backward_level
+            visited, other = (forward, backward) if expand_forward else (backward, forward)
+            next_level = []
+            for node in this_level:
+                for neighbor, _ in adjacency.get(node, ()):
+                    if neighbor in visited:
+                        continue
+                    visited[neighbor] = node
+                    if neighbor in other:
+                        path = self._reconstruct_path(forward, neighbor)
+                        path.extend(self._reconstruct_path(backward, neighbor)[-2::-1])
+                        return path, False, len(forward) + len(backward)
+                    next_level.append(neighbor)
+            
+            if expand_forward:
+                forward_level = next_level
+            else:
+                backward_level = next_level
+        
+        return None, False, len(forward) + len(backward)
+    
+    def _dfs_path(self, adjacency: Adjacency, source: str, target: str,
+                  max_degrees: int) -> Tuple[Optional[List[str]], bool, int]:
+        """Depth-limited DFS returning the first path found within max_degrees"""
+        best_depth = {source: 0}
+        stack = [(source, [source])]
+        truncated = False
+        while stack:
+            node, path = stack.pop()
+            if node == target:
+                return path, False, len(best_depth)
+            depth = len(path) - 1
+            if depth >= max_degrees:
+                truncated = truncated or any(n not in best_depth for n, _ in adjacency.get(node, ()))
+                continue
+            for neighbor, _ in adjacency.get(node, ()):
+                # Revisit a node only when reaching it by a shorter route
+                if best_depth.get(neighbor, max_degrees + 1) > depth + 1:
+                    best_depth[neighbor] = depth + 1
+                    stack.append((neighbor, path + [neighbor]))
+        
+        return None, truncated, len(best_depth)
+    
+    def _dijkstra_path(self, adjacency: Adjacency, source: str, target: str,
+                       max_degrees: int) -> Tuple[Optional[List[str]], bool, int]:
+        """Strongest path, weighting each edge by its weakness (1 - strength)"""
+        distances = {source: 0.0}
+        predecessors: Dict[str, Optional[str]] = {source: None}
+        settled = set()
+        heap = [(0.0, source)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node == target:
+                break
+            for neighbor, strength in adjacency.get(node, ()):
+                candidate = distance + (1 - strength)
+                if candidate < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = candidate
+                    predecessors[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+        
+        if target not in settled:
+            return None, False, len(settled)
+        
+        path = [target]
+        while predecessors[path[-1]] is not None:
+            path.append(predecessors[path[-1]])
+        path.reverse()
+        
+        if len(path) - 1 > max_degrees:
+            return None, True, len(settled)
+        return path, False, len(settled)
+    
+    def _identify_landmark_nodes(self, adjacency: Adjacency) -> List[str]:
+        """Select high-degree nodes as landmarks for distance estimation"""
+        num_landmarks = max(1, min(100, len(adjacency) // 10))
+        return sorted(adjacency, key=lambda node: len(adjacency[node]), reverse=True)[:num_landmarks]
+    
+    def _bfs_distances(self, adjacency: Adjacency, source: str) -> Dict[str, int]:
+        """Hop distance from source to every reachable node"""
+        distances = {source: 0}
+        this_level = [source]
+        while this_level:
+            next_level = []
+            for node in this_level:
+                for neighbor, _ in adjacency.get(node, ()):
+                    if neighbor not in distances:
+                        distances[neighbor] = distances[node] + 1
+                        next_level.append(neighbor)
+            this_level = next_level
+        return distances
+    
+    def _landmark_heuristic(self, arrays: _NetworkArrays, landmarks: List[str], target: str) -> List[float]:
+        """Per-node lower bound on the hop distance to target
+        
+        h(n) = max over landmarks L of |d(L, n) - d(L, target)|, which is inf
+        when some landmark reaches exactly one of n and target. The landmark
+        distance tables are computed once per network snapshot.
+        """
+        key = tuple(landmarks)
+        distances = arrays.landmark_distances.get(key)
+        if distances is None:
+            from scipy.sparse import csgraph
+            distances = csgraph.shortest_path(
+                arrays.pattern, directed=False, unweighted=True,
+                indices=[arrays.node_idx[landmark] for landmark in landmarks]
+            )
+            arrays.landmark_distances[key] = distances
+        
+        target_distances = distances[:, [arrays.node_idx[target]]]
+        with np.errstate(invalid="ignore"):
+            bounds = np.abs(distances - target_distances)
+        # Landmarks reaching neither node say nothing about their distance
+        bounds[np.isnan(bounds)] = 0
+        return bounds.max(axis=0).tolist()
+    
+    def _landmark_astar_path(self, adjacency: Adjacency, source: str, target: str, max_degrees: int, *,
+                             node_idx: Dict[str, int],
+                             heuristic: List[float]) -> Tuple[Optional[List[str]], bool, int]:
+        """A* over hop counts guided by the landmark lower bounds
+        
+        The bound changes by at most one per hop, so the first time target is
+        popped its path is a shortest one. Nodes whose bound puts the target
+        beyond max_degrees are never queued.
+        """
+        came_from: Dict[str, Optional[str]] = {source: None}
+        depths = {source: 0}
+        heap = [(heuristic[node_idx[source]], 0, source)]
+        truncated = False
+        while heap:
+            _, depth, node = heapq.heappop(heap)
+            if depth > depths[node]:
+                continue
+            if node == target:
+                return self._reconstruct_path(came_from, target), False, len(depths)
+            
+            next_depth = depth + 1
+            for neighbor, _ in adjacency.get(node, ()):
+                if next_depth >= depths.get(neighbor, float('inf')):
+                    continue
+                estimate = next_depth + heuristic[node_idx[neighbor]]
+                if estimate > max_degrees:
+                    truncated = truncated or estimate != float('inf')
+                    continue
+                depths[neighbor] = next_depth
+                came_from[neighbor] = node
+                heapq.heappush(heap, (estimate, next_depth, neighbor))
+        
+        return None, truncated, len(depths)
+    
+    async def discover_relationship_path(self, source_id: str, target_id: str, tenant_id: str,
+                                         max_degrees: int = 7, algorithm: str = "bidirectional",
+                                         use_landmarks: bool = False,
+                                         include_introduction_template: bool = False,
+                                         include_network_stats: bool = False,
+                                         include_risk_assessment: bool = False) -> Dict[str, Any]:
+        """Discover a relationship path within the tenant's network up to max_degrees"""
+        if algorithm not in self.PATH_ALGORITHMS:
+            raise ValueError(f"Unsupported path algorithm: {algorithm}")
+        
+        network_data = await self._get_network_data(tenant_id)
+        if network_data is None:
+            from fastapi import HTTPException
+            raise HTTPException(status_code=404, detail="Relationship network not found for tenant")
+        
+        result: Dict[str, Any] = {
+            "source_id": source_id,
+            "target_id": target_id,
+            "tenant_id": tenant_id,
+            "algorithm": algorithm,
+            "max_degrees": max_degrees
+        }
+        
+        if self.resource_monitor and not self.resource_monitor.is_feature_enabled("relationship_mapping"):
+            logger.warning("Relationship mapping disabled due to resource constraints")
+            return {**result, **self._no_path_result("feature_disabled")}
+        
+        return await asyncio.get_running_loop().run_in_executor(
+            _path_discovery_executor,
+            partial(self._discover_path_sync, network_data, result, use_landmarks=use_landmarks,
+                    include_introduction_template=include_introduction_template,
+                    include_network_stats=include_network_stats,
+                    include_risk_assessment=include_risk_assessment)
+        )
+    
+    def _discover_path_sync(self, network_data: NetworkData, result: Dict[str, Any], *,
+                            use_landmarks: bool, include_introduction_template: bool,
+                            include_network_stats: bool, include_risk_assessment: bool) -> Dict[str, Any]:
+        """Search and score a path; runs on the path discovery executor"""
+        source_id, target_id = result["source_id"], result["target_id"]
+        algorithm, max_degrees = result["algorithm"], result["max_degrees"]
+        arrays = self._get_network_arrays(network_data)
+        adjacency, edges = arrays.adjacency, arrays.edges
+        if source_id not in arrays.node_ids or target_id not in arrays.node_ids:
+            return {**result, **self._no_path_result("nodes_not_connected")}
+        
+        search = {
+            "bidirectional": self._bidirectional_bfs,
+            "bfs": self._bfs_path,
+            "dfs": self._dfs_path,
+            "dijkstra": self._dijkstra_path
+        }[algorithm]
+        
+        # Hop-count answers for the same node or direct neighbors need no search;
+        # dijkstra is excluded since a stronger indirect path can beat the direct edge
+        direct_path = None
+        if algorithm != "dijkstra":
+            if source_id == target_id:
+                direct_path = [source_id]
+            elif max_degrees >= 1 and (source_id, target_id) in edges:
+                direct_path = [source_id, target_id]
+        
+        landmark_info = None
+        if use_landmarks and direct_path is None:
+            landmarks = self._identify_landmark_nodes(adjacency)
+            heuristic = self._landmark_heuristic(arrays, landmarks, target_id)
+            lower_bound = heuristic[arrays.node_idx[source_id]]
+            landmark_info = {"used": True, "landmarks": landmarks, "lower_bound": lower_bound}
+            if lower_bound > max_degrees:
+                landmark_info["computation_time_saved"] = len(adjacency)
+                reason = "no_path_exists" if lower_bound == float('inf') else "path_exceeds_max_degrees"
+                return {**result, **self._no_path_result(reason), "landmark_optimization": landmark_info}
+            if algorithm in ("bfs", "bidirectional"):
+                # Hop-count searches become A* with the landmark bounds as heuristic
+                search = partial(self._landmark_astar_path, node_idx=arrays.node_idx, heuristic=heuristic)
+        
+        if algorithm == "dijkstra" and len({s for neighbors in adjacency.values() for _, s in neighbors}) <= 1:
+            # Equal strengths make every path equally weighted per hop: fewest hops wins
+            search = self._bfs_path
+            result["dijkstra_fast_path"] = "unit_weight_bfs"
+        if direct_path is not None:
+            path, truncated, explored = direct_path, False, len(direct_path)
+        else:
+            path, truncated, explored = search(adjacency, source_id, target_id, max_degrees)
+        result["nodes_explored"] = explored
+        if landmark_info is not None:
+            # Measured in node expansions avoided compared with a full traversal
+            landmark_info["computation_time_saved"] = max(0, len(adjacency) - explored)
+            result["landmark_optimization"] = landmark_info
+        
+        if path is None:
+            reason = "path_exceeds_max_degrees" if truncated else "no_path_exists"
+            return {**result, **self._no_path_result(reason)}
+        
+        path_edges = [edges[(a, b)] for a, b in zip(path, path[1:])]
+        result.update(self._score_path(path, path_edges))
+        
+        if include_introduction_template and len(path) >= 3:
+            result["introduction_template"] = self._build_introduction_template(path, path_edges)
+        if include_network_stats:
+            result["network_statistics"] = self._compute_path_network_stats(network_data, arrays, path)
+        if include_risk_assessment:
+            result["risk_assessment"] = self._assess_path_risk(path_edges)
+        
+        return result
+    
+    def _no_path_result(self, reason: str) -> Dict[str, Any]:
+        """Result fields for a query that found no path"""
+        return {"path_found": False, "path": [], "path_length": 0, "error_reason": reason}
+    
+    def _score_path(self, path: List[str], path_edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Strength analysis, quality and confidence for a discovered path"""
+        # One pass over the path's edges gathers everything the scores need
+        relationship_types = []
+        edge_details = []
+        total_strength = 0.0
+        min_strength = float('inf')
+        documented = 0
+        for (a, b), rel in zip(zip(path, path[1:]), path_edges):
+            strength = rel.get("strength", 0)
+            rel_type = rel.get("type", "unknown")
+            relationship_types.append(rel_type)
+            edge_details.append({"from": a, "to": b, "type": rel_type,
+                                 "strength": strength, "context": rel.get("context", "")})
+            total_strength += strength
+            min_strength = min(min_strength, strength)
+            documented += bool(rel.get("type") and rel.get("context"))
+        
+        path_length = len(path) - 1
+        avg_strength = total_strength / len(path_edges) if path_edges else 0
+        min_strength = min_strength if path_edges else 0
+        confidence_factors = {
+            "relationship_strength": avg_strength,
+            "path_length": max(0, 1 - (path_length - 1) * 0.1),
+            "data_completeness": documented / len(path_edges) if path_edges else 1.0
+        }
+        
+        return {
+            "path_found": True,
+            "path": path,
+            "path_length": path_length,
+            "path_quality": self._assess_path_quality(avg_strength, min_strength),
+            "relationship_analysis": {
+                "average_strength": avg_strength,
+                "minimum_strength": min_strength,
+                "relationship_types": relationship_types,
+                "edge_details": edge_details
+            },
+            "confidence_score": self._confidence_from_stats(avg_strength, min_strength, len(path)) if path_edges else 0,
+            "confidence_factors": confidence_factors
+        }
+    
+    def _build_introduction_template(self, path: List[str], path_edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Draft an introduction request routed through the first intermediary"""
+        intermediate, target = path[1], path[-1]
+        first_context = path_edges[0].get("context") or path_edges[0].get("type", "a shared connection")
+        
+        return {
+            "template_text": (
+                f"Hi {intermediate}, I hope you're well. Given our connection through {first_context}, "
+                f"would you be open to introducing me to {target}? "
+                f"I'd value the chance to connect and explore shared interests."
+            ),
+            "recommended_approach": (
+                "Direct introduction" if len(path) == 3
+                else f"Warm introduction chain through {len(path) - 2} intermediaries"
+            ),
+            "relationship_context": [
+                {"from": a, "to": b, "type": rel.get("type", "unknown"), "context": rel.get("context", "")}
+                for (a, b), rel in zip(zip(path, path[1:]), path_edges)
+            ]
+        }
+    
+    def _compute_path_network_stats(self, network_data: NetworkData, arrays: _NetworkArrays,
+                                    path: List[str]) -> Dict[str, Any]:
+        """Network-level statistics for the graph a path was discovered in
+        
+        Centrality is node strength normalized to the strongest node, a cheap
+        stand-in for betweenness that needs no all-pairs shortest paths.
+        """
+        node_strength = arrays.node_strength
+        max_strength = node_strength.max() if node_strength.size else 0.0
+        centrality = node_strength / max_strength if max_strength > 0 else node_strength
+        if isinstance(network_data, _NetworkArrays):
+            total_nodes, total_edges = arrays.num_nodes, arrays.indices.size // 2
+        else:
+            total_nodes = len(network_data.get("nodes", []))
+            total_edges = len(network_data.get("relationships", []))
+        return {
+            "total_nodes": total_nodes,
+            "total_edges": total_edges,
+            "network_density": arrays.density,
+            "average_clustering": arrays.average_clustering,
+            "relationship_type_counts": arrays.relationship_type_counts,
+            "centrality_scores": {node: float(centrality[arrays.node_idx[node]]) for node in path},
+            "shortest_path_lengths": self._bfs_distances(arrays.adjacency, path[0])
+        }
+    
+    def _assess_path_risk(self, path_edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Identify weak, outdated and missing links along a path
+        
+        Relationships older than a year count as outdated when the edge
+        records a created_at datetime or ISO timestamp.
+        """
+        severity_levels = ["low", "medium", "high"]
+        outdated_before = datetime.now() - timedelta(days=365)
+        
+        # One pass over the path's edges counts every per-edge factor
+        weak_links = outdated_links = 0
+        for rel in path_edges:
+            weak_links += rel.get("strength", 0) < 0.5
+            created_at = rel.get("created_at")
+            if isinstance(created_at, str):
+                try:
+                    created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+                except ValueError:
+                    created_at = None
+            if isinstance(created_at, datetime):
+                outdated_links += created_at.replace(tzinfo=None) < outdated_before
+        
+        counts = {
+            "weak_connections": weak_links,
+            "relationship_gaps": max(0, len(path_edges) - 3),
+            "outdated_connections": outdated_links
+        }
+        risk_factors = [
+            {"factor": factor, "severity": severity_levels[min(count, 3) - 1], "count": count}
+            for factor, count in counts.items() if count
+        ]
+        
+        overall = max((severity_levels.index(f["severity"]) for f in risk_factors), default=0)
+        return {"overall_risk": severity_levels[overall], "risk_factors": risk_factors}
+    
     def get_network_statistics(self, tenant_id: str) -> Dict[str, Any]:
         """Get comprehensive network statistics for tenant"""
+        cached = self._network_stats_cache.get(tenant_id)
+        if cached is not None and cached[0] == self._graph_version:
+            return dict(cached[1])
+        
         try:
             # Filter nodes by tenant
             tenant_nodes = [n for n in self.relationship_graph.nodes() 
@@ -524,57 +1413,63 @@ class ProcessingAgent:
             if not tenant_nodes:
                 return {"nodes": 0, "edges": 0, "density": 0, "components": 0}
             
-            # Create subgraph for tenant
+            from scipy.sparse import csgraph
+            
+            # Create subgraph for tenant and index it once as a sparse adjacency matrix
             tenant_subgraph = self.relationship_graph.subgraph(tenant_nodes)
+            nodes = list(tenant_subgraph)
+            pattern = nx.to_scipy_sparse_array(tenant_subgraph, nodelist=nodes, weight=None, format="csr")
+            # Self-loops count twice toward NetworkX degree but never toward
+            # triangles or distances
+            self_loops = pattern.diagonal() != 0
+            pattern.setdiag(0)
+            pattern.eliminate_zeros()
+            degree = np.diff(pattern.indptr)
+            diameter, closeness = _distance_stats(pattern)
             
             stats = {
-                "nodes": tenant_subgraph.number_of_nodes(),
+                "nodes": len(nodes),
                 "edges": tenant_subgraph.number_of_edges(),
                 "density": nx.density(tenant_subgraph),
-                "components": nx.number_connected_components(tenant_subgraph),
-                "average_clustering": nx.average_clustering(tenant_subgraph),
-                "diameter": self._safe_diameter(tenant_subgraph),
-                "centrality_leaders": self._get_centrality_leaders(tenant_subgraph),
+                "components": int(csgraph.connected_components(pattern, directed=False, return_labels=False)),
+                "average_clustering": _average_clustering(pattern, degree),
+                "diameter": diameter,
+                "centrality_leaders": self._get_centrality_leaders(tenant_subgraph, nodes, degree + 2 * self_loops, closeness),
                 "tenant_id": tenant_id
             }
             
-            return stats
+            self._network_stats_cache[tenant_id] = (self._graph_version, stats)
+            return dict(stats)
             
         except Exception as e:
             logger.error(f"Error calculating network statistics: {str(e)}")
             return {"error": str(e)}
     
-    def _safe_diameter(self, graph):
-        """Safely calculate graph diameter"""
-        try:
-            if nx.is_connected(graph):
-                return nx.diameter(graph)
-            else:
-                # For disconnected graphs, return the maximum diameter of components
-                components = nx.connected_components(graph)
-                max_diameter = 0
-                for component in components:
-                    subgraph = graph.subgraph(component)
-                    if len(subgraph) > 1:
-                        max_diameter = max(max_diameter, nx.diameter(subgraph))
-                return max_diameter
-        except:
-            return 0
-    
-    def _get_centrality_leaders(self, graph, limit: int = 5):
-        """Get top nodes by centrality measures"""
+    def _get_centrality_leaders(self, graph, nodes: List[str], degree: np.ndarray,
+                                closeness: np.ndarray, limit: int = 5):
+        """Get top nodes by centrality measures
+        
+        Degree and closeness come precomputed from the sparse adjacency, in
+        nodes order; betweenness still needs NetworkX.
+        """
         try:
-            if len(graph.nodes()) == 0:
+            if len(nodes) == 0:
                 return {}
             
-            degree_centrality = nx.degree_centrality(graph)
-            betweenness_centrality = nx.betweenness_centrality(graph)
-            closeness_centrality = nx.closeness_centrality(graph)
+            degree_centrality = degree / (len(nodes) - 1) if len(nodes) > 1 else np.ones(len(nodes))
+            if CENTRALITY_BACKEND:
+                betweenness_centrality = nx.betweenness_centrality(graph, backend=CENTRALITY_BACKEND)
+            else:
+                betweenness_centrality = nx.betweenness_centrality(graph)
+            
+            def leaders(scores: np.ndarray):
+                # Stable sort keeps graph order among ties, as sorted() did
+                return [(nodes[i], float(scores[i])) for i in np.argsort(-scores, kind="stable")[:limit]]
             
             return {
-                "degree": sorted(degree_centrality.items(), key=lambda x: x[1], reverse=True)[:limit],
-                "betweenness": sorted(betweenness_centrality.items(), key=lambda x: x[1], reverse=True)[:limit],
-                "closeness": sorted(closeness_centrality.items(), key=lambda x: x[1], reverse=True)[:limit]
+                "degree": leaders(degree_centrality),
+                "betweenness": leaders(np.array([betweenness_centrality[node] for node in nodes])),
+                "closeness": leaders(closeness)
             }
         except Exception as e:
             logger.error(f"Error calculating centrality leaders: {str(e)}")
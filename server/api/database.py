@@ -0,0 +1,54 @@
+"""
+Shared asyncpg connection pool for the v2 API routers
+Connections are borrowed per request and returned to the pool instead of
+opening a new TCP/TLS session every time
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+import asyncpg
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+POOL_MIN_SIZE = 10
+POOL_MAX_SIZE = 50
+# Per-connection prepared statement cache; covers every distinct query the routers issue
+STATEMENT_CACHE_SIZE = 256
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+async def init_db_pool(dsn: Optional[str] = None) -> asyncpg.Pool:
+    """Create the shared pool if it does not exist yet; safe to call from app lifespan"""
+    global _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await asyncpg.create_pool(
+                dsn or DATABASE_URL,
+                min_size=POOL_MIN_SIZE,
+                max_size=POOL_MAX_SIZE,
+                max_queries=50000,
+                max_inactive_connection_lifetime=300,
+                statement_cache_size=STATEMENT_CACHE_SIZE,
+                max_cached_statement_lifetime=300
+            )
+    return _pool
+
+async def close_db_pool():
+    """Close the shared pool, e.g. on application shutdown"""
+    global _pool
+    async with _pool_lock:
+        if _pool is not None:
+            await _pool.close()
+            _pool = None
+
+async def get_db_connection() -> asyncpg.Connection:
+    """Borrow a connection from the shared pool; hand it back with release_db_connection"""
+    pool = _pool or await init_db_pool()
+    return await pool.acquire()
+
+async def release_db_connection(conn: asyncpg.Connection):
+    """Return a borrowed connection; the pool resets session state such as SET values"""
+    await _pool.release(conn)
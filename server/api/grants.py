@@ -5,24 +5,18 @@ Provides CRUD operations, timeline analysis, and grant metrics
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional, Dict, Any
-import asyncpg
-import os
 from datetime import datetime, date, timedelta
 
 from auth.jwt_auth import get_current_active_user, TokenData
+from .database import get_db_connection, release_db_connection
 from .models import (
     GrantCreate, GrantUpdate, GrantResponse, GrantMetrics,
     GrantMilestoneCreate, GrantMilestoneUpdate, GrantMilestoneResponse,
     GrantTimeline, PaginatedResponse, SuccessResponse
 )
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 router = APIRouter(prefix="/api/v2/grants", tags=["grants"])
 
-async def get_db_connection():
-    """Get database connection"""
-    return await asyncpg.connect(DATABASE_URL)
-
 async def validate_grant_access(grant_id: str, tenant_id: str) -> bool:
     """Validate grant belongs to tenant"""
     conn = await get_db_connection()
@@ -33,7 +27,7 @@ async def validate_grant_access(grant_id: str, tenant_id: str) -> bool:
         )
         return result
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 def convert_db_record(record) -> Dict[str, Any]:
     """Convert database record to dictionary"""
@@ -117,7 +111,7 @@ async def list_grants(
         )
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.post("/", response_model=GrantResponse, status_code=status.HTTP_201_CREATED)
 async def create_grant(
@@ -180,7 +174,7 @@ async def create_grant(
         return GrantResponse(**convert_db_record(record))
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 async def generate_grant_milestones(conn, grant_id: str, submission_deadline: date, tenant_id: str):
     """Generate automatic milestones for grant backwards planning"""
@@ -281,7 +275,7 @@ async def get_grant(
         return GrantResponse(**grant_dict)
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.get("/{grant_id}/timeline", response_model=GrantTimeline)
 async def get_grant_timeline(
@@ -364,7 +358,7 @@ async def get_grant_timeline(
         )
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.post("/{grant_id}/milestones", response_model=GrantMilestoneResponse, status_code=status.HTTP_201_CREATED)
 async def create_milestone(
@@ -400,7 +394,7 @@ async def create_milestone(
         return GrantMilestoneResponse(**convert_db_record(record))
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.put("/{grant_id}/milestones/{milestone_id}", response_model=GrantMilestoneResponse)
 async def update_milestone(
@@ -462,7 +456,7 @@ async def update_milestone(
         return GrantMilestoneResponse(**convert_db_record(record))
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.get("/metrics/overview", response_model=GrantMetrics)
 async def get_grant_metrics(
@@ -540,4 +534,4 @@ async def get_grant_metrics(
         )
         
     finally:
-        await conn.close()
\ No newline at end of file
+        await release_db_connection(conn)
\ No newline at end of file
@@ -5,26 +5,20 @@ Provides CRUD operations, network analysis, and advanced pathfinding algorithms
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional, Dict, Any, Set, Tuple
-import asyncpg
-import os
 from datetime import datetime, date
 from collections import deque, defaultdict
 import heapq
 
 from auth.jwt_auth import get_current_active_user, TokenData
+from .database import get_db_connection, release_db_connection
 from .models import (
     RelationshipCreate, RelationshipUpdate, RelationshipResponse, RelationshipMetrics,
     SevenDegreePathResponse, RelationshipPath, PathNode,
     PaginatedResponse, SuccessResponse
 )
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 router = APIRouter(prefix="/api/v2/relationships", tags=["relationships"])
 
-async def get_db_connection():
-    """Get database connection"""
-    return await asyncpg.connect(DATABASE_URL)
-
 async def validate_relationship_access(relationship_id: str, tenant_id: str) -> bool:
     """Validate relationship belongs to tenant"""
     conn = await get_db_connection()
@@ -35,7 +29,7 @@ async def validate_relationship_access(relationship_id: str, tenant_id: str) ->
         )
         return result
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 def convert_db_record(record) -> Dict[str, Any]:
     """Convert database record to dictionary"""
@@ -162,7 +156,7 @@ async def list_relationships(
         )
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.post("/", response_model=RelationshipResponse, status_code=status.HTTP_201_CREATED)
 async def create_relationship(
@@ -231,7 +225,7 @@ async def create_relationship(
         return RelationshipResponse(**convert_db_record(record))
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.get("/path-discovery/{source_id}/{target_id}", response_model=SevenDegreePathResponse)
 async def discover_relationship_path(
@@ -376,7 +370,7 @@ async def discover_relationship_path(
         )
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 def find_shortest_path(graph: Dict, source: str, target: str, max_depth: int) -> Optional[Dict]:
     """Find shortest path using BFS"""
@@ -622,4 +616,4 @@ async def get_relationship_metrics(
         )
         
     finally:
-        await conn.close()
\ No newline at end of file
+        await release_db_connection(conn)
\ No newline at end of file
@@ -6,24 +6,17 @@ Provides CRUD operations, metrics, and advanced sponsor analytics
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional, Dict, Any
 import asyncpg
-import os
 from datetime import datetime, timedelta
 
 from auth.jwt_auth import get_current_active_user, TokenData
+from .database import get_db_connection, release_db_connection
 from .models import (
     SponsorCreate, SponsorUpdate, SponsorResponse, SponsorMetrics,
     SponsorFilters, PaginatedResponse, SuccessResponse
 )
 
-# Database connection
-DATABASE_URL = os.getenv("DATABASE_URL")
-
 router = APIRouter(prefix="/api/v2/sponsors", tags=["sponsors"])
 
-async def get_db_connection():
-    """Get database connection"""
-    return await asyncpg.connect(DATABASE_URL)
-
 async def validate_tenant_access(sponsor_id: str, tenant_id: str) -> bool:
     """Validate sponsor belongs to tenant"""
     conn = await get_db_connection()
@@ -34,7 +27,7 @@ async def validate_tenant_access(sponsor_id: str, tenant_id: str) -> bool:
         )
         return result
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 def convert_db_record(record) -> Dict[str, Any]:
     """Convert database record to dictionary"""
@@ -109,7 +102,7 @@ async def list_sponsors(
         )
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.post("/", response_model=SponsorResponse, status_code=status.HTTP_201_CREATED)
 async def create_sponsor(
@@ -158,7 +151,68 @@ async def create_sponsor(
             detail="Sponsor with this email already exists in tenant"
         )
     finally:
-        await conn.close()
+        await release_db_connection(conn)
+
+@router.post("/bulk", response_model=List[SponsorResponse], status_code=status.HTTP_201_CREATED)
+async def create_sponsors_bulk(
+    sponsors_data: List[SponsorCreate],
+    current_user: TokenData = Depends(get_current_active_user)
+):
+    """Create several sponsors with one batched INSERT in a single transaction"""
+    import uuid
+    sponsor_ids = [str(uuid.uuid4()) for _ in sponsors_data]
+    rows = [
+        (
+            sponsor_id,
+            current_user.tenant_id,
+            sponsor_data.name,
+            sponsor_data.email,
+            sponsor_data.phone,
+            sponsor_data.tier.value,
+            sponsor_data.organization,
+            sponsor_data.website,
+            sponsor_data.notes,
+            sponsor_data.tags or []
+        )
+        for sponsor_id, sponsor_data in zip(sponsor_ids, sponsors_data)
+    ]
+    
+    conn = await get_db_connection()
+    try:
+        async with conn.transaction():
+            await conn.execute("SELECT set_config('app.current_tenant_id', $1, true)", current_user.tenant_id)
+            
+            await conn.executemany(
+                """
+                INSERT INTO sponsors (
+                    id, tenant_id, name, email, phone, tier, organization, 
+                    website, notes, tags, created_at, updated_at
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, NOW(), NOW())
+                """,
+                rows
+            )
+            
+            # executemany returns no rows; read the batch back in request order
+            records = await conn.fetch(
+                """
+                SELECT s.* FROM unnest($1::text[]) WITH ORDINALITY AS ids(id, position)
+                JOIN sponsors s ON s.id::text = ids.id
+                WHERE s.tenant_id = $2
+                ORDER BY ids.position
+                """,
+                sponsor_ids, current_user.tenant_id
+            )
+        
+        return [SponsorResponse(**convert_db_record(record)) for record in records]
+        
+    except asyncpg.UniqueViolationError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Sponsor with this email already exists in tenant"
+        )
+    finally:
+        await release_db_connection(conn)
 
 @router.get("/{sponsor_id}", response_model=SponsorResponse)
 async def get_sponsor(
@@ -190,7 +244,7 @@ async def get_sponsor(
         return SponsorResponse(**convert_db_record(record))
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.put("/{sponsor_id}", response_model=SponsorResponse)
 async def update_sponsor(
@@ -251,7 +305,7 @@ async def update_sponsor(
         return SponsorResponse(**convert_db_record(record))
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.delete("/{sponsor_id}", response_model=SuccessResponse)
 async def delete_sponsor(
@@ -296,7 +350,7 @@ async def delete_sponsor(
         return SuccessResponse(message="Sponsor deleted successfully")
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.get("/metrics/overview", response_model=SponsorMetrics)
 async def get_sponsor_metrics(
@@ -357,7 +411,7 @@ async def get_sponsor_metrics(
         )
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.get("/{sponsor_id}/grants")
 async def get_sponsor_grants(
@@ -386,7 +440,7 @@ async def get_sponsor_grants(
         return [convert_db_record(grant) for grant in grants]
         
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 @router.get("/{sponsor_id}/relationships")
 async def get_sponsor_relationships(
@@ -419,4 +473,4 @@ async def get_sponsor_relationships(
         return [convert_db_record(rel) for rel in relationships]
         
     finally:
-        await conn.close()
\ No newline at end of file
+        await release_db_connection(conn)
\ No newline at end of file
@@ -2,15 +2,24 @@
 JWT Authentication module for Zero Gate ESO Platform
 Handles token validation, role-based access control, and tenant context
 """
+import base64
+import hashlib
+import hmac
+import json
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional
+from datetime import datetime
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 import bcrypt
 from passlib.context import CryptContext
 
+from .roles import role_level
+
 logger = logging.getLogger("zero-gate.jwt-auth")
 
 # JWT Configuration
@@ -18,6 +27,28 @@ JWT_SECRET_KEY = "zero-gate-jwt-secret-key-2025"  # In production, use environme
 JWT_ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+REFRESH_TOKEN_EXPIRE_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+VERIFIED_TOKEN_CACHE_ENABLED = False  # set True to skip re-verifying recently seen tokens
+VERIFIED_TOKEN_CACHE_SIZE = 10000
+VERIFIED_TOKEN_CACHE_TTL_SECONDS = 5
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# Tokens all share one header and one keyed HMAC; signing copies the keyed state.
+# Only HMAC algorithms are supported, with the digest matching the header's alg
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+if JWT_ALGORITHM not in _HMAC_DIGESTS:
+    raise ValueError(f"JWT_ALGORITHM must be one of {sorted(_HMAC_DIGESTS)}, got {JWT_ALGORITHM!r}")
+
+_JWT_HEADER_SEGMENT = _b64url(json.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode())
+_JWT_HMAC = hmac.new(JWT_SECRET_KEY.encode(), digestmod=_HMAC_DIGESTS[JWT_ALGORITHM])
+
+# sha256(token)[:16] -> (claims, cache expiry); only successful verifications
+# are stored, and never past the token's own exp
+_verified_tokens: "OrderedDict[bytes, tuple]" = OrderedDict()
+_verified_tokens_lock = threading.Lock()
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -31,34 +62,67 @@ class UserClaims:
         self.tenant_id = tenant_id
         self.role = role
 
-def create_access_token(user_id: str, email: str, tenant_id: str, role: str) -> str:
-    """Create JWT access token"""
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {
+def _sign_token(payload: Dict[str, Any]) -> str:
+    """Encode and sign a compact HMAC JWT using JWT_ALGORITHM"""
+    signing_input = _JWT_HEADER_SEGMENT + b"." + _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    mac = _JWT_HMAC.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode()
+
+def _access_claims(user_id: str, email: str, tenant_id: str, role: str, issued_at: int) -> Dict[str, Any]:
+    return {
         "sub": user_id,
         "email": email,
         "tenant_id": tenant_id,
         "role": role,
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": issued_at + ACCESS_TOKEN_EXPIRE_SECONDS,
+        "iat": issued_at,
         "type": "access"
     }
-    return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+def create_access_token(user_id: str, email: str, tenant_id: str, role: str) -> str:
+    """Create JWT access token"""
+    return _sign_token(_access_claims(user_id, email, tenant_id, role, int(time.time())))
+
+def create_access_tokens_bulk(users: Iterable[Dict[str, str]]) -> List[str]:
+    """Create access tokens for many users at once
+    
+    Each item holds the create_access_token arguments (user_id, email,
+    tenant_id, role); all tokens share one issue time.
+    """
+    issued_at = int(time.time())
+    return [_sign_token(_access_claims(issued_at=issued_at, **user)) for user in users]
 
 def create_refresh_token(user_id: str, email: str) -> str:
     """Create JWT refresh token"""
-    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode = {
+    issued_at = int(time.time())
+    return _sign_token({
         "sub": user_id,
         "email": email,
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": issued_at + REFRESH_TOKEN_EXPIRE_SECONDS,
+        "iat": issued_at,
         "type": "refresh"
-    }
-    return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    })
 
 def verify_token(token: str) -> Dict[str, Any]:
-    """Verify and decode JWT token"""
+    """Verify and decode JWT token
+    
+    Repeat verifications of the same token within
+    VERIFIED_TOKEN_CACHE_TTL_SECONDS are served from a bounded LRU cache
+    while VERIFIED_TOKEN_CACHE_ENABLED is set.
+    """
+    use_cache = VERIFIED_TOKEN_CACHE_ENABLED
+    now = time.time()
+    if use_cache:
+        key = hashlib.sha256(token.encode()).digest()[:16]
+        with _verified_tokens_lock:
+            cached = _verified_tokens.get(key)
+            if cached is not None:
+                if now < cached[1]:
+                    _verified_tokens.move_to_end(key)
+                    return dict(cached[0])
+                del _verified_tokens[key]
+    
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         
@@ -66,6 +130,13 @@ def verify_token(token: str) -> Dict[str, Any]:
         if datetime.utcnow() > datetime.fromtimestamp(payload.get("exp", 0)):
             raise HTTPException(status_code=401, detail="Token expired")
         
+        if use_cache:
+            expires_at = min(now + VERIFIED_TOKEN_CACHE_TTL_SECONDS, payload.get("exp", 0))
+            with _verified_tokens_lock:
+                _verified_tokens[key] = (dict(payload), expires_at)
+                if len(_verified_tokens) > VERIFIED_TOKEN_CACHE_SIZE:
+                    _verified_tokens.popitem(last=False)
+        
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
@@ -117,21 +188,11 @@ async def require_auth(current_user: UserClaims = Depends(get_current_user)) ->
 
 def require_role(required_role: str):
     """Require specific role or higher"""
-    
-    # Role hierarchy: viewer < user < manager < admin < owner
-    role_hierarchy = {
-        "viewer": 1,
-        "user": 2,
-        "manager": 3,
-        "admin": 4,
-        "owner": 5
-    }
+    # Unknown required roles can never be satisfied
+    required_role_level = role_level(required_role, default=99)
     
     async def role_checker(current_user: UserClaims = Depends(get_current_user)) -> UserClaims:
-        user_role_level = role_hierarchy.get(current_user.role, 0)
-        required_role_level = role_hierarchy.get(required_role, 99)
-        
-        if user_role_level < required_role_level:
+        if role_level(current_user.role) < required_role_level:
             raise HTTPException(
                 status_code=403, 
                 detail=f"Insufficient permissions. Required: {required_role}, Current: {current_user.role}"
@@ -173,6 +234,7 @@ async def get_dev_user() -> UserClaims:
 # Export authentication functions
 __all__ = [
     "create_access_token",
+    "create_access_tokens_bulk",
     "create_refresh_token", 
     "verify_token",
     "hash_password",
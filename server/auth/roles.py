@@ -0,0 +1,21 @@
+"""
+Role hierarchy for Zero Gate ESO Platform
+viewer < user < manager < admin < owner
+"""
+from enum import IntEnum
+from typing import Dict
+
+class Role(IntEnum):
+    """Roles ordered by privilege, so levels compare as plain integers"""
+    VIEWER = 1
+    USER = 2
+    MANAGER = 3
+    ADMIN = 4
+    OWNER = 5
+
+# Role claim string -> Role; the JWT "role" claim stays a lowercase name
+ROLE_LEVELS: Dict[str, Role] = {role.name.lower(): role for role in Role}
+
+def role_level(role: str, default: int = 0) -> int:
+    """Privilege level of a role name, or default for unknown roles"""
+    return ROLE_LEVELS.get(role, default)
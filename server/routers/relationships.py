@@ -8,6 +8,7 @@ from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from pydantic import BaseModel, Field
 import logging
+import uuid
 
 # Mock auth dependencies for development
 def require_auth():
@@ -180,6 +181,37 @@ async def create_relationship(
         logger.error(f"Error creating relationship: {e}")
         raise HTTPException(status_code=500, detail="Failed to create relationship")
 
+@router.post("/bulk", response_model=List[RelationshipResponse])
+async def create_relationships_bulk(
+    relationships_data: List[RelationshipCreate],
+    request: Request,
+    current_user=Depends(require_role("user"))
+):
+    """Create several relationships in a single request"""
+    try:
+        tenant_id = get_current_user_tenant(current_user)
+        created_at = datetime.utcnow()
+        
+        # Mock implementation for development
+        return [
+            RelationshipResponse(
+                id=f"rel-{uuid.uuid4()}",
+                source_id=relationship_data.source_id,
+                target_id=relationship_data.target_id,
+                relationship_type=relationship_data.relationship_type,
+                strength=relationship_data.strength or 0.5,
+                description=relationship_data.description,
+                created_at=created_at,
+                updated_at=created_at,
+                tenant_id=tenant_id
+            )
+            for relationship_data in relationships_data
+        ]
+    
+    except Exception as e:
+        logger.error(f"Error creating relationships in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create relationships")
+
 @router.post("/discover-path", response_model=PathDiscoveryResult)
 async def discover_path(
     path_request: PathDiscoveryRequest,
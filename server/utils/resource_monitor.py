@@ -7,13 +7,16 @@ import threading
 import time
 import logging
 import gc
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
 logger = logging.getLogger("zero-gate.monitoring")
 
 class ResourceMonitor:
-    def __init__(self, cpu_threshold: int = 65, memory_threshold: int = 70):
+    DISK_SAMPLE_INTERVAL = 60  # seconds; disk usage barely moves between samples
+    
+    def __init__(self, cpu_threshold: int = 65, memory_threshold: int = 70,
+                 sampler: Optional[Callable[[], Tuple[float, float, float]]] = None):
         """Initialize ResourceMonitor with 70% memory threshold per specifications"""
         self.cpu_threshold = cpu_threshold
         self.memory_threshold = memory_threshold  # 70% per File 45 specifications
@@ -48,6 +51,14 @@ class ResourceMonitor:
             "memory_emergency": 90   # Only core operations
         }
         
+        self._disk_sampled_at: Optional[float] = None
+        self._disk_usage = 0.0
+        # Returns (cpu, memory, disk) percentages; defaults to reading psutil
+        self.sampler = sampler or self._sample_system_usage
+        
+        # Prime psutil's CPU counters; later non-blocking reads cover the time since the previous call
+        psutil.cpu_percent(interval=None)
+        
     def start(self):
         """Start resource monitoring with 70% compliance tracking"""
         self.running = True
@@ -66,39 +77,54 @@ class ResourceMonitor:
         """Enhanced monitoring loop with 70% compliance"""
         while self.running:
             try:
-                # Get current resource usage
-                cpu_usage = psutil.cpu_percent(interval=1)
-                memory_usage = psutil.virtual_memory().percent
-                disk_usage = psutil.disk_usage('/').percent
-                
-                self.current_usage.update({
-                    "cpu": cpu_usage,
-                    "memory": memory_usage,
-                    "disk": disk_usage,
-                    "timestamp": datetime.now()
-                })
-                
-                # Track compliance violations
-                if memory_usage > self.memory_threshold:
-                    self.compliance_violations += 1
-                    logger.warning(f"Memory compliance violation #{self.compliance_violations}: {memory_usage:.1f}% > {self.memory_threshold}%")
-                
-                # Update feature flags based on enhanced thresholds
-                self._update_feature_flags_enhanced(cpu_usage, memory_usage)
-                
-                # Trigger emergency actions if needed
-                self._handle_emergency_conditions(memory_usage)
-                
-                # Log compliance status
-                compliance_status = "COMPLIANT" if memory_usage <= self.memory_threshold else "VIOLATION"
-                logger.info(f"Memory Compliance: {memory_usage:.1f}% ({compliance_status}) | Features: {sum(self.feature_flags.values())}/7 enabled")
-                
+                self._take_sample()
                 time.sleep(5)  # Check every 5 seconds per specifications
                 
             except Exception as e:
                 logger.error(f"Error in resource monitoring: {str(e)}")
                 time.sleep(10)
     
+    def _take_sample(self):
+        """Sample resource usage once and apply feature flag and emergency rules"""
+        # Get current resource usage
+        cpu_usage, memory_usage, disk_usage = self.sampler()
+        
+        self.current_usage.update({
+            "cpu": cpu_usage,
+            "memory": memory_usage,
+            "disk": disk_usage,
+            "timestamp": datetime.now()
+        })
+        
+        # Track compliance violations
+        if memory_usage > self.memory_threshold:
+            self.compliance_violations += 1
+            logger.warning(f"Memory compliance violation #{self.compliance_violations}: {memory_usage:.1f}% > {self.memory_threshold}%")
+        
+        # Update feature flags based on enhanced thresholds
+        self._update_feature_flags_enhanced(cpu_usage, memory_usage)
+        
+        # Trigger emergency actions if needed
+        self._handle_emergency_conditions(memory_usage)
+        
+        # Log compliance status
+        compliance_status = "COMPLIANT" if memory_usage <= self.memory_threshold else "VIOLATION"
+        logger.info(f"Memory Compliance: {memory_usage:.1f}% ({compliance_status}) | Features: {sum(self.feature_flags.values())}/7 enabled")
+    
+    def _sample_system_usage(self) -> Tuple[float, float, float]:
+        """Read CPU, memory and disk usage percentages from psutil"""
+        cpu_usage = psutil.cpu_percent(interval=None)
+        memory_usage = psutil.virtual_memory().percent
+        return cpu_usage, memory_usage, self._sample_disk_usage()
+    
+    def _sample_disk_usage(self) -> float:
+        """Disk usage percentage, re-read at most once per DISK_SAMPLE_INTERVAL"""
+        now = time.monotonic()
+        if self._disk_sampled_at is None or now - self._disk_sampled_at >= self.DISK_SAMPLE_INTERVAL:
+            self._disk_sampled_at = now
+            self._disk_usage = psutil.disk_usage('/').percent
+        return self._disk_usage
+    
     def _update_feature_flags_enhanced(self, cpu_usage: float, memory_usage: float):
         """Enhanced feature flag management with 70% threshold compliance"""
         
@@ -4,9 +4,9 @@ Provides common setup for Zero Gate ESO Platform backend tests
 """
 
 import pytest
-import asyncio
 import os
 import sys
+import time
 from typing import Dict, Any
 import uuid
 from datetime import datetime, timedelta
@@ -16,7 +16,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'server'))
 
 # Import test dependencies
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+
+# Optional faster event loop; not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Import our application
 try:
@@ -28,12 +34,17 @@ except ImportError:
     def create_access_token(data):
         return "mock_token_for_testing"
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+# Fixed namespace so tenant IDs are identical across runs and workers
+TENANT_NAMESPACE = uuid.UUID('12345678-1234-5678-1234-567812345678')
+
+def tenant_uuid(name: str) -> str:
+    """Deterministic tenant ID for a fixture tenant name"""
+    return str(uuid.uuid5(TENANT_NAMESPACE, name))
+
+if uvloop is not None:
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop when it is installed"""
+        return {"uvloop": uvloop.new_event_loop}
 
 @pytest.fixture(scope="session")
 def test_app():
@@ -42,14 +53,15 @@ def test_app():
 
 @pytest.fixture(scope="session")
 def test_client():
-    """Create test client for FastAPI app"""
-    return TestClient(app)
+    """Create test client for FastAPI app, running lifespan startup/shutdown once per session"""
+    with TestClient(app) as client:
+        yield client
 
 @pytest.fixture
 def test_tenant():
     """Create a test tenant configuration"""
     return {
-        'id': str(uuid.uuid4()),
+        'id': tenant_uuid('test_tenant'),
         'name': 'Test Tenant Organization',
         'domain': 'test.tenant.com',
         'status': 'active'
@@ -87,10 +99,17 @@ def auth_headers(auth_token, test_tenant):
 
 @pytest.fixture
 def mock_database():
-    """Mock database connection for testing"""
-    with patch('server.db.pool') as mock_pool:
-        mock_connection = MagicMock()
-        mock_pool.acquire.return_value = mock_connection
+    """Mock the shared asyncpg pool so API handlers run without a database round-trip"""
+    mock_connection = AsyncMock()
+    mock_connection.fetch.return_value = []
+    mock_connection.fetchrow.return_value = None
+    mock_connection.fetchval.return_value = 0
+    mock_connection.transaction = MagicMock()
+    
+    mock_pool = MagicMock()
+    mock_pool.acquire = AsyncMock(return_value=mock_connection)
+    mock_pool.release = AsyncMock()
+    with patch('server.api.database._pool', mock_pool):
         yield mock_connection
 
 @pytest.fixture
@@ -143,17 +162,17 @@ def multiple_tenants():
     """Create multiple tenant configurations for isolation testing"""
     return {
         'tenant_a': {
-            'id': str(uuid.uuid4()),
+            'id': tenant_uuid('tenant_a'),
             'name': 'Tenant A Organization',
             'domain': 'tenant-a.test.com'
         },
         'tenant_b': {
-            'id': str(uuid.uuid4()),
+            'id': tenant_uuid('tenant_b'),
             'name': 'Tenant B Organization', 
             'domain': 'tenant-b.test.com'
         },
         'tenant_c': {
-            'id': str(uuid.uuid4()),
+            'id': tenant_uuid('tenant_c'),
             'name': 'Tenant C Organization',
             'domain': 'tenant-c.test.com'
         }
@@ -163,12 +182,14 @@ def multiple_tenants():
 def multiple_auth_tokens(multiple_tenants):
     """Create authentication tokens for multiple tenants"""
     tokens = {}
+    # One shared numeric expiry for every token in the fixture
+    exp = int(time.time()) + 3600
     for tenant_key, tenant_data in multiple_tenants.items():
         token = create_access_token({
             'sub': f'user@{tenant_data["domain"]}',
             'tenant_id': tenant_data['id'],
             'role': 'admin',
-            'exp': datetime.utcnow() + timedelta(hours=1)
+            'exp': exp
         })
         tokens[tenant_key] = token
     return tokens
@@ -215,6 +236,9 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "grant_timeline: mark test as grant timeline test"
     )
+    config.addinivalue_line(
+        "markers", "xdist_group(name): keep tests on one pytest-xdist worker under --dist loadgroup"
+    )
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically"""
@@ -6,6 +6,7 @@ Based on attached asset specifications for Zero Gate ESO Platform
 
 import pytest
 import asyncio
+import logging
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
@@ -15,6 +16,8 @@ from fastapi import HTTPException
 from server.auth.jwt_auth import create_access_token, verify_token
 from server.agents.processing import ProcessingAgent
 
+logger = logging.getLogger(__name__)
+
 
 class TestGrantTimelineGeneration:
     """Test suite for grant timeline generation and milestone management"""
@@ -451,7 +454,7 @@ class TestGrantTimelineGeneration:
         # This is informational - conflicts aren't necessarily errors
         # but should be flagged for resource planning
         if conflicts:
-            print(f"Identified {len(conflicts)} potential timeline conflicts for resource planning")
+            logger.debug("Identified %d potential timeline conflicts for resource planning", len(conflicts))
 
 
 if __name__ == "__main__":
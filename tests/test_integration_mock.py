@@ -8,9 +8,6 @@ import pytest
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
-from unittest.mock import MagicMock, patch
-import requests
 
 class MockResponse:
     """Mock HTTP response for testing"""
@@ -49,42 +46,42 @@ class MockTestClient:
         
         tenant_id = self._extract_tenant_from_headers(headers or {})
         
-        if '/api/v2/sponsors' in url:
-            sponsors = [
-                sponsor for sponsor in self.data_store['sponsors'].values()
-                if sponsor.get('tenant_id') == tenant_id
-            ]
-            return MockResponse(sponsors, 200)
+        parts = url.strip('/').split('/', 5)
         
-        elif '/api/v2/grants' in url:
-            if '/timeline' in url:
-                grant_id = url.split('/')[4]  # Extract grant ID
+        match parts:
+            case ['api', 'v2', 'sponsors']:
+                sponsors = [
+                    sponsor for sponsor in self.data_store['sponsors'].values()
+                    if sponsor.get('tenant_id') == tenant_id
+                ]
+                return MockResponse(sponsors, 200)
+            
+            case ['api', 'v2', 'grants', grant_id, 'timeline']:
                 grant = self.data_store['grants'].get(f"{tenant_id}:{grant_id}")
                 if grant:
                     timeline = self._generate_mock_timeline(grant)
                     return MockResponse(timeline, 200)
                 return MockResponse({'detail': 'Grant not found'}, 404)
             
-            elif '/milestones' in url:
-                grant_id = url.split('/')[4]  # Extract grant ID
+            case ['api', 'v2', 'grants', grant_id, 'milestones']:
                 grant = self.data_store['grants'].get(f"{tenant_id}:{grant_id}")
                 if grant:
                     milestones = self._generate_mock_milestones(grant)
                     return MockResponse(milestones, 200)
                 return MockResponse({'detail': 'Grant not found'}, 404)
             
-            else:
+            case ['api', 'v2', 'grants']:
                 grants = [
                     grant for grant in self.data_store['grants'].values()
                     if grant.get('tenant_id') == tenant_id
                 ]
                 return MockResponse(grants, 200)
-        
-        elif '/api/v2/relationships' in url:
-            if '/network-analysis' in url:
+            
+            case ['api', 'v2', 'relationships', 'network-analysis']:
                 analysis = self._generate_mock_network_analysis(tenant_id)
                 return MockResponse(analysis, 200)
-            else:
+            
+            case ['api', 'v2', 'relationships']:
                 relationships = [
                     rel for rel in self.data_store['relationships'].values()
                     if rel.get('tenant_id') == tenant_id
@@ -149,7 +146,7 @@ class MockTestClient:
     
     def _generate_mock_timeline(self, grant):
         """Generate mock timeline for grant"""
-        deadline = datetime.fromisoformat(grant['submission_deadline'].replace('Z', '+00:00'))
+        deadline = datetime.fromisoformat(grant['submission_deadline'])
         days_remaining = (deadline.date() - datetime.now().date()).days
         
         milestones = self._generate_mock_milestones(grant)
@@ -165,7 +162,7 @@ class MockTestClient:
     
     def _generate_mock_milestones(self, grant):
         """Generate mock milestones for grant"""
-        deadline = datetime.fromisoformat(grant['submission_deadline'].replace('Z', '+00:00'))
+        deadline = datetime.fromisoformat(grant['submission_deadline'])
         
         milestones = []
         for days_before, title, phase in [
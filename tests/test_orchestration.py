@@ -4,35 +4,99 @@ Tests workflow management, resource monitoring, and feature toggles
 """
 
 import asyncio
+import random
 import pytest
-import json
-import time
-from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+import pytest_asyncio
+from datetime import datetime
+from types import MappingProxyType
+from unittest.mock import AsyncMock
 
 # Import the orchestration components
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'server'))
-
-from agents.orchestration import (
-    OrchestrationAgent, WorkflowTask, Priority, WorkflowStatus,
-    ResourceMonitor, ResourceThresholds, FeatureFlag
+from server.agents.orchestration import (
+    OrchestrationAgent, WorkflowQueue, WorkflowTask, Priority, WorkflowStatus,
+    ResourceMonitor, ResourceThresholds, ResourceMetrics, FeatureFlag,
+    ALL_FEATURES, INTENSIVE_FEATURES
 )
-from utils.resource_monitor import EnhancedResourceMonitor
 
+# Profile-based monitoring is specified by these tests but not implemented yet
+try:
+    from server.utils.resource_monitor import EnhancedResourceMonitor
+except ImportError:
+    EnhancedResourceMonitor = None
+
+@pytest.fixture(scope="session")
+def default_thresholds():
+    """Immutable resource thresholds shared by every monitor test"""
+    return ResourceThresholds(
+        cpu_high=80.0,
+        cpu_critical=95.0,
+        memory_high=85.0,
+        memory_critical=95.0
+    )
+
+# Shared read-only workflow payloads
+SPONSOR_PAYLOAD = MappingProxyType({'sponsor_id': 'test-sponsor'})
+GRANT_PAYLOAD = MappingProxyType({'grant_id': 'test-grant'})
+RELATIONSHIP_PAYLOAD = MappingProxyType({'source_entity': 'test-sponsor', 'target_entity': 'test-target'})
+
+def fake_metrics() -> ResourceMetrics:
+    """Fixed low-usage sample so tests never block on psutil"""
+    return ResourceMetrics(
+        cpu_percent=10.0,
+        memory_percent=20.0,
+        disk_percent=30.0,
+        network_io={},
+        timestamp=datetime.now(),
+        active_processes=1,
+        load_average=[0.0, 0.0, 0.0]
+    )
+
+async def slow_handler(task: WorkflowTask):
+    """Handler that takes a small but measurable amount of time"""
+    await asyncio.sleep(0.05)
+    return {'ok': True}
+
+def install_fast_handlers(agent: OrchestrationAgent):
+    """Replace the simulated workflow handlers with instant mocks"""
+    agent.workflow_handlers = {
+        workflow_type: AsyncMock(return_value={'ok': True})
+        for workflow_type in agent.workflow_handlers
+    }
+    # Keep the dependent workflow slow so dependency ordering stays meaningful
+    agent.workflow_handlers['relationship_mapping'] = AsyncMock(side_effect=slow_handler)
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.xdist_group(name="TestOrchestrationAgent")
 class TestOrchestrationAgent:
     """Test suite for OrchestrationAgent"""
     
-    @pytest.fixture
-    async def agent(self):
-        """Create a test orchestration agent"""
+    @pytest_asyncio.fixture(scope="module", loop_scope="module")
+    async def shared_agent(self):
+        """Create an orchestration agent shared by all tests in this class"""
         agent = OrchestrationAgent(max_concurrent_tasks=3)
+        agent.resource_monitor.sampler = fake_metrics
         await agent.start()
         yield agent
         await agent.stop()
     
-    @pytest.mark.asyncio
+    @pytest.fixture
+    def agent(self, shared_agent):
+        """Reset the shared agent's queue, counters and handlers before each test"""
+        shared_agent.workflow_queue.clear()
+        install_fast_handlers(shared_agent)
+        shared_agent.stats.update(
+            total_tasks=0,
+            completed_tasks=0,
+            failed_tasks=0,
+            average_execution_time=0
+        )
+        return shared_agent
+    
+    @pytest.fixture
+    def tenant_id(self, request):
+        """Provide a tenant id unique to the current test"""
+        return f"test-tenant-{request.node.name}"
+    
     async def test_agent_initialization(self):
         """Test agent initialization and startup"""
         agent = OrchestrationAgent()
@@ -47,104 +111,117 @@ class TestOrchestrationAgent:
         await agent.stop()
         assert not agent.running
     
-    @pytest.mark.asyncio
-    async def test_workflow_submission(self, agent):
+    async def test_workflow_submission(self, agent, tenant_id):
         """Test workflow task submission"""
         task_id = await agent.submit_workflow(
             'sponsor_analysis',
-            'test-tenant',
-            {'sponsor_id': 'test-sponsor'},
+            tenant_id,
+            SPONSOR_PAYLOAD,
             Priority.HIGH
         )
         
         assert task_id is not None
-        assert task_id.startswith('sponsor_analysis_test-tenant_')
+        assert task_id.startswith(f'sponsor_analysis_{tenant_id}_')
         assert agent.stats['total_tasks'] == 1
         
         # Check task was added to queue
         task = agent.workflow_queue.tasks.get(task_id)
         assert task is not None
         assert task.workflow_type == 'sponsor_analysis'
-        assert task.tenant_id == 'test-tenant'
+        assert task.tenant_id == tenant_id
         assert task.priority == Priority.HIGH
     
-    @pytest.mark.asyncio
-    async def test_workflow_execution(self, agent):
+    async def test_workflow_execution(self, agent, tenant_id):
         """Test workflow task execution"""
         task_id = await agent.submit_workflow(
             'sponsor_analysis',
-            'test-tenant',
-            {'sponsor_id': 'test-sponsor'},
+            tenant_id,
+            SPONSOR_PAYLOAD,
             Priority.HIGH
         )
         
         # Wait for task to complete
-        await asyncio.sleep(5)
+        status = await asyncio.wait_for(agent.wait_for_task(task_id), timeout=15)
         
-        status = await agent.get_workflow_status(task_id)
         assert status is not None
-        assert status['status'] in ['completed', 'running']
-        
-        if status['status'] == 'completed':
-            assert status['progress'] == 100.0
-            assert status['completed_at'] is not None
+        assert status['status'] == 'completed'
+        assert status['progress'] == 100.0
+        assert status['completed_at'] is not None
     
-    @pytest.mark.asyncio
-    async def test_workflow_dependencies(self, agent):
+    async def test_workflow_dependencies(self, agent, tenant_id):
         """Test workflow task dependencies"""
         # Submit parent task
         parent_task_id = await agent.submit_workflow(
             'sponsor_analysis',
-            'test-tenant',
-            {'sponsor_id': 'test-sponsor'},
+            tenant_id,
+            SPONSOR_PAYLOAD,
             Priority.HIGH
         )
         
         # Submit dependent task
         dependent_task_id = await agent.submit_workflow(
             'relationship_mapping',
-            'test-tenant',
-            {'source_entity': 'test-sponsor', 'target_entity': 'test-target'},
+            tenant_id,
+            RELATIONSHIP_PAYLOAD,
             Priority.MEDIUM,
             dependencies=[parent_task_id]
         )
         
         # Wait for parent to complete
-        await asyncio.sleep(5)
-        
-        parent_status = await agent.get_workflow_status(parent_task_id)
+        parent_status = await asyncio.wait_for(agent.wait_for_task(parent_task_id), timeout=15)
         dependent_status = await agent.get_workflow_status(dependent_task_id)
         
         # Dependent task should only start after parent completes
-        if parent_status['status'] == 'completed':
-            assert dependent_status['status'] in ['running', 'completed', 'pending']
+        assert parent_status['status'] == 'completed'
+        assert dependent_status['status'] in ['running', 'completed', 'pending']
     
-    @pytest.mark.asyncio
-    async def test_concurrent_task_limit(self, agent):
+    async def test_concurrent_task_limit(self, agent, tenant_id):
         """Test concurrent task execution limit"""
+        limit = agent.max_concurrent_tasks
+        active = 0
+        peak = 0
+        limit_reached = asyncio.Event()
+        release = asyncio.Event()
+        
+        async def gated_handler(task):
+            # Hold every task open until released so overlap is observable
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            if active == limit:
+                limit_reached.set()
+            await release.wait()
+            active -= 1
+            return {'ok': True}
+        
+        agent.register_workflow_handler('grant_timeline', gated_handler)
+        
         # Submit more tasks than the limit
-        task_ids = []
-        for i in range(5):
-            task_id = await agent.submit_workflow(
+        task_ids = await asyncio.gather(*(
+            agent.submit_workflow(
                 'grant_timeline',
-                'test-tenant',
+                tenant_id,
                 {'grant_id': f'grant-{i}'},
                 Priority.MEDIUM
             )
-            task_ids.append(task_id)
+            for i in range(5)
+        ))
         
-        await asyncio.sleep(2)
+        await asyncio.wait_for(limit_reached.wait(), timeout=10)
         
         # Check that only max_concurrent_tasks are running
-        running_count = len(agent.workflow_queue.running_tasks)
-        assert running_count <= agent.max_concurrent_tasks
+        assert len(agent.workflow_queue.running_tasks) == limit
+        
+        release.set()
+        statuses = await asyncio.wait_for(agent.wait_all(task_ids), timeout=10)
+        assert all(status['status'] == 'completed' for status in statuses)
+        assert peak == limit
     
-    @pytest.mark.asyncio
-    async def test_system_status(self, agent):
+    async def test_system_status(self, agent, tenant_id):
         """Test system status reporting"""
         # Submit a few tasks
-        await agent.submit_workflow('sponsor_analysis', 'test-tenant', {'sponsor_id': 'test'})
-        await agent.submit_workflow('grant_timeline', 'test-tenant', {'grant_id': 'test'})
+        await agent.submit_workflow('sponsor_analysis', tenant_id, SPONSOR_PAYLOAD)
+        await agent.submit_workflow('grant_timeline', tenant_id, GRANT_PAYLOAD)
         
         status = await agent.get_system_status()
         
@@ -158,52 +235,46 @@ class TestOrchestrationAgent:
         assert status['agent_status'] == 'running'
         assert status['statistics']['total_tasks'] >= 2
 
+@pytest.mark.xdist_group(name="TestResourceMonitor")
 class TestResourceMonitor:
     """Test suite for ResourceMonitor"""
     
     @pytest.fixture
-    def monitor(self):
+    def monitor(self, default_thresholds):
         """Create a test resource monitor"""
-        thresholds = ResourceThresholds(
-            cpu_high=80.0,
-            cpu_critical=95.0,
-            memory_high=85.0,
-            memory_critical=95.0
-        )
-        return ResourceMonitor(thresholds)
+        return ResourceMonitor(default_thresholds, sampler=fake_metrics)
     
-    @pytest.mark.asyncio
     async def test_monitor_initialization(self, monitor):
         """Test resource monitor initialization"""
         assert not monitor.monitoring_active
-        assert len(monitor.enabled_features) == len(FeatureFlag)
-        assert all(monitor.enabled_features.values())  # All features enabled initially
+        assert monitor.enabled_mask == ALL_FEATURES  # All features enabled initially
+        assert all(monitor.enabled_features.values())
     
-    @pytest.mark.asyncio
-    async def test_feature_toggling(self, monitor):
+    @pytest.mark.parametrize("flag, expected_after_disable", [
+        (FeatureFlag.ADVANCED_ANALYTICS, False),
+        (FeatureFlag.EXCEL_PROCESSING, False),
+        (FeatureFlag.SPONSOR_ANALYSIS, True),
+    ])
+    async def test_feature_toggling(self, monitor, flag, expected_after_disable):
         """Test feature enabling/disabling"""
         # All features should be enabled initially
-        assert monitor.is_feature_enabled(FeatureFlag.SPONSOR_ANALYSIS)
-        assert monitor.is_feature_enabled(FeatureFlag.ADVANCED_ANALYTICS)
+        assert monitor.is_feature_enabled(flag)
         
-        # Simulate high resource usage
+        # Simulate high resource usage: intensive features are disabled,
+        # standard features stay enabled
         await monitor._disable_intensive_features()
         
-        # Check that intensive features are disabled
-        assert not monitor.is_feature_enabled(FeatureFlag.ADVANCED_ANALYTICS)
-        assert not monitor.is_feature_enabled(FeatureFlag.EXCEL_PROCESSING)
-        
-        # Standard features should still be enabled
-        assert monitor.is_feature_enabled(FeatureFlag.SPONSOR_ANALYSIS)
+        assert monitor.is_feature_enabled(flag) == expected_after_disable
+        assert not monitor.enabled_mask & INTENSIVE_FEATURES
+        assert monitor.enabled_mask == ALL_FEATURES & ~INTENSIVE_FEATURES
     
-    @pytest.mark.asyncio
     async def test_monitoring_loop(self, monitor):
         """Test monitoring loop functionality"""
         await monitor.start_monitoring(interval=1)  # Short interval for testing
         assert monitor.monitoring_active
         
-        # Let it run for a few seconds
-        await asyncio.sleep(3)
+        # Wait for the first sample instead of a fixed delay
+        await asyncio.wait_for(monitor._first_sample.wait(), timeout=5)
         
         # Check that metrics were collected
         assert len(monitor.metrics_history) > 0
@@ -215,7 +286,20 @@ class TestResourceMonitor:
         
         await monitor.stop_monitoring()
         assert not monitor.monitoring_active
+    
+    def test_metrics_history_is_bounded(self, monitor):
+        """Test that metrics history keeps only the most recent samples"""
+        limit = ResourceMonitor.METRICS_HISTORY_SIZE
+        samples = [fake_metrics() for _ in range(limit + 100)]
+        
+        monitor.metrics_history.extend(samples)
+        
+        assert len(monitor.metrics_history) == limit
+        assert monitor.get_current_metrics() is samples[-1]
+        assert monitor.metrics_history[0] is samples[100]
 
+@pytest.mark.skipif(EnhancedResourceMonitor is None, reason="EnhancedResourceMonitor is not implemented")
+@pytest.mark.xdist_group(name="TestEnhancedResourceMonitor")
 class TestEnhancedResourceMonitor:
     """Test suite for EnhancedResourceMonitor"""
     
@@ -224,7 +308,6 @@ class TestEnhancedResourceMonitor:
         """Create a test enhanced resource monitor"""
         return EnhancedResourceMonitor("development")
     
-    @pytest.mark.asyncio
     async def test_profile_switching(self, enhanced_monitor):
         """Test performance profile switching"""
         assert enhanced_monitor.current_profile.name == "development"
@@ -236,8 +319,12 @@ class TestEnhancedResourceMonitor:
         # Test invalid profile
         with pytest.raises(ValueError):
             enhanced_monitor.switch_profile("invalid_profile")
+        
+        # Profile table is built once and shared by every instance
+        assert EnhancedResourceMonitor._load_profiles() is EnhancedResourceMonitor("performance")._load_profiles()
+        with pytest.raises(TypeError):
+            enhanced_monitor._profiles["invalid_profile"] = enhanced_monitor.current_profile
     
-    @pytest.mark.asyncio
     async def test_feature_overrides(self, enhanced_monitor):
         """Test manual feature overrides"""
         # Test normal feature status
@@ -251,34 +338,36 @@ class TestEnhancedResourceMonitor:
         enhanced_monitor.override_feature("advanced_analytics", True)
         assert enhanced_monitor.get_feature_status("advanced_analytics")
     
-    @pytest.mark.asyncio
     async def test_health_score_calculation(self, enhanced_monitor):
         """Test system health score calculation"""
         # Initially should be 100 (no data)
         health_score = enhanced_monitor.get_system_health_score()
         assert health_score == 100.0
         
-        # Start monitoring briefly to get some data
+        # CPU 10 points over the development profile's 80% threshold
+        enhanced_monitor.sampler = lambda: (90.0, 50.0, 30.0)
         await enhanced_monitor.start_monitoring()
-        await asyncio.sleep(2)
+        await asyncio.wait_for(enhanced_monitor._first_sample.wait(), timeout=5)
         
         health_score = enhanced_monitor.get_system_health_score()
-        assert 0.0 <= health_score <= 100.0
+        assert health_score == 90.0
         
         await enhanced_monitor.stop_monitoring()
 
+@pytest.mark.xdist_group(name="TestWorkflowIntegration")
 class TestWorkflowIntegration:
     """Test suite for workflow and resource monitoring integration"""
     
-    @pytest.mark.asyncio
     async def test_resource_aware_execution(self):
         """Test that workflows respect resource constraints"""
         # Create agent with resource monitoring
         agent = OrchestrationAgent(max_concurrent_tasks=2)
+        agent.resource_monitor.sampler = fake_metrics
         await agent.start()
         
         try:
-            # Simulate high resource usage
+            # Simulate high resource usage once the first sample has set the baseline
+            await asyncio.wait_for(agent.resource_monitor._first_sample.wait(), timeout=5)
             await agent.resource_monitor._disable_intensive_features()
             
             # Submit intensive workflow
@@ -289,112 +378,139 @@ class TestWorkflowIntegration:
                 Priority.HIGH
             )
             
-            # Wait and check if task was postponed due to resource constraints
-            await asyncio.sleep(3)
+            # Wait for the execution loop to pick the task up
+            async with asyncio.timeout(5):
+                while not agent.workflow_queue.pending_queue.empty():
+                    await asyncio.sleep(0.01)
             
+            # Task is postponed rather than started while the feature is disabled
             status = await agent.get_workflow_status(task_id)
-            # Task might be pending if feature is disabled
-            assert status['status'] in ['pending', 'running', 'completed']
+            assert status['status'] == 'pending'
+            assert task_id not in agent.workflow_queue.running_tasks
             
         finally:
             await agent.stop()
     
-    @pytest.mark.asyncio
     async def test_emergency_controls(self):
         """Test emergency workflow controls"""
         agent = OrchestrationAgent()
+        agent.resource_monitor.sampler = fake_metrics
+        num_tasks = 3
+        started = {f'sponsor-{i}': asyncio.Event() for i in range(num_tasks)}
+        never_set = asyncio.Event()
+        cancelled = []
+        
+        async def blocking_handler(task: WorkflowTask):
+            """Signal that the task is running, then block until cancelled"""
+            started[task.payload['sponsor_id']].set()
+            try:
+                await never_set.wait()
+            except asyncio.CancelledError:
+                cancelled.append(task.id)
+                raise
+        
+        agent.register_workflow_handler('sponsor_analysis', blocking_handler)
         await agent.start()
         
         try:
             # Submit several workflows
-            task_ids = []
-            for i in range(3):
-                task_id = await agent.submit_workflow(
+            task_ids = await asyncio.gather(*(
+                agent.submit_workflow(
                     'sponsor_analysis',
                     'test-tenant',
-                    {'sponsor_id': f'sponsor-{i}'},
+                    {'sponsor_id': sponsor_id},
                     Priority.MEDIUM
                 )
-                task_ids.append(task_id)
+                for sponsor_id in started
+            ))
             
-            await asyncio.sleep(1)
+            # Every handler is in flight before the emergency stop
+            await asyncio.wait_for(
+                asyncio.gather(*(event.wait() for event in started.values())),
+                timeout=10
+            )
+            assert len(agent.workflow_queue.running_tasks) == num_tasks
             
             # Test emergency stop
             await agent.stop()
             assert not agent.running
             
             # All running tasks should be cancelled
+            assert sorted(cancelled) == sorted(task_ids)
             assert len(agent.workflow_queue.running_tasks) == 0
             
         finally:
             if agent.running:
                 await agent.stop()
 
+@pytest.mark.xdist_group(name="TestWorkflowQueue")
 class TestWorkflowQueue:
     """Test suite for WorkflowQueue"""
     
-    @pytest.mark.asyncio
     async def test_priority_ordering(self):
         """Test that tasks are processed in priority order"""
-        from agents.orchestration import WorkflowQueue
-        
         queue = WorkflowQueue()
         
-        # Add tasks with different priorities
-        low_task = WorkflowTask(
-            id="low", name="Low Priority", workflow_type="test",
-            priority=Priority.LOW, status=WorkflowStatus.PENDING,
-            tenant_id="test", payload={}, created_at=datetime.now()
-        )
-        
-        high_task = WorkflowTask(
-            id="high", name="High Priority", workflow_type="test",
-            priority=Priority.HIGH, status=WorkflowStatus.PENDING,
-            tenant_id="test", payload={}, created_at=datetime.now()
-        )
-        
-        medium_task = WorkflowTask(
-            id="medium", name="Medium Priority", workflow_type="test",
-            priority=Priority.MEDIUM, status=WorkflowStatus.PENDING,
-            tenant_id="test", payload={}, created_at=datetime.now()
-        )
+        # Add tasks in reverse priority order (lowest first)
+        priorities = (Priority.LOW, Priority.MEDIUM, Priority.HIGH)
+        created_at = datetime.now()
+        tasks = [
+            WorkflowTask(
+                id=p.name, name=f"{p.name.title()} Priority", workflow_type="test",
+                priority=p, status=WorkflowStatus.PENDING,
+                tenant_id="test", payload={}, created_at=created_at
+            )
+            for p in priorities
+        ]
         
-        # Add in reverse priority order
-        await queue.add_task(low_task)
-        await queue.add_task(medium_task)
-        await queue.add_task(high_task)
+        for task in tasks:
+            await queue.add_task(task)
         
         # Tasks should come out in priority order (high first)
-        first_task = await queue.get_next_task()
-        assert first_task.id == "high"
-        
-        second_task = await queue.get_next_task()
-        assert second_task.id == "medium"
-        
-        third_task = await queue.get_next_task()
-        assert third_task.id == "low"
+        ordered_ids = [(await queue.get_next_task()).id for _ in tasks]
+        assert ordered_ids == [p.name for p in reversed(priorities)]
+    
+    @pytest.mark.parametrize("task_count", [100, 10_000])
+    async def test_priority_ordering_at_scale(self, task_count):
+        """Test that a large randomly-prioritised queue drains in priority order"""
+        queue = WorkflowQueue()
+        rng = random.Random(task_count)
+        created_at = datetime.now()
+        
+        for i in range(task_count):
+            await queue.add_task(WorkflowTask(
+                id=f"task-{i}", name=f"Task {i}", workflow_type="test",
+                priority=rng.choice(list(Priority)), status=WorkflowStatus.PENDING,
+                tenant_id="test", payload={}, created_at=created_at
+            ))
+        
+        drained = [await queue.get_next_task() for _ in range(task_count)]
+        priorities = [task.priority.value for task in drained]
+        assert priorities == sorted(priorities, reverse=True)
 
-@pytest.mark.asyncio
 async def test_end_to_end_workflow():
     """End-to-end test of complete workflow processing"""
     # Create orchestration agent
     agent = OrchestrationAgent(max_concurrent_tasks=2)
+    agent.resource_monitor.sampler = fake_metrics
+    install_fast_handlers(agent)
     await agent.start()
     
     try:
         # Submit a complex workflow with dependencies
-        sponsor_task_id = await agent.submit_workflow(
-            'sponsor_analysis',
-            'e2e-tenant',
-            {'sponsor_id': 'microsoft-foundation'},
-            Priority.HIGH
-        )
-        
-        grant_task_id = await agent.submit_workflow(
-            'grant_timeline',
-            'e2e-tenant',
-            {'grant_id': 'innovation-grant-2025'},
-            Priority.MEDIUM
+        sponsor_task_id, grant_task_id = await asyncio.gather(
+            agent.submit_workflow(
+                'sponsor_analysis',
+                'e2e-tenant',
+                {'sponsor_id': 'microsoft-foundation'},
+                Priority.HIGH
+            ),
+            agent.submit_workflow(
+                'grant_timeline',
+                'e2e-tenant',
+                {'grant_id': 'innovation-grant-2025'},
+                Priority.MEDIUM
+            )
         )
         
         relationship_task_id = await agent.submit_workflow(
@@ -405,31 +521,25 @@ async def test_end_to_end_workflow():
             dependencies=[sponsor_task_id]
         )
         
-        # Wait for processing
-        await asyncio.sleep(10)
+        # Wait for every node of the DAG to finish
+        sponsor_status, grant_status, relationship_status = await asyncio.wait_for(
+            agent.wait_all([sponsor_task_id, grant_task_id, relationship_task_id]),
+            timeout=30
+        )
         
         # Check final status
         system_status = await agent.get_system_status()
         assert system_status['statistics']['total_tasks'] == 3
         
-        # Check individual task statuses
-        sponsor_status = await agent.get_workflow_status(sponsor_task_id)
-        grant_status = await agent.get_workflow_status(grant_task_id)
-        relationship_status = await agent.get_workflow_status(relationship_task_id)
+        # All tasks should be completed
+        for status in (sponsor_status, grant_status, relationship_status):
+            assert status['status'] == 'completed'
         
-        # At least some tasks should be completed
-        completed_tasks = [
-            status for status in [sponsor_status, grant_status, relationship_status]
-            if status and status['status'] == 'completed'
-        ]
-        assert len(completed_tasks) > 0
-        
-        # Relationship task should not complete before sponsor task
-        if (sponsor_status['status'] == 'completed' and 
-            relationship_status['status'] == 'completed'):
-            sponsor_completed = datetime.fromisoformat(sponsor_status['completed_at'])
-            relationship_completed = datetime.fromisoformat(relationship_status['completed_at'])
-            assert sponsor_completed <= relationship_completed
+        # Relationship task must not start before its sponsor dependency completes
+        sponsor_completed = datetime.fromisoformat(sponsor_status['completed_at'])
+        relationship_started = datetime.fromisoformat(relationship_status['started_at'])
+        relationship_completed = datetime.fromisoformat(relationship_status['completed_at'])
+        assert sponsor_completed <= relationship_started <= relationship_completed
             
     finally:
         await agent.stop()
@@ -9,47 +9,72 @@ import pytest
 import sys
 import os
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 # Add server directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'server', 'agents'))
 
 from processing import ProcessingAgent
 
-class TestProcessingAgent:
-    """Test suite for ProcessingAgent functionality"""
+TENANT_ID = "test-tenant-123"
+
+class _StubRM:
+    """Resource monitor stand-in; every feature follows the single enabled switch"""
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
     
-    def setup_method(self):
-        """Set up test environment for each test"""
-        self.mock_resource_monitor = Mock()
-        self.mock_resource_monitor.is_feature_enabled.return_value = True
-        self.agent = ProcessingAgent(resource_monitor=self.mock_resource_monitor)
-        self.tenant_id = "test-tenant-123"
+    def is_feature_enabled(self, *_) -> bool:
+        return self.enabled
+
+def _make_agent() -> ProcessingAgent:
+    return ProcessingAgent(resource_monitor=_StubRM(True))
+
+@pytest.fixture(scope="class")
+def agent_class():
+    """One agent per class, for tests that leave the graph and monitor untouched"""
+    return _make_agent()
+
+@pytest.fixture
+def agent():
+    """Fresh agent per test, for tests that add relationships or toggle features"""
+    return _make_agent()
+
+class TestProcessingAgentMutating:
+    """Tests that change the relationship graph or resource monitor state"""
     
-    def test_add_relationship_basic(self):
+    def test_add_relationship_basic(self, agent):
         """Test basic relationship addition to the graph"""
         source = "john_doe"
         target = "jane_smith"
         relationship_type = "professional"
         strength = 0.8
         
-        self.agent.add_relationship(
+        agent.add_relationship(
             source=source,
             target=target,
             relationship_type=relationship_type,
             strength=strength,
-            tenant_id=self.tenant_id
+            tenant_id=TENANT_ID
         )
         
         # Verify relationship was added
-        assert self.agent.relationship_graph.has_edge(source, target)
-        edge_data = self.agent.relationship_graph.get_edge_data(source, target)
+        assert agent.relationship_graph.has_edge(source, target)
+        edge_data = agent.relationship_graph.get_edge_data(source, target)
         assert edge_data['type'] == relationship_type
         assert edge_data['strength'] == strength
-        assert edge_data['tenant_id'] == self.tenant_id
+        assert edge_data['tenant_id'] == TENANT_ID
         assert 'created_at' in edge_data
     
-    def test_add_relationship_with_metadata(self):
+    def test_add_relationship_shared_timestamp(self, agent):
+        """Test a caller-supplied created_at is stored as given"""
+        created_at = datetime(2025, 1, 15, 9, 30)
+        agent.add_relationship("A", "B", "professional", 0.8, TENANT_ID, created_at=created_at)
+        agent.add_relationship("B", "C", "professional", 0.7, TENANT_ID, created_at=created_at)
+        
+        assert agent.relationship_graph.get_edge_data("A", "B")['created_at'] == created_at
+        assert agent.relationship_graph.get_edge_data("B", "C")['created_at'] == created_at
+    
+    def test_add_relationship_with_metadata(self, agent):
         """Test relationship addition with custom metadata"""
         source = "alice_johnson"
         target = "bob_wilson"
@@ -59,78 +84,78 @@ class TestProcessingAgent:
             "last_interaction": "2024-01-15"
         }
         
-        self.agent.add_relationship(
+        agent.add_relationship(
             source=source,
             target=target,
             relationship_type="collaboration",
             strength=0.9,
-            tenant_id=self.tenant_id,
+            tenant_id=TENANT_ID,
             metadata=metadata
         )
         
-        edge_data = self.agent.relationship_graph.get_edge_data(source, target)
+        edge_data = agent.relationship_graph.get_edge_data(source, target)
         assert edge_data['meeting_frequency'] == 5
         assert edge_data['collaboration_type'] == "grant_writing"
         assert edge_data['last_interaction'] == "2024-01-15"
     
-    def test_find_relationship_path_direct(self):
+    def test_find_relationship_path_direct(self, agent):
         """Test finding direct relationship path between two nodes"""
         # Create a simple path: A -> B -> C
-        self.agent.add_relationship("A", "B", "professional", 0.8, self.tenant_id)
-        self.agent.add_relationship("B", "C", "collaboration", 0.7, self.tenant_id)
+        agent.add_relationship("A", "B", "professional", 0.8, TENANT_ID)
+        agent.add_relationship("B", "C", "collaboration", 0.7, TENANT_ID)
         
-        path = self.agent.find_relationship_path("A", "C", self.tenant_id, max_depth=7)
+        path = agent.find_relationship_path("A", "C", TENANT_ID, max_depth=7)
         
         assert path is not None
         assert path == ["A", "B", "C"]
         assert len(path) - 1 == 2  # 2 degrees of separation
     
-    def test_find_relationship_path_no_connection(self):
+    def test_find_relationship_path_no_connection(self, agent):
         """Test path finding when no connection exists"""
-        self.agent.add_relationship("A", "B", "professional", 0.8, self.tenant_id)
+        agent.add_relationship("A", "B", "professional", 0.8, TENANT_ID)
         # No connection between C and D
         
-        path = self.agent.find_relationship_path("A", "D", self.tenant_id)
+        path = agent.find_relationship_path("A", "D", TENANT_ID)
         assert path is None
     
-    def test_find_relationship_path_max_depth_exceeded(self):
+    def test_find_relationship_path_max_depth_exceeded(self, agent):
         """Test path finding with depth limit"""
         # Create a long chain: A -> B -> C -> D -> E
         nodes = ["A", "B", "C", "D", "E"]
         for i in range(len(nodes) - 1):
-            self.agent.add_relationship(nodes[i], nodes[i+1], "professional", 0.7, self.tenant_id)
+            agent.add_relationship(nodes[i], nodes[i+1], "professional", 0.7, TENANT_ID)
         
         # Should find path within limit
-        path = self.agent.find_relationship_path("A", "E", self.tenant_id, max_depth=4)
+        path = agent.find_relationship_path("A", "E", TENANT_ID, max_depth=4)
         assert path == ["A", "B", "C", "D", "E"]
         
         # Should not find path beyond limit
-        path = self.agent.find_relationship_path("A", "E", self.tenant_id, max_depth=3)
+        path = agent.find_relationship_path("A", "E", TENANT_ID, max_depth=3)
         assert path is None
     
-    def test_find_all_paths_within_degrees(self):
+    def test_find_all_paths_within_degrees(self, agent):
         """Test finding multiple paths between nodes"""
         # Create diamond pattern: A -> B -> D, A -> C -> D
-        self.agent.add_relationship("A", "B", "professional", 0.8, self.tenant_id)
-        self.agent.add_relationship("A", "C", "personal", 0.6, self.tenant_id)
-        self.agent.add_relationship("B", "D", "collaboration", 0.7, self.tenant_id)
-        self.agent.add_relationship("C", "D", "mentorship", 0.9, self.tenant_id)
+        agent.add_relationship("A", "B", "professional", 0.8, TENANT_ID)
+        agent.add_relationship("A", "C", "personal", 0.6, TENANT_ID)
+        agent.add_relationship("B", "D", "collaboration", 0.7, TENANT_ID)
+        agent.add_relationship("C", "D", "mentorship", 0.9, TENANT_ID)
         
-        paths = self.agent.find_all_paths_within_degrees("A", "D", self.tenant_id, max_depth=3)
+        paths = agent.find_all_paths_within_degrees("A", "D", TENANT_ID, max_depth=3)
         
         assert len(paths) == 2
         assert ["A", "B", "D"] in paths
         assert ["A", "C", "D"] in paths
     
-    def test_analyze_relationship_strength(self):
+    def test_analyze_relationship_strength(self, agent):
         """Test relationship strength analysis for a path"""
         # Create path with varying strengths
-        self.agent.add_relationship("A", "B", "professional", 0.9, self.tenant_id)
-        self.agent.add_relationship("B", "C", "collaboration", 0.6, self.tenant_id)
-        self.agent.add_relationship("C", "D", "mentorship", 0.8, self.tenant_id)
+        agent.add_relationship("A", "B", "professional", 0.9, TENANT_ID)
+        agent.add_relationship("B", "C", "collaboration", 0.6, TENANT_ID)
+        agent.add_relationship("C", "D", "mentorship", 0.8, TENANT_ID)
         
         path = ["A", "B", "C", "D"]
-        analysis = self.agent.analyze_relationship_strength(path, self.tenant_id)
+        analysis = agent.analyze_relationship_strength(path, TENANT_ID)
         
         assert analysis['path_length'] == 3
         assert analysis['average_strength'] == pytest.approx(0.7667, rel=1e-3)
@@ -140,7 +165,154 @@ class TestProcessingAgent:
         assert analysis['quality'] in ['excellent', 'good', 'fair', 'weak']
         assert 'confidence_score' in analysis
     
-    def test_calculate_sponsor_metrics_basic(self):
+    def test_calculate_sponsor_metrics_with_network_centrality(self, agent):
+        """Test sponsor metrics with network centrality calculation"""
+        sponsor_id = "central_sponsor"
+        
+        # Add sponsor to relationship graph with high centrality
+        agent.add_relationship(sponsor_id, "partner_1", "funding", 0.9, TENANT_ID)
+        agent.add_relationship(sponsor_id, "partner_2", "mentorship", 0.8, TENANT_ID)
+        agent.add_relationship(sponsor_id, "partner_3", "collaboration", 0.7, TENANT_ID)
+        
+        sponsor_data = {
+            "id": sponsor_id,
+            "communication_frequency": 10,
+            "avg_response_time": 6,
+            "engagement_quality": 90,
+            "deliverables_completed": 15,
+            "total_deliverables": 15
+        }
+        
+        metrics = agent.calculate_sponsor_metrics(sponsor_data, TENANT_ID)
+        
+        assert metrics['network_centrality'] > 0
+        assert metrics['tier_classification'] == 'platinum'  # Should be high tier due to centrality
+    
+    def test_calculate_sponsor_metrics_batch_matches_single(self, agent):
+        """Test batched sponsor metrics agree with per-sponsor calculation"""
+        agent.add_relationship("central_sponsor", "partner_1", "funding", 0.9, TENANT_ID)
+        agent.add_relationship("central_sponsor", "partner_2", "mentorship", 0.8, TENANT_ID)
+        
+        sponsors = [
+            {"id": "central_sponsor", "communication_frequency": 10, "avg_response_time": 6,
+             "engagement_quality": 90, "deliverables_completed": 15, "total_deliverables": 15},
+            {"id": "steady_sponsor", "communication_frequency": 6, "avg_response_time": 24,
+             "engagement_quality": 70, "deliverables_completed": 7, "total_deliverables": 10},
+            {"id": "quiet_sponsor", "communication_frequency": 1, "avg_response_time": 72,
+             "engagement_quality": 20, "deliverables_completed": 1, "total_deliverables": 10}
+        ]
+        
+        batch = agent.calculate_sponsor_metrics_batch(sponsors, TENANT_ID)
+        
+        assert len(batch) == len(sponsors)
+        for sponsor_data, metrics in zip(sponsors, batch):
+            single = agent.calculate_sponsor_metrics(sponsor_data, TENANT_ID)
+            assert metrics['tier_classification'] == single['tier_classification']
+            assert metrics['network_centrality'] == single['network_centrality']
+            assert metrics['relationship_score'] == single['relationship_score']
+    
+    def test_get_network_statistics_populated_network(self, agent):
+        """Test network statistics for populated network"""
+        # Create a small network
+        relationships = [
+            ("A", "B", "professional", 0.8),
+            ("B", "C", "collaboration", 0.7),
+            ("C", "D", "mentorship", 0.9),
+            ("A", "C", "personal", 0.6),
+            ("E", "F", "professional", 0.5)  # Separate component
+        ]
+        
+        agent.add_relationships(relationships, TENANT_ID)
+        
+        stats = agent.get_network_statistics(TENANT_ID)
+        
+        assert stats['nodes'] > 0
+        assert stats['edges'] > 0
+        assert stats['density'] > 0
+        assert stats['components'] >= 1
+        assert 'centrality_leaders' in stats
+    
+    def test_get_network_statistics_cached_until_graph_changes(self, agent):
+        """Test network statistics are reused until a relationship is added"""
+        agent.add_relationship("A", "B", "professional", 0.8, TENANT_ID)
+        agent.add_relationship("B", "C", "collaboration", 0.7, TENANT_ID)
+        
+        first = agent.get_network_statistics(TENANT_ID)
+        with patch.object(agent, '_get_centrality_leaders') as leaders:
+            assert agent.get_network_statistics(TENANT_ID) == first
+            leaders.assert_not_called()
+        
+        agent.add_relationship("C", "D", "mentorship", 0.9, TENANT_ID)
+        updated = agent.get_network_statistics(TENANT_ID)
+        assert updated['nodes'] == first['nodes'] + 1
+        assert updated['edges'] == first['edges'] + 1
+    
+    def test_landmark_update_mechanism(self, agent):
+        """Test landmark node selection and updating"""
+        # Create a network with varying node degrees
+        nodes = [f"node_{i}" for i in range(15)]
+        
+        # Hub node with many connections, paired nodes, and a long chain of extras
+        # to get past the landmark selection minimum
+        hub_node = "hub_central"
+        edges = [(hub_node, node, "professional", 0.7) for node in nodes[:10]]
+        edges += [(nodes[i], nodes[i+1], "collaboration", 0.6) for i in range(0, len(nodes) - 1, 2)]
+        edges += [(f"extra_{i}", f"extra_{i+1}", "test", 0.5) for i in range(85)]
+        
+        agent.add_relationships(edges, TENANT_ID, defer_landmarks=False)
+        
+        # Verify landmarks were selected
+        assert len(agent.landmarks) > 0
+        assert hub_node in agent.landmarks  # Hub should be selected as landmark
+    
+    def test_landmarks_refresh_lazily_on_path_query(self, agent):
+        """Test inserts only mark landmarks stale and the next path query rebuilds them"""
+        hub_node = "hub_central"
+        for i in range(100):
+            agent.add_relationship(hub_node, f"spoke_{i}", "professional", 0.7, TENANT_ID)
+        
+        assert agent.landmarks == set()
+        
+        path = agent.find_relationship_path("spoke_0", "spoke_1", TENANT_ID)
+        
+        assert path == ["spoke_0", hub_node, "spoke_1"]
+        assert hub_node in agent.landmarks
+        assert hub_node in agent.landmark_distances
+    
+    def test_distance_estimation_with_landmarks(self, agent):
+        """Test landmark-based distance estimation"""
+        # Create a path through landmarks
+        nodes = ["start", "landmark1", "landmark2", "end"]
+        for i in range(len(nodes) - 1):
+            agent.add_relationship(nodes[i], nodes[i+1], "professional", 0.8, TENANT_ID)
+        
+        # Manually set landmarks
+        agent.landmarks = {"landmark1", "landmark2"}
+        agent._precompute_landmark_distances()
+        
+        # Test distance estimation
+        estimated_distance = agent._estimate_distance("start", "end")
+        assert isinstance(estimated_distance, (int, float))
+        assert estimated_distance >= 0
+    
+    def test_resource_monitor_integration(self, agent):
+        """Test integration with resource monitor for feature toggling"""
+        # Test when relationship mapping is disabled
+        agent.resource_monitor.enabled = False
+        
+        # Should return None when feature is disabled
+        path = agent.find_relationship_path("A", "B", TENANT_ID)
+        assert path is None
+        
+        # Should return disabled status for metrics when analytics disabled
+        sponsor_data = {"id": "test", "communication_frequency": 5}
+        metrics = agent.calculate_sponsor_metrics(sponsor_data, TENANT_ID)
+        assert metrics['status'] == 'disabled'
+
+class TestProcessingAgentPure:
+    """Tests of scoring and planning logic that only read agent state"""
+    
+    def test_calculate_sponsor_metrics_basic(self, agent_class):
         """Test basic sponsor metrics calculation"""
         sponsor_data = {
             "id": "sponsor_001",
@@ -151,10 +323,10 @@ class TestProcessingAgent:
             "total_deliverables": 20
         }
         
-        metrics = self.agent.calculate_sponsor_metrics(sponsor_data, self.tenant_id)
+        metrics = agent_class.calculate_sponsor_metrics(sponsor_data, TENANT_ID)
         
         assert metrics['sponsor_id'] == "sponsor_001"
-        assert metrics['tenant_id'] == self.tenant_id
+        assert metrics['tenant_id'] == TENANT_ID
         assert 'relationship_score' in metrics
         assert 'fulfillment_rate' in metrics
         assert metrics['fulfillment_rate'] == 0.9  # 18/20
@@ -163,38 +335,15 @@ class TestProcessingAgent:
         assert 'risk_assessment' in metrics
         assert 'recommendation' in metrics
     
-    def test_calculate_sponsor_metrics_with_network_centrality(self):
-        """Test sponsor metrics with network centrality calculation"""
-        sponsor_id = "central_sponsor"
-        
-        # Add sponsor to relationship graph with high centrality
-        self.agent.add_relationship(sponsor_id, "partner_1", "funding", 0.9, self.tenant_id)
-        self.agent.add_relationship(sponsor_id, "partner_2", "mentorship", 0.8, self.tenant_id)
-        self.agent.add_relationship(sponsor_id, "partner_3", "collaboration", 0.7, self.tenant_id)
-        
-        sponsor_data = {
-            "id": sponsor_id,
-            "communication_frequency": 10,
-            "avg_response_time": 6,
-            "engagement_quality": 90,
-            "deliverables_completed": 15,
-            "total_deliverables": 15
-        }
-        
-        metrics = self.agent.calculate_sponsor_metrics(sponsor_data, self.tenant_id)
-        
-        assert metrics['network_centrality'] > 0
-        assert metrics['tier_classification'] == 'platinum'  # Should be high tier due to centrality
-    
-    def test_generate_grant_timeline_basic(self):
+    def test_generate_grant_timeline_basic(self, agent_class):
         """Test basic grant timeline generation with backwards planning"""
         grant_deadline = datetime.now() + timedelta(days=120)
         grant_type = "federal"
         
-        timeline = self.agent.generate_grant_timeline(grant_deadline, grant_type, self.tenant_id)
+        timeline = agent_class.generate_grant_timeline(grant_deadline, grant_type, TENANT_ID)
         
         assert timeline['grant_type'] == grant_type
-        assert timeline['tenant_id'] == self.tenant_id
+        assert timeline['tenant_id'] == TENANT_ID
         assert timeline['total_preparation_days'] == 90
         assert 'milestones' in timeline
         
@@ -214,12 +363,12 @@ class TestProcessingAgent:
             assert isinstance(milestone['tasks'], list)
             assert len(milestone['tasks']) > 0
     
-    def test_generate_grant_timeline_risk_assessment(self):
+    def test_generate_grant_timeline_risk_assessment(self, agent_class):
         """Test grant timeline risk assessment and success probability"""
         grant_deadline = datetime.now() + timedelta(days=90)
         grant_type = "foundation"
         
-        timeline = self.agent.generate_grant_timeline(grant_deadline, grant_type, self.tenant_id)
+        timeline = agent_class.generate_grant_timeline(grant_deadline, grant_type, TENANT_ID)
         
         assert 'risk_assessment' in timeline
         assert 'success_probability' in timeline
@@ -234,128 +383,48 @@ class TestProcessingAgent:
         # Success probability should be reasonable for foundation grants
         assert 0.5 <= timeline['success_probability'] <= 1.0
     
-    def test_get_network_statistics_empty_network(self):
+    def test_get_network_statistics_empty_network(self, agent_class):
         """Test network statistics for empty network"""
-        stats = self.agent.get_network_statistics(self.tenant_id)
+        stats = agent_class.get_network_statistics(TENANT_ID)
         
         assert stats['nodes'] == 0
         assert stats['edges'] == 0
         assert stats['density'] == 0
         assert stats['components'] == 0
     
-    def test_get_network_statistics_populated_network(self):
-        """Test network statistics for populated network"""
-        # Create a small network
-        relationships = [
-            ("A", "B", "professional", 0.8),
-            ("B", "C", "collaboration", 0.7),
-            ("C", "D", "mentorship", 0.9),
-            ("A", "C", "personal", 0.6),
-            ("E", "F", "professional", 0.5)  # Separate component
-        ]
-        
-        for source, target, rel_type, strength in relationships:
-            self.agent.add_relationship(source, target, rel_type, strength, self.tenant_id)
-        
-        stats = self.agent.get_network_statistics(self.tenant_id)
-        
-        assert stats['nodes'] > 0
-        assert stats['edges'] > 0
-        assert stats['density'] > 0
-        assert stats['components'] >= 1
-        assert 'centrality_leaders' in stats
-    
-    def test_landmark_update_mechanism(self):
-        """Test landmark node selection and updating"""
-        # Create a network with varying node degrees
-        nodes = [f"node_{i}" for i in range(15)]
-        
-        # Create hub node with many connections
-        hub_node = "hub_central"
-        for node in nodes[:10]:
-            self.agent.add_relationship(hub_node, node, "professional", 0.7, self.tenant_id)
-        
-        # Create additional connections to reach landmark update threshold
-        for i in range(0, len(nodes) - 1, 2):
-            self.agent.add_relationship(nodes[i], nodes[i+1], "collaboration", 0.6, self.tenant_id)
-        
-        # Force landmark update by adding nodes to reach threshold
-        for i in range(85):  # Add enough to trigger landmark update
-            self.agent.add_relationship(f"extra_{i}", f"extra_{i+1}", "test", 0.5, self.tenant_id)
-        
-        # Verify landmarks were selected
-        assert len(self.agent.landmarks) > 0
-        assert hub_node in self.agent.landmarks  # Hub should be selected as landmark
-    
-    def test_distance_estimation_with_landmarks(self):
-        """Test landmark-based distance estimation"""
-        # Create a path through landmarks
-        nodes = ["start", "landmark1", "landmark2", "end"]
-        for i in range(len(nodes) - 1):
-            self.agent.add_relationship(nodes[i], nodes[i+1], "professional", 0.8, self.tenant_id)
-        
-        # Manually set landmarks
-        self.agent.landmarks = {"landmark1", "landmark2"}
-        self.agent._precompute_landmark_distances()
-        
-        # Test distance estimation
-        estimated_distance = self.agent._estimate_distance("start", "end")
-        assert isinstance(estimated_distance, (int, float))
-        assert estimated_distance >= 0
-    
-    def test_resource_monitor_integration(self):
-        """Test integration with resource monitor for feature toggling"""
-        # Test when relationship mapping is disabled
-        self.mock_resource_monitor.is_feature_enabled.return_value = False
-        
-        # Should return None when feature is disabled
-        path = self.agent.find_relationship_path("A", "B", self.tenant_id)
-        assert path is None
-        
-        # Should return disabled status for metrics when analytics disabled
-        sponsor_data = {"id": "test", "communication_frequency": 5}
-        metrics = self.agent.calculate_sponsor_metrics(sponsor_data, self.tenant_id)
-        assert metrics['status'] == 'disabled'
-    
-    def test_confidence_score_calculation(self):
+    def test_confidence_score_calculation(self, agent_class):
         """Test confidence score calculation for paths"""
         # Test with high-strength path
         strengths_high = [0.9, 0.8, 0.9]
-        confidence_high = self.agent._calculate_confidence_score(strengths_high, 4)
+        confidence_high = agent_class._calculate_confidence_score(strengths_high, 4)
         
         # Test with low-strength path
         strengths_low = [0.3, 0.2, 0.4]
-        confidence_low = self.agent._calculate_confidence_score(strengths_low, 4)
+        confidence_low = agent_class._calculate_confidence_score(strengths_low, 4)
         
         assert confidence_high > confidence_low
         assert 0 <= confidence_high <= 1
         assert 0 <= confidence_low <= 1
     
-    def test_sponsor_tier_classification(self):
+    @pytest.mark.parametrize("relationship_score, fulfillment_rate, centrality_score, expected_tier", [
+        (0.9, 0.9, 0.8, "platinum"),
+        (0.7, 0.7, 0.6, "gold"),
+        (0.5, 0.5, 0.4, "silver"),
+        (0.3, 0.3, 0.2, "bronze"),
+    ])
+    def test_sponsor_tier_classification(self, agent_class, relationship_score, fulfillment_rate,
+                                         centrality_score, expected_tier):
         """Test sponsor tier classification logic"""
-        # Test platinum tier
-        platinum_tier = self.agent._calculate_sponsor_tier(0.9, 0.9, 0.8)
-        assert platinum_tier == "platinum"
-        
-        # Test gold tier
-        gold_tier = self.agent._calculate_sponsor_tier(0.7, 0.7, 0.6)
-        assert gold_tier == "gold"
-        
-        # Test silver tier
-        silver_tier = self.agent._calculate_sponsor_tier(0.5, 0.5, 0.4)
-        assert silver_tier == "silver"
-        
-        # Test bronze tier
-        bronze_tier = self.agent._calculate_sponsor_tier(0.3, 0.3, 0.2)
-        assert bronze_tier == "bronze"
+        tier = agent_class._calculate_sponsor_tier(relationship_score, fulfillment_rate, centrality_score)
+        assert tier == expected_tier
     
-    def test_sponsor_risk_assessment(self):
+    def test_sponsor_risk_assessment(self, agent_class):
         """Test sponsor risk assessment functionality"""
         # High risk sponsor
         high_risk_data = {
             "last_contact_date": (datetime.now() - timedelta(days=90)).isoformat()
         }
-        high_risk = self.agent._calculate_sponsor_risk(high_risk_data, 0.2, 0.3)
+        high_risk = agent_class._calculate_sponsor_risk(high_risk_data, 0.2, 0.3)
         assert high_risk['level'] == 'high'
         assert len(high_risk['factors']) > 0
         
@@ -363,26 +432,32 @@ class TestProcessingAgent:
         low_risk_data = {
             "last_contact_date": (datetime.now() - timedelta(days=10)).isoformat()
         }
-        low_risk = self.agent._calculate_sponsor_risk(low_risk_data, 0.9, 0.9)
+        low_risk = agent_class._calculate_sponsor_risk(low_risk_data, 0.9, 0.9)
         assert low_risk['level'] == 'low'
     
-    def test_grant_timeline_success_probability(self):
+    @pytest.mark.parametrize("grant_type, preparation_days", [
+        ("federal", 90),
+        ("federal", 30),
+        ("corporate", 90),
+        ("research", 10),
+        ("unlisted", 60),
+    ])
+    def test_grant_timeline_success_probability_bounds(self, agent_class, grant_type, preparation_days):
+        """Test success probabilities stay between 0 and 1"""
+        probability = agent_class._calculate_success_probability(grant_type, preparation_days)
+        assert 0 <= probability <= 1
+    
+    def test_grant_timeline_success_probability_ordering(self, agent_class):
         """Test grant timeline success probability calculation"""
-        # Test different grant types and preparation times
-        prob_federal_90 = self.agent._calculate_success_probability("federal", 90)
-        prob_federal_30 = self.agent._calculate_success_probability("federal", 30)
-        prob_corporate_90 = self.agent._calculate_success_probability("corporate", 90)
+        prob_federal_90 = agent_class._calculate_success_probability("federal", 90)
+        prob_federal_30 = agent_class._calculate_success_probability("federal", 30)
+        prob_corporate_90 = agent_class._calculate_success_probability("corporate", 90)
         
         # More preparation time should increase probability
         assert prob_federal_90 > prob_federal_30
         
         # Corporate grants should be easier than federal
         assert prob_corporate_90 > prob_federal_90
-        
-        # All probabilities should be between 0 and 1
-        assert 0 <= prob_federal_90 <= 1
-        assert 0 <= prob_federal_30 <= 1
-        assert 0 <= prob_corporate_90 <= 1
 
 def test_processing_agent_global_instance():
     """Test global processing agent instance functionality"""
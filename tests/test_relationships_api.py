@@ -0,0 +1,56 @@
+"""
+Relationships router tests through FastAPI's TestClient
+Uses the router's development auth, which resolves every caller to dev-tenant
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from server.routers.relationships import router
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Client for an app serving only the relationships router"""
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+class TestBulkRelationshipCreation:
+    """Test suite for POST /api/v2/relationships/bulk"""
+    
+    def test_bulk_create_returns_one_record_per_item(self, client):
+        """Test every posted relationship comes back, in order, under the caller's tenant"""
+        payload = [
+            {"source_id": f"person-{i}", "target_id": f"person-{i + 1}",
+             "relationship_type": "colleague", "strength": 0.8}
+            for i in range(3)
+        ]
+        
+        response = client.post("/api/v2/relationships/bulk", json=payload)
+        
+        assert response.status_code == 200
+        created = response.json()
+        assert len(created) == len(payload)
+        assert [(r["source_id"], r["target_id"]) for r in created] == [
+            (item["source_id"], item["target_id"]) for item in payload
+        ]
+        assert {r["tenant_id"] for r in created} == {"dev-tenant"}
+    
+    def test_bulk_create_ids_are_unique_across_requests(self, client):
+        """Test ids are distinct within a batch and between batches"""
+        payload = [{"source_id": "a", "target_id": "b", "relationship_type": "mentor"}] * 2
+        
+        first = client.post("/api/v2/relationships/bulk", json=payload).json()
+        second = client.post("/api/v2/relationships/bulk", json=payload).json()
+        
+        ids = [r["id"] for r in first + second]
+        assert len(set(ids)) == len(ids) == 4
+    
+    def test_bulk_create_empty_list(self, client):
+        """Test an empty batch creates nothing"""
+        response = client.post("/api/v2/relationships/bulk", json=[])
+        
+        assert response.status_code == 200
+        assert response.json() == []
@@ -0,0 +1,98 @@
+"""
+Tests for the application resource monitor
+Covers load tier selection, recovery hysteresis, manual feature overrides and the monitor task
+"""
+
+import asyncio
+import pytest
+
+from utils.resource_monitor import DEFAULT_FEATURE_FLAGS, ResourceMonitor
+
+
+@pytest.fixture
+def monitor():
+    """Monitor with the default 65% CPU / 70% memory thresholds"""
+    return ResourceMonitor()
+
+class TestFeatureFlagTiers:
+    """Test suite for ResourceMonitor._update_feature_flags"""
+    
+    @pytest.mark.parametrize("cpu, memory, disabled", [
+        (10, 20, set()),
+        (66, 20, {"advanced_analytics"}),
+        (10, 71, {"advanced_analytics"}),
+        (81, 20, {"advanced_analytics", "relationship_mapping", "content_generation"}),
+        (10, 86, {"advanced_analytics", "relationship_mapping", "content_generation"}),
+        (91, 20, set(DEFAULT_FEATURE_FLAGS)),
+        (10, 96, set(DEFAULT_FEATURE_FLAGS)),
+    ])
+    def test_tier_choice(self, monitor, cpu, memory, disabled):
+        """Test the most severe exceeded tier decides which features are off"""
+        monitor._update_feature_flags(cpu, memory)
+        
+        flags = monitor.get_enabled_features()
+        assert {key for key in DEFAULT_FEATURE_FLAGS if not flags[key]} == disabled
+        assert flags.get("core_operations", False) == (disabled == set(DEFAULT_FEATURE_FLAGS))
+    
+    def test_shed_features_recover_only_below_recovery_limits(self, monitor):
+        """Test relationship mapping stays off between the recovery and high limits"""
+        monitor._update_feature_flags(85, 50)
+        assert not monitor.is_feature_enabled("relationship_mapping")
+        
+        # Back under the high tier but not under 70% CPU: still shed
+        monitor._update_feature_flags(75, 50)
+        assert not monitor.is_feature_enabled("relationship_mapping")
+        assert not monitor.is_feature_enabled("content_generation")
+        
+        monitor._update_feature_flags(60, 50)
+        assert monitor.is_feature_enabled("relationship_mapping")
+        assert monitor.is_feature_enabled("content_generation")
+    
+    def test_recovery_after_critical_load(self, monitor):
+        """Test features outside the recovery band come straight back after critical load"""
+        monitor._update_feature_flags(95, 50)
+        monitor._update_feature_flags(72, 50)
+        
+        assert monitor.is_feature_enabled("excel_processing")
+        assert not monitor.is_feature_enabled("relationship_mapping")
+        assert not monitor.is_feature_enabled("core_operations")
+    
+    def test_manual_disable_survives_samples(self, monitor):
+        """Test a disabled feature stays off until enable_feature lifts the override"""
+        monitor.disable_feature("excel_processing")
+        monitor._update_feature_flags(10, 88)
+        monitor._update_feature_flags(10, 20)
+        assert not monitor.is_feature_enabled("excel_processing")
+        
+        monitor.enable_feature("excel_processing")
+        assert monitor.is_feature_enabled("excel_processing")
+    
+    def test_forced_feature_state_wins_over_tier(self, monitor):
+        """Test force_feature_state pins a feature regardless of load"""
+        monitor.force_feature_state("advanced_analytics", True)
+        monitor._update_feature_flags(85, 90)
+        
+        assert monitor.is_feature_enabled("advanced_analytics")
+        assert not monitor.is_feature_enabled("relationship_mapping")
+
+class TestMonitorLifecycle:
+    """Test suite for ResourceMonitor.start/stop on the event loop"""
+    
+    async def test_start_samples_and_stop_cancels_task(self, monitor):
+        """Test the monitor task samples usage and is gone after stop"""
+        monitor._read_usage = lambda: (12.0, 34.0, 56.0)
+        
+        await monitor.start()
+        task = monitor.task
+        assert monitor.running and not task.done()
+        
+        async with asyncio.timeout(5):
+            while monitor.get_current_usage()["cpu"] != 12.0:
+                await asyncio.sleep(0.01)
+        assert dict(monitor.get_current_usage()) == {"cpu": 12.0, "memory": 34.0, "disk": 56.0}
+        assert monitor.is_feature_enabled("advanced_analytics")
+        
+        await monitor.stop()
+        assert not monitor.running
+        assert monitor.task is None
+        assert task.cancelled()
@@ -10,7 +10,12 @@ import os
 import pytest
 import argparse
 import time
-from typing import List, Dict, Any
+import io
+import importlib.util
+import multiprocessing
+import subprocess
+import tempfile
+from typing import List, Dict, Any, Tuple
 import json
 from datetime import datetime
 
@@ -24,11 +29,38 @@ class TestRunner:
         self.test_results = {}
         self.start_time = None
         self.end_time = None
+        self.coverage = False
+        self.fast = False
+    
+    def _parallel_args(self) -> List[str]:
+        """pytest-xdist arguments spreading test files across CPU cores, if xdist is installed"""
+        # --stepwise needs one process walking the tests in order
+        if self.fast or importlib.util.find_spec('xdist') is None:
+            return []
+        workers = str(max(1, multiprocessing.cpu_count() - 1))
+        # loadfile keeps each file on one worker so class/session fixtures are built once
+        return ['-n', workers, '--dist=loadfile']
+    
+    def _collection_args(self) -> List[str]:
+        """Import test files without sys.path bookkeeping; coverage only when requested
+        
+        The cache dir is skipped unless --fast needs it to remember failures.
+        """
+        args = ['--import-mode=importlib']
+        if self.fast:
+            args += ['--lf', '--ff', '--stepwise']
+        else:
+            args += ['-p', 'no:cacheprovider']
+        if self.coverage:
+            args += ['--cov=server', '--cov-report=term-missing']
+        return args
         
     def run_tenant_isolation_tests(self, verbose: bool = False) -> Dict[str, Any]:
         """Run tenant isolation test suite"""
         print("🔒 Running Tenant Isolation Tests...")
-        
+        return self._run_pytest(self._tenant_isolation_args(verbose), 'tenant_isolation')
+    
+    def _tenant_isolation_args(self, verbose: bool, parallel: bool = True) -> List[str]:
         args = [
             'tests/test_tenant_isolation.py',
             '-v' if verbose else '',
@@ -38,23 +70,14 @@ class TestRunner:
         ]
         
         # Filter out empty args
-        args = [arg for arg in args if arg]
-        
-        start_time = time.time()
-        result = pytest.main(args)
-        end_time = time.time()
-        
-        return {
-            'exit_code': result,
-            'duration': end_time - start_time,
-            'test_type': 'tenant_isolation',
-            'success': result == 0
-        }
+        return [arg for arg in args if arg] + self._collection_args() + (self._parallel_args() if parallel else [])
     
     def run_grant_timeline_tests(self, verbose: bool = False) -> Dict[str, Any]:
         """Run grant timeline test suite"""
         print("⏱️ Running Grant Timeline Tests...")
-        
+        return self._run_pytest(self._grant_timeline_args(verbose), 'grant_timeline')
+    
+    def _grant_timeline_args(self, verbose: bool, parallel: bool = True) -> List[str]:
         args = [
             'tests/test_grant_timeline.py',
             '-v' if verbose else '',
@@ -62,23 +85,14 @@ class TestRunner:
             '--durations=10'
         ]
         
-        args = [arg for arg in args if arg]
-        
-        start_time = time.time()
-        result = pytest.main(args)
-        end_time = time.time()
-        
-        return {
-            'exit_code': result,
-            'duration': end_time - start_time,
-            'test_type': 'grant_timeline',
-            'success': result == 0
-        }
+        return [arg for arg in args if arg] + self._collection_args() + (self._parallel_args() if parallel else [])
     
     def run_path_discovery_tests(self, verbose: bool = False) -> Dict[str, Any]:
         """Run path discovery test suite"""
         print("🗺️ Running Path Discovery Tests...")
-        
+        return self._run_pytest(self._path_discovery_args(verbose), 'path_discovery')
+    
+    def _path_discovery_args(self, verbose: bool, parallel: bool = True) -> List[str]:
         args = [
             'tests/test_path_discovery.py',
             '-v' if verbose else '',
@@ -86,19 +100,71 @@ class TestRunner:
             '--durations=10'
         ]
         
-        args = [arg for arg in args if arg]
-        
-        start_time = time.time()
+        return [arg for arg in args if arg] + self._collection_args() + (self._parallel_args() if parallel else [])
+    
+    def _run_pytest(self, args: List[str], test_type: str) -> Dict[str, Any]:
+        """Run one suite in this process"""
+        start_time = time.perf_counter_ns()
         result = pytest.main(args)
-        end_time = time.time()
+        end_time = time.perf_counter_ns()
         
         return {
             'exit_code': result,
-            'duration': end_time - start_time,
-            'test_type': 'path_discovery',
+            'duration': (end_time - start_time) / 1e9,
+            'test_type': test_type,
             'success': result == 0
         }
     
+    def _spawn(self, args: List[str], test_type: str) -> Tuple[subprocess.Popen, Any, int, str]:
+        """Start one suite as a separate pytest process, its output spooled to a temp file"""
+        output = tempfile.TemporaryFile()
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'pytest', *args],
+            stdout=output,
+            stderr=subprocess.STDOUT,
+            env=os.environ | {'PYTHONDONTWRITEBYTECODE': '1'}
+        )
+        return proc, output, time.perf_counter_ns(), test_type
+    
+    def run_suites_concurrently(self, suites: List[Tuple[List[str], str]]) -> List[Dict[str, Any]]:
+        """Run (args, test_type) suites as parallel pytest processes
+        
+        Separate processes keep plugin registration and imports from leaking
+        between suites; each suite's output is printed as it finishes, so
+        results come back in completion order. Build the suite args with
+        parallel=False: the suites already share the cores between them.
+        """
+        print(f"🔀 Running {len(suites)} test suites concurrently...")
+        running = []
+        results = []
+        try:
+            for args, test_type in suites:
+                running.append(self._spawn(args, test_type))
+            
+            while running:
+                for entry in [entry for entry in running if entry[0].poll() is not None]:
+                    running.remove(entry)
+                    proc, output, start_time, test_type = entry
+                    duration = (time.perf_counter_ns() - start_time) / 1e9
+                    with output:
+                        output.seek(0)
+                        print(f"\n----- {test_type} -----")
+                        print(output.read().decode(errors='replace'))
+                    results.append({
+                        'exit_code': proc.returncode,
+                        'duration': duration,
+                        'test_type': test_type,
+                        'success': proc.returncode == 0
+                    })
+                time.sleep(0.05)
+        finally:
+            # Don't leave suites running behind an interrupted runner
+            for proc, output, _, _ in running:
+                proc.terminate()
+                proc.wait()
+                output.close()
+        return results
+    
     def run_all_tests(self, verbose: bool = False) -> Dict[str, Any]:
         """Run comprehensive test suite"""
         print("🚀 Running Comprehensive Test Suite...")
@@ -107,23 +173,11 @@ class TestRunner:
             'tests/',
             '-v' if verbose else '',
             '--tb=short',
-            '--durations=20',
-            '--cov=server',  # Coverage if available
-            '--cov-report=term-missing'
+            '--durations=20'
         ]
         
-        args = [arg for arg in args if arg]
-        
-        start_time = time.time()
-        result = pytest.main(args)
-        end_time = time.time()
-        
-        return {
-            'exit_code': result,
-            'duration': end_time - start_time,
-            'test_type': 'comprehensive',
-            'success': result == 0
-        }
+        args = [arg for arg in args if arg] + self._collection_args() + self._parallel_args()
+        return self._run_pytest(args, 'comprehensive')
     
     def run_performance_tests(self, verbose: bool = False) -> Dict[str, Any]:
         """Run performance-focused tests"""
@@ -137,18 +191,8 @@ class TestRunner:
             '--durations=10'
         ]
         
-        args = [arg for arg in args if arg]
-        
-        start_time = time.time()
-        result = pytest.main(args)
-        end_time = time.time()
-        
-        return {
-            'exit_code': result,
-            'duration': end_time - start_time,
-            'test_type': 'performance',
-            'success': result == 0
-        }
+        args = [arg for arg in args if arg] + self._collection_args() + self._parallel_args()
+        return self._run_pytest(args, 'performance')
     
     def generate_test_report(self, results: List[Dict[str, Any]]) -> str:
         """Generate comprehensive test report"""
@@ -156,7 +200,12 @@ class TestRunner:
         successful_tests = [r for r in results if r['success']]
         failed_tests = [r for r in results if not r['success']]
         
-        report = f"""
+        fastest = min(results, key=lambda x: x['duration'])
+        slowest = max(results, key=lambda x: x['duration'])
+        
+        report = io.StringIO()
+        write = report.write
+        write(f"""
 # Zero Gate ESO Platform Backend Test Report
 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -169,43 +218,43 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 ## Test Suite Results
 
-"""
+""")
         
         for result in results:
             status = "✅ PASSED" if result['success'] else "❌ FAILED"
-            report += f"""
+            write(f"""
 ### {result['test_type'].replace('_', ' ').title()}
 - **Status**: {status}
 - **Duration**: {result['duration']:.2f} seconds
 - **Exit Code**: {result['exit_code']}
-"""
+""")
         
         if failed_tests:
-            report += "\n## Failed Tests\n"
+            write("\n## Failed Tests\n")
             for failed in failed_tests:
-                report += f"- {failed['test_type']}: Exit code {failed['exit_code']}\n"
+                write(f"- {failed['test_type']}: Exit code {failed['exit_code']}\n")
         
-        report += f"""
+        write(f"""
 ## Performance Metrics
 - **Average Test Suite Duration**: {total_duration / len(results):.2f} seconds
-- **Fastest Test Suite**: {min(results, key=lambda x: x['duration'])['test_type']} ({min(r['duration'] for r in results):.2f}s)
-- **Slowest Test Suite**: {max(results, key=lambda x: x['duration'])['test_type']} ({max(r['duration'] for r in results):.2f}s)
+- **Fastest Test Suite**: {fastest['test_type']} ({fastest['duration']:.2f}s)
+- **Slowest Test Suite**: {slowest['test_type']} ({slowest['duration']:.2f}s)
 
 ## Recommendations
-"""
+""")
         
         if failed_tests:
-            report += "- ⚠️ Address failed test suites before deployment\n"
-            report += "- 🔍 Review error logs for detailed failure information\n"
+            write("- ⚠️ Address failed test suites before deployment\n")
+            write("- 🔍 Review error logs for detailed failure information\n")
         
         if total_duration > 60:
-            report += "- ⚡ Consider optimizing test performance (current duration > 60s)\n"
+            write("- ⚡ Consider optimizing test performance (current duration > 60s)\n")
         
         if len(successful_tests) == len(results):
-            report += "- ✅ All tests passing - ready for deployment consideration\n"
-            report += "- 🚀 Backend testing complete and successful\n"
+            write("- ✅ All tests passing - ready for deployment consideration\n")
+            write("- 🚀 Backend testing complete and successful\n")
         
-        return report
+        return report.getvalue()
     
     def main(self):
         """Main test runner execution"""
@@ -214,10 +263,15 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                           default='all', help='Test suite to run')
         parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
         parser.add_argument('--report', action='store_true', help='Generate test report')
+        parser.add_argument('--coverage', action='store_true', help='Collect coverage for server/')
+        parser.add_argument('--fast', action='store_true',
+                          help='Re-run only last failures first and stop at the next failure (single process)')
         
         args = parser.parse_args()
+        self.coverage = args.coverage
+        self.fast = args.fast
         
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         results = []
         
         print(f"🧪 Zero Gate ESO Platform Backend Test Runner")
@@ -233,12 +287,19 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 results.append(self.run_path_discovery_tests(args.verbose))
             elif args.suite == 'performance':
                 results.append(self.run_performance_tests(args.verbose))
-            elif args.suite == 'all':
+            elif args.suite == 'all' and self.fast:
+                # Concurrent suites would race on the shared lastfailed/stepwise cache
                 results.append(self.run_tenant_isolation_tests(args.verbose))
                 results.append(self.run_grant_timeline_tests(args.verbose))
                 results.append(self.run_path_discovery_tests(args.verbose))
+            elif args.suite == 'all':
+                results.extend(self.run_suites_concurrently([
+                    (self._tenant_isolation_args(args.verbose, parallel=False), 'tenant_isolation'),
+                    (self._grant_timeline_args(args.verbose, parallel=False), 'grant_timeline'),
+                    (self._path_discovery_args(args.verbose, parallel=False), 'path_discovery')
+                ]))
             
-            self.end_time = time.time()
+            self.end_time = time.perf_counter_ns()
             
             print("\n" + "=" * 60)
             print("📊 Test Execution Summary")
@@ -247,7 +308,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 status = "✅ PASSED" if result['success'] else "❌ FAILED"
                 print(f"  {result['test_type']}: {status} ({result['duration']:.2f}s)")
             
-            total_duration = self.end_time - self.start_time
+            total_duration = (self.end_time - self.start_time) / 1e9
             success_rate = len([r for r in results if r['success']]) / len(results) * 100
             
             print(f"\n⏱️ Total Duration: {total_duration:.2f} seconds")
@@ -0,0 +1,78 @@
+"""
+Sponsor API tests against the mocked asyncpg pool
+Exercises route handlers directly with a fake authenticated user
+"""
+
+import importlib
+import sys
+import pytest
+from datetime import datetime
+from types import ModuleType, SimpleNamespace
+
+import auth.jwt_auth
+
+
+def _import_sponsors_api() -> ModuleType:
+    """Import the sponsor routes with the auth names they expect aliased onto jwt_auth
+    
+    server.api.sponsors imports get_current_active_user and TokenData, which
+    jwt_auth calls get_current_user and UserClaims; only the import sees the alias.
+    """
+    auth_module = ModuleType("auth.jwt_auth")
+    auth_module.__dict__.update(vars(auth.jwt_auth))
+    auth_module.get_current_active_user = auth.jwt_auth.get_current_user
+    auth_module.TokenData = auth.jwt_auth.UserClaims
+    
+    sys.modules["auth.jwt_auth"] = auth_module
+    try:
+        return importlib.import_module("server.api.sponsors")
+    finally:
+        sys.modules["auth.jwt_auth"] = auth.jwt_auth
+
+sponsors = _import_sponsors_api()
+from server.api.models import SponsorCreate, SponsorTier
+
+
+class TestBulkSponsorCreation:
+    """Test suite for POST /api/v2/sponsors/bulk"""
+    
+    async def test_bulk_create_batches_insert_and_preserves_order(self, mock_database, test_tenant):
+        """One executemany for the batch, read back in request order under the tenant's context"""
+        tenant_id = test_tenant['id']
+        current_user = SimpleNamespace(tenant_id=tenant_id)
+        sponsors_data = [
+            SponsorCreate(name=f"Sponsor {i}", email=f"sponsor{i}@example.org",
+                          tier=SponsorTier.FOUNDATION, tags=[f"tag-{i}"])
+            for i in range(3)
+        ]
+        
+        async def fetch_in_id_order(query, sponsor_ids, tenant):
+            """Return the inserted rows in the order of the ids array"""
+            rows = {row[0]: row for row in mock_database.executemany.call_args.args[1]}
+            now = datetime.now()
+            columns = ("id", "tenant_id", "name", "email", "phone", "tier",
+                       "organization", "website", "notes", "tags")
+            return [
+                dict(zip(columns, rows[sponsor_id]), created_at=now, updated_at=now)
+                for sponsor_id in sponsor_ids
+            ]
+        
+        mock_database.fetch.side_effect = fetch_in_id_order
+        
+        created = await sponsors.create_sponsors_bulk(sponsors_data, current_user=current_user)
+        
+        # Tenant context is transaction-scoped and set before the insert
+        set_config = mock_database.execute.call_args_list[0]
+        assert "set_config('app.current_tenant_id', $1, true)" in set_config.args[0]
+        assert set_config.args[1] == tenant_id
+        
+        mock_database.executemany.assert_awaited_once()
+        rows = mock_database.executemany.call_args.args[1]
+        assert [(row[1], row[2], row[3], row[5], row[9]) for row in rows] == [
+            (tenant_id, data.name, data.email, "Foundation", data.tags) for data in sponsors_data
+        ]
+        
+        # Response follows the request order, with the ids generated for the insert
+        assert [sponsor.id for sponsor in created] == [row[0] for row in rows]
+        assert [sponsor.name for sponsor in created] == [data.name for data in sponsors_data]
+        assert all(sponsor.tenant_id == tenant_id for sponsor in created)
@@ -6,117 +6,145 @@ Based on attached asset specifications for Zero Gate ESO Platform
 
 import pytest
 import asyncio
+import copy
 import jwt
 import os
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict
 from fastapi.testclient import TestClient
 from fastapi import FastAPI, Request, HTTPException
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 # Import platform modules
-from server.auth.jwt_auth import create_access_token, UserClaims, verify_token
+from server.auth.jwt_auth import create_access_token, create_access_tokens_bulk, UserClaims, verify_token
+from server.auth.roles import ROLE_LEVELS, Role
 from server.agents.processing import ProcessingAgent
 from server.agents.integration_new import IntegrationAgent
 
 
-class TestTenantIsolation:
-    """Test suite for multi-tenant data isolation and security"""
-    
-    @pytest.fixture
-    def test_tenants(self):
-        """Create test tenant configurations"""
-        return {
-            "nasdaq-center": {
-                "tenant_id": "nasdaq-center",
-                "name": "NASDAQ Entrepreneurial Center",
-                "settings": {"features": ["grants", "sponsors", "analytics"]},
-                "users": [
-                    {"user_id": "user1", "email": "clint.phillips@thecenter.nasdaq.org", "role": "admin"},
-                    {"user_id": "user2", "email": "sarah.manager@thecenter.nasdaq.org", "role": "manager"}
-                ]
-            },
-            "tight5-digital": {
-                "tenant_id": "tight5-digital",
-                "name": "Tight5 Digital",
-                "settings": {"features": ["sponsors", "relationships"]},
-                "users": [
-                    {"user_id": "user3", "email": "admin@tight5digital.com", "role": "admin"},
-                    {"user_id": "user4", "email": "dev@tight5digital.com", "role": "user"}
-                ]
-            },
-            "innovation-hub": {
-                "tenant_id": "innovation-hub",
-                "name": "Innovation Hub",
-                "settings": {"features": ["grants", "relationships"]},
-                "users": [
-                    {"user_id": "user5", "email": "director@innovation-hub.org", "role": "owner"}
-                ]
-            }
+@dataclass
+class FakeRequest:
+    """Minimal stand-in for a Starlette Request: headers, state, url.path and app"""
+    headers: Dict[str, str] = field(default_factory=dict)
+    state: SimpleNamespace = field(default_factory=SimpleNamespace)
+    url: SimpleNamespace = field(default_factory=lambda: SimpleNamespace(path="/api/sponsors"))
+    app: Any = None
+
+@pytest.fixture(scope="session")
+def test_tenants():
+    """Create test tenant configurations"""
+    return {
+        "nasdaq-center": {
+            "tenant_id": "nasdaq-center",
+            "name": "NASDAQ Entrepreneurial Center",
+            "settings": {"features": ["grants", "sponsors", "analytics"]},
+            "users": [
+                {"user_id": "user1", "email": "clint.phillips@thecenter.nasdaq.org", "role": "admin"},
+                {"user_id": "user2", "email": "sarah.manager@thecenter.nasdaq.org", "role": "manager"}
+            ]
+        },
+        "tight5-digital": {
+            "tenant_id": "tight5-digital",
+            "name": "Tight5 Digital",
+            "settings": {"features": ["sponsors", "relationships"]},
+            "users": [
+                {"user_id": "user3", "email": "admin@tight5digital.com", "role": "admin"},
+                {"user_id": "user4", "email": "dev@tight5digital.com", "role": "user"}
+            ]
+        },
+        "innovation-hub": {
+            "tenant_id": "innovation-hub",
+            "name": "Innovation Hub",
+            "settings": {"features": ["grants", "relationships"]},
+            "users": [
+                {"user_id": "user5", "email": "director@innovation-hub.org", "role": "owner"}
+            ]
         }
+    }
+
+@pytest.fixture(scope="session")
+def test_tokens(test_tenants):
+    """Generate JWT tokens for test users once per session, keyed by (tenant_id, user_id)"""
+    users = [
+        {"user_id": user["user_id"], "email": user["email"], "tenant_id": tenant_id, "role": user["role"]}
+        for tenant_id, tenant_data in test_tenants.items()
+        for user in tenant_data["users"]
+    ]
+    tokens = create_access_tokens_bulk(users)
+    return {(user["tenant_id"], user["user_id"]): token for user, token in zip(users, tokens)}
+
+@pytest.fixture(scope="session")
+def mock_database():
+    """Mock database with tenant-isolated data; read-only, shared by the session
     
-    @pytest.fixture
-    def test_tokens(self, test_tenants):
-        """Generate JWT tokens for test users"""
-        tokens = {}
-        for tenant_id, tenant_data in test_tenants.items():
-            tokens[tenant_id] = {}
-            for user in tenant_data["users"]:
-                token = create_access_token(
-                    user_id=user["user_id"],
-                    email=user["email"],
-                    tenant_id=tenant_id,
-                    role=user["role"]
-                )
-                tokens[tenant_id][user["user_id"]] = token
-        return tokens
-    
-    @pytest.fixture
-    def mock_database(self):
-        """Mock database with tenant-isolated data"""
-        return {
-            "sponsors": {
-                "nasdaq-center": [
-                    {"id": "sponsor1", "name": "NASDAQ Foundation", "tenant_id": "nasdaq-center"},
-                    {"id": "sponsor2", "name": "Tech Accelerator", "tenant_id": "nasdaq-center"}
-                ],
-                "tight5-digital": [
-                    {"id": "sponsor3", "name": "Digital Ventures", "tenant_id": "tight5-digital"}
-                ],
-                "innovation-hub": [
-                    {"id": "sponsor4", "name": "Innovation Fund", "tenant_id": "innovation-hub"}
-                ]
-            },
-            "grants": {
-                "nasdaq-center": [
-                    {"id": "grant1", "title": "Tech Innovation Grant", "tenant_id": "nasdaq-center", "sponsor_id": "sponsor1"},
-                    {"id": "grant2", "title": "Startup Accelerator", "tenant_id": "nasdaq-center", "sponsor_id": "sponsor2"}
-                ],
-                "tight5-digital": [
-                    {"id": "grant3", "title": "Digital Transformation", "tenant_id": "tight5-digital", "sponsor_id": "sponsor3"}
-                ],
-                "innovation-hub": [
-                    {"id": "grant4", "title": "Research Grant", "tenant_id": "innovation-hub", "sponsor_id": "sponsor4"}
-                ]
-            },
-            "relationships": {
-                "nasdaq-center": [
-                    {"from": "person1", "to": "person2", "strength": 0.8, "tenant_id": "nasdaq-center"},
-                    {"from": "person2", "to": "person3", "strength": 0.6, "tenant_id": "nasdaq-center"}
-                ],
-                "tight5-digital": [
-                    {"from": "person4", "to": "person5", "strength": 0.9, "tenant_id": "tight5-digital"}
-                ],
-                "innovation-hub": [
-                    {"from": "person6", "to": "person7", "strength": 0.7, "tenant_id": "innovation-hub"}
-                ]
-            }
+    "_index" holds per-tenant frozensets of sponsor ids, grant ids and related
+    persons, built once so isolation checks are plain set operations.
+    """
+    data = {
+        "sponsors": {
+            "nasdaq-center": [
+                {"id": "sponsor1", "name": "NASDAQ Foundation", "tenant_id": "nasdaq-center"},
+                {"id": "sponsor2", "name": "Tech Accelerator", "tenant_id": "nasdaq-center"}
+            ],
+            "tight5-digital": [
+                {"id": "sponsor3", "name": "Digital Ventures", "tenant_id": "tight5-digital"}
+            ],
+            "innovation-hub": [
+                {"id": "sponsor4", "name": "Innovation Fund", "tenant_id": "innovation-hub"}
+            ]
+        },
+        "grants": {
+            "nasdaq-center": [
+                {"id": "grant1", "title": "Tech Innovation Grant", "tenant_id": "nasdaq-center", "sponsor_id": "sponsor1"},
+                {"id": "grant2", "title": "Startup Accelerator", "tenant_id": "nasdaq-center", "sponsor_id": "sponsor2"}
+            ],
+            "tight5-digital": [
+                {"id": "grant3", "title": "Digital Transformation", "tenant_id": "tight5-digital", "sponsor_id": "sponsor3"}
+            ],
+            "innovation-hub": [
+                {"id": "grant4", "title": "Research Grant", "tenant_id": "innovation-hub", "sponsor_id": "sponsor4"}
+            ]
+        },
+        "relationships": {
+            "nasdaq-center": [
+                {"from": "person1", "to": "person2", "strength": 0.8, "tenant_id": "nasdaq-center"},
+                {"from": "person2", "to": "person3", "strength": 0.6, "tenant_id": "nasdaq-center"}
+            ],
+            "tight5-digital": [
+                {"from": "person4", "to": "person5", "strength": 0.9, "tenant_id": "tight5-digital"}
+            ],
+            "innovation-hub": [
+                {"from": "person6", "to": "person7", "strength": 0.7, "tenant_id": "innovation-hub"}
+            ]
+        }
+    }
+    data["_index"] = {
+        "sponsor_ids": {
+            tenant_id: frozenset(sponsor["id"] for sponsor in sponsors)
+            for tenant_id, sponsors in data["sponsors"].items()
+        },
+        "grant_ids": {
+            tenant_id: frozenset(grant["id"] for grant in grants)
+            for tenant_id, grants in data["grants"].items()
+        },
+        "persons": {
+            tenant_id: frozenset(person for rel in rels for person in (rel["from"], rel["to"]))
+            for tenant_id, rels in data["relationships"].items()
         }
+    }
+    return data
 
+
+class TestTenantIsolation:
+    """Test suite for multi-tenant data isolation and security"""
+    
     def test_jwt_token_tenant_isolation(self, test_tenants, test_tokens):
         """Test JWT tokens properly encode tenant information"""
         for tenant_id, tenant_data in test_tenants.items():
             for user in tenant_data["users"]:
-                token = test_tokens[tenant_id][user["user_id"]]
+                token = test_tokens[(tenant_id, user["user_id"])]
                 
                 # Verify token can be decoded
                 payload = verify_token(token)
@@ -127,8 +155,8 @@ class TestTenantIsolation:
     
     def test_cross_tenant_token_rejection(self, test_tokens):
         """Test that tokens from one tenant cannot access another tenant's data"""
-        nasdaq_token = test_tokens["nasdaq-center"]["user1"]
-        tight5_token = test_tokens["tight5-digital"]["user3"]
+        nasdaq_token = test_tokens[("nasdaq-center", "user1")]
+        tight5_token = test_tokens[("tight5-digital", "user3")]
         
         # Decode tokens to verify different tenant IDs
         nasdaq_payload = verify_token(nasdaq_token)
@@ -138,22 +166,56 @@ class TestTenantIsolation:
         assert nasdaq_payload["tenant_id"] == "nasdaq-center"
         assert tight5_payload["tenant_id"] == "tight5-digital"
     
+    def test_repeat_verification_uses_cache_safely(self, test_tokens):
+        """Test cached token verification returns independent claims and still rejects tampering"""
+        import hashlib
+        from server.auth import jwt_auth
+        
+        token = test_tokens[("nasdaq-center", "user1")]
+        key = hashlib.sha256(token.encode()).digest()[:16]
+        
+        with patch("server.auth.jwt_auth.VERIFIED_TOKEN_CACHE_ENABLED", True):
+            first = verify_token(token)
+            assert key in jwt_auth._verified_tokens
+            first["tenant_id"] = "tight5-digital"
+            second = verify_token(token)
+            assert second["tenant_id"] == "nasdaq-center"
+            
+            with pytest.raises(HTTPException) as exc_info:
+                verify_token(token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB"))
+            assert exc_info.value.status_code == 401
+    
+    def test_verification_cache_is_off_by_default(self):
+        """Test tokens are fully verified and not cached unless the verification cache is enabled"""
+        import hashlib
+        from server.auth import jwt_auth
+        
+        token = create_access_token(
+            user_id="uncached_user",
+            email="uncached@thecenter.nasdaq.org",
+            tenant_id="nasdaq-center",
+            role="user"
+        )
+        key = hashlib.sha256(token.encode()).digest()[:16]
+        
+        assert not jwt_auth.VERIFIED_TOKEN_CACHE_ENABLED
+        assert verify_token(token)["tenant_id"] == "nasdaq-center"
+        assert key not in jwt_auth._verified_tokens
+    
     @pytest.mark.asyncio
     async def test_tenant_context_validation(self, test_tenants):
         """Test tenant context validation middleware"""
         from server.middleware.tenant_context import TenantMiddleware, TenantContext
         
-        # Mock request with valid tenant header
-        mock_request = MagicMock()
-        mock_request.url.path = "/api/sponsors"
-        mock_request.headers = {"X-Tenant-ID": "nasdaq-center"}
-        mock_request.state = MagicMock()
-        
         # Mock app state with database manager
-        mock_app = MagicMock()
         mock_db_manager = AsyncMock()
         mock_db_manager.get_tenant_info.return_value = test_tenants["nasdaq-center"]
-        mock_request.app.state.db_manager = mock_db_manager
+        
+        # Request with valid tenant header
+        mock_request = FakeRequest(
+            headers={"X-Tenant-ID": "nasdaq-center"},
+            app=SimpleNamespace(state=SimpleNamespace(db_manager=mock_db_manager))
+        )
         
         middleware = TenantMiddleware(None)
         
@@ -168,89 +230,59 @@ class TestTenantIsolation:
         tenant = await middleware._validate_tenant("invalid-tenant", mock_request)
         assert tenant is None
     
-    def test_data_isolation_sponsors(self, mock_database, test_tokens):
+    @pytest.mark.parametrize("tenant_id, expected_count", [
+        ("nasdaq-center", 2),
+        ("tight5-digital", 1),
+        ("innovation-hub", 1),
+    ])
+    def test_data_isolation_sponsors(self, mock_database, tenant_id, expected_count):
         """Test sponsor data is properly isolated by tenant"""
         # Simulate database query with tenant filter
-        def get_sponsors_by_tenant(tenant_id):
-            return mock_database["sponsors"].get(tenant_id, [])
+        sponsors = mock_database["sponsors"].get(tenant_id, [])
         
         # Test each tenant sees only their sponsors
-        nasdaq_sponsors = get_sponsors_by_tenant("nasdaq-center")
-        tight5_sponsors = get_sponsors_by_tenant("tight5-digital")
-        innovation_sponsors = get_sponsors_by_tenant("innovation-hub")
-        
-        assert len(nasdaq_sponsors) == 2
-        assert len(tight5_sponsors) == 1
-        assert len(innovation_sponsors) == 1
-        
-        # Verify sponsor data contains correct tenant_id
-        for sponsor in nasdaq_sponsors:
-            assert sponsor["tenant_id"] == "nasdaq-center"
-        
-        for sponsor in tight5_sponsors:
-            assert sponsor["tenant_id"] == "tight5-digital"
-        
-        for sponsor in innovation_sponsors:
-            assert sponsor["tenant_id"] == "innovation-hub"
+        assert len(sponsors) == expected_count
+        assert {sponsor["tenant_id"] for sponsor in sponsors} == {tenant_id}
     
-    def test_data_isolation_grants(self, mock_database):
+    @pytest.mark.parametrize("tenant_id, expected_ids", [
+        ("nasdaq-center", {"grant1", "grant2"}),
+        ("tight5-digital", {"grant3"}),
+        ("innovation-hub", {"grant4"}),
+    ])
+    def test_data_isolation_grants(self, mock_database, tenant_id, expected_ids):
         """Test grant data is properly isolated by tenant"""
-        def get_grants_by_tenant(tenant_id):
-            return mock_database["grants"].get(tenant_id, [])
-        
-        nasdaq_grants = get_grants_by_tenant("nasdaq-center")
-        tight5_grants = get_grants_by_tenant("tight5-digital")
-        innovation_grants = get_grants_by_tenant("innovation-hub")
-        
-        assert len(nasdaq_grants) == 2
-        assert len(tight5_grants) == 1
-        assert len(innovation_grants) == 1
+        grants = mock_database["grants"].get(tenant_id, [])
+        assert {grant["id"] for grant in grants} == expected_ids
         
         # Verify no cross-tenant data leakage
-        all_nasdaq_grant_ids = [g["id"] for g in nasdaq_grants]
-        all_tight5_grant_ids = [g["id"] for g in tight5_grants]
-        
-        assert "grant1" in all_nasdaq_grant_ids
-        assert "grant2" in all_nasdaq_grant_ids
-        assert "grant3" not in all_nasdaq_grant_ids
-        assert "grant3" in all_tight5_grant_ids
+        grant_ids = mock_database["_index"]["grant_ids"]
+        for other_tenant, other_ids in grant_ids.items():
+            if other_tenant != tenant_id:
+                assert grant_ids[tenant_id].isdisjoint(other_ids)
     
-    def test_relationship_data_isolation(self, mock_database):
+    @pytest.mark.parametrize("tenant_id, expected_persons", [
+        ("nasdaq-center", {"person1", "person2", "person3"}),
+        ("tight5-digital", {"person4", "person5"}),
+        ("innovation-hub", {"person6", "person7"}),
+    ])
+    def test_relationship_data_isolation(self, mock_database, tenant_id, expected_persons):
         """Test relationship data is properly isolated by tenant"""
-        def get_relationships_by_tenant(tenant_id):
-            return mock_database["relationships"].get(tenant_id, [])
-        
-        nasdaq_rels = get_relationships_by_tenant("nasdaq-center")
-        tight5_rels = get_relationships_by_tenant("tight5-digital")
-        innovation_rels = get_relationships_by_tenant("innovation-hub")
-        
-        # Verify relationship isolation
-        assert len(nasdaq_rels) == 2
-        assert len(tight5_rels) == 1
-        assert len(innovation_rels) == 1
+        rels = mock_database["relationships"].get(tenant_id, [])
+        assert {rel["tenant_id"] for rel in rels} == {tenant_id}
         
         # Check relationship persons don't cross tenant boundaries
-        nasdaq_persons = set()
-        for rel in nasdaq_rels:
-            nasdaq_persons.add(rel["from"])
-            nasdaq_persons.add(rel["to"])
-        
-        tight5_persons = set()
-        for rel in tight5_rels:
-            tight5_persons.add(rel["from"])
-            tight5_persons.add(rel["to"])
-        
-        # Verify no person overlap between tenants
-        assert nasdaq_persons.isdisjoint(tight5_persons)
+        persons = mock_database["_index"]["persons"]
+        assert persons[tenant_id] == expected_persons
+        for other_tenant, other_persons in persons.items():
+            if other_tenant != tenant_id:
+                assert persons[tenant_id].isdisjoint(other_persons)
     
     def test_missing_tenant_context_error(self):
         """Test proper error handling when tenant context is missing"""
         from server.middleware.tenant_context import require_tenant
         
-        # Mock request without tenant context
-        mock_request = MagicMock()
-        mock_request.state = MagicMock()
-        mock_request.state.tenant = None
+        # Request without tenant context
+        mock_request = FakeRequest(state=SimpleNamespace(tenant=None))
         
         with pytest.raises(HTTPException) as exc_info:
             require_tenant(mock_request)
@@ -329,8 +361,8 @@ class TestTenantIsolation:
     
     def test_role_based_access_within_tenant(self, test_tenants, test_tokens):
         """Test role-based access control within tenant boundaries"""
-        nasdaq_admin_token = test_tokens["nasdaq-center"]["user1"]
-        nasdaq_manager_token = test_tokens["nasdaq-center"]["user2"]
+        nasdaq_admin_token = test_tokens[("nasdaq-center", "user1")]
+        nasdaq_manager_token = test_tokens[("nasdaq-center", "user2")]
         
         admin_payload = verify_token(nasdaq_admin_token)
         manager_payload = verify_token(nasdaq_manager_token)
@@ -343,13 +375,13 @@ class TestTenantIsolation:
         assert manager_payload["role"] == "manager"
         
         # Admin should have higher privileges than manager
-        role_hierarchy = {"viewer": 1, "user": 2, "manager": 3, "admin": 4, "owner": 5}
-        assert role_hierarchy[admin_payload["role"]] > role_hierarchy[manager_payload["role"]]
+        assert ROLE_LEVELS[admin_payload["role"]] > ROLE_LEVELS[manager_payload["role"]]
+        assert Role.ADMIN > Role.MANAGER
     
     def test_tenant_switching_validation(self, test_tokens):
         """Test that users cannot switch to unauthorized tenants"""
         # User from nasdaq-center trying to access tight5-digital data
-        nasdaq_token = test_tokens["nasdaq-center"]["user1"]
+        nasdaq_token = test_tokens[("nasdaq-center", "user1")]
         nasdaq_payload = verify_token(nasdaq_token)
         
         # User should only be able to access their tenant
@@ -366,7 +398,7 @@ class TestTenantIsolation:
         """Test concurrent operations across multiple tenants"""
         async def simulate_tenant_operation(tenant_id, operation_type):
             """Simulate database operation for specific tenant"""
-            await asyncio.sleep(0.1)  # Simulate async operation
+            await asyncio.sleep(0)  # Yield to the loop so operations interleave
             
             if operation_type == "sponsors":
                 return mock_database["sponsors"].get(tenant_id, [])
@@ -397,14 +429,14 @@ class TestTenantIsolation:
         assert len(nasdaq_grants) == 2
         
         # Verify tenant IDs are correct
-        for sponsor in nasdaq_sponsors:
-            assert sponsor["tenant_id"] == "nasdaq-center"
-        
-        for sponsor in tight5_sponsors:
-            assert sponsor["tenant_id"] == "tight5-digital"
+        assert {sponsor["tenant_id"] for sponsor in nasdaq_sponsors} == {"nasdaq-center"}
+        assert {sponsor["tenant_id"] for sponsor in tight5_sponsors} == {"tight5-digital"}
     
     def test_tenant_data_cleanup_isolation(self, mock_database):
         """Test that data cleanup operations respect tenant boundaries"""
+        # Private copy so a real delete here could not leak into the shared fixture
+        mock_database = copy.deepcopy(mock_database)
+        
         def cleanup_tenant_data(tenant_id, data_type):
             """Simulate cleanup operation for specific tenant"""
             if data_type in mock_database and tenant_id in mock_database[data_type]:
@@ -5,6 +5,8 @@ Optimized for Replit environment with tenant isolation
 import os
 import sqlite3
 import logging
+import time
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import asyncpg
@@ -13,9 +15,15 @@ import json
 logger = logging.getLogger("zero-gate.database")
 
 class DatabaseManager:
+    TENANT_CACHE_SIZE = 1024
+    TENANT_CACHE_TTL = 60  # seconds
+    TENANT_MISS_CACHE_TTL = 5  # unknown tenant ids are remembered only briefly
+    
     def __init__(self):
         self.connection_pool = None
         self.tenant_databases = {}
+        # tenant_id -> (tenant row or None, expiry on the monotonic clock)
+        self._tenant_cache: "OrderedDict[str, tuple]" = OrderedDict()
         
     async def initialize(self):
         """Initialize database connections"""
@@ -163,19 +171,38 @@ class DatabaseManager:
         logger.info("Tenant database schema created")
     
     async def get_tenant_info(self, tenant_id: str) -> Optional[Dict[str, Any]]:
-        """Get tenant information from central database"""
+        """Get tenant information from central database
+        
+        Lookups are cached for TENANT_CACHE_TTL seconds, and unknown tenants
+        for TENANT_MISS_CACHE_TTL; call invalidate_tenant after changing a tenant.
+        """
         if not self.connection_pool:
             return None
+        
+        now = time.monotonic()
+        cached = self._tenant_cache.get(tenant_id)
+        if cached is not None:
+            if now < cached[1]:
+                self._tenant_cache.move_to_end(tenant_id)
+                return dict(cached[0]) if cached[0] is not None else None
+            del self._tenant_cache[tenant_id]
             
         async with self.connection_pool.acquire() as conn:
             row = await conn.fetchrow(
                 "SELECT * FROM tenants WHERE tenant_id = $1",
                 tenant_id
             )
-            
-            if row:
-                return dict(row)
-            return None
+        
+        tenant = dict(row) if row else None
+        ttl = self.TENANT_CACHE_TTL if tenant is not None else self.TENANT_MISS_CACHE_TTL
+        self._tenant_cache[tenant_id] = (tenant, now + ttl)
+        if len(self._tenant_cache) > self.TENANT_CACHE_SIZE:
+            self._tenant_cache.popitem(last=False)
+        return dict(tenant) if tenant is not None else None
+    
+    def invalidate_tenant(self, tenant_id: str):
+        """Drop a cached tenant lookup, e.g. after the tenant was updated"""
+        self._tenant_cache.pop(tenant_id, None)
     
     async def close(self):
         """Close all database connections"""
@@ -2,15 +2,33 @@
 Resource monitoring for Zero Gate ESO Platform
 Optimized for Replit environment constraints
 """
+import asyncio
 import psutil
-import threading
 import time
 import logging
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 
 logger = logging.getLogger("zero-gate.monitoring")
 
+DEFAULT_FEATURE_FLAGS = {
+    "advanced_analytics": True,
+    "relationship_mapping": True,
+    "excel_dashboard": True,
+    "content_generation": True,
+    "excel_processing": True,
+    "real_time_updates": True,
+    "background_sync": True,
+    "detailed_logging": True
+}
+
 class ResourceMonitor:
+    DISK_SAMPLE_INTERVAL = 60  # seconds; disk usage barely moves between samples
+    # Features shed at high load come back only once usage drops below these limits
+    RECOVERY_CPU = 70
+    RECOVERY_MEMORY = 75
+    RECOVERY_FEATURES = ("relationship_mapping", "content_generation")
+    
     def __init__(self, cpu_threshold: int = 65, memory_threshold: int = 70):
         self.cpu_threshold = cpu_threshold
         self.memory_threshold = memory_threshold
@@ -19,47 +37,72 @@ class ResourceMonitor:
             "memory": 0.0,
             "disk": 0.0
         }
-        self.feature_flags = {
-            "advanced_analytics": True,
-            "relationship_mapping": True,
-            "excel_dashboard": True,
-            "content_generation": True,
-            "excel_processing": True,
-            "real_time_updates": True,
-            "background_sync": True,
-            "detailed_logging": True
-        }
+        self.feature_flags = dict(DEFAULT_FEATURE_FLAGS)
+        # Flags chosen by the load tiers, and manual overrides layered on top of them
+        self._load_flags = dict(DEFAULT_FEATURE_FLAGS)
+        self._feature_overrides: Dict[str, bool] = {}
+        
+        # Read-only views handed to readers; the monitor task swaps in a new
+        # view when it replaces a dict, so reads need neither a lock nor a copy
+        self._usage_view = MappingProxyType(self.current_usage)
+        self._flags_view = MappingProxyType(self.feature_flags)
+        
+        # (cpu limit, memory limit, flags, log level, message), most severe first;
+        # the first tier whose CPU or memory limit is exceeded sets the flags it lists
+        critical_flags = {key: False for key in DEFAULT_FEATURE_FLAGS}
+        critical_flags["core_operations"] = True
+        high_flags = {"advanced_analytics": False, "relationship_mapping": False, "content_generation": False}
+        moderate_flags = {"advanced_analytics": False}
+        self._load_tiers = (
+            (90, 95, critical_flags, logging.CRITICAL, "System under extreme load - only core operations enabled"),
+            (80, 85, high_flags, logging.WARNING, "Additional features disabled due to high resource usage"),
+            (cpu_threshold, memory_threshold, moderate_flags, logging.INFO, "Advanced analytics disabled due to resource constraints")
+        )
+        
         self.running = False
-        self.thread = None
+        self.task: Optional[asyncio.Task] = None
+        self._disk_sampled_at: Optional[float] = None
+        self._disk_usage = 0.0
         
-    def start(self):
-        """Start resource monitoring in background thread"""
+        # Prime psutil's CPU counters; later non-blocking reads cover the time since the previous call
+        psutil.cpu_percent(interval=None)
+        
+    async def start(self):
+        """Start resource monitoring as a task on the running event loop"""
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        self.task = asyncio.create_task(self._monitor_loop())
         logger.info("Resource monitoring started")
         
-    def stop(self):
+    async def stop(self):
         """Stop resource monitoring"""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=5)
+        if self.task:
+            self.task.cancel()
+            await asyncio.wait([self.task], timeout=5)
+            self.task = None
         logger.info("Resource monitoring stopped")
         
-    def _monitor_loop(self):
+    def _read_usage(self) -> Tuple[float, float, float]:
+        """Read CPU, memory and disk usage; blocking psutil calls, run off the event loop"""
+        return (
+            psutil.cpu_percent(interval=None),
+            psutil.virtual_memory().percent,
+            self._sample_disk_usage()
+        )
+        
+    async def _monitor_loop(self):
         """Main monitoring loop"""
         while self.running:
             try:
                 # Get current resource usage
-                cpu_usage = psutil.cpu_percent(interval=1)
-                memory_usage = psutil.virtual_memory().percent
-                disk_usage = psutil.disk_usage('/').percent
+                cpu_usage, memory_usage, disk_usage = await asyncio.to_thread(self._read_usage)
                 
-                self.current_usage.update({
+                self.current_usage = {
                     "cpu": cpu_usage,
                     "memory": memory_usage,
                     "disk": disk_usage
-                })
+                }
+                self._usage_view = MappingProxyType(self.current_usage)
                 
                 # Update feature flags based on resource usage
                 self._update_feature_flags(cpu_usage, memory_usage)
@@ -67,54 +110,62 @@ class ResourceMonitor:
                 # Log warnings for high usage
                 if cpu_usage > self.cpu_threshold or memory_usage > self.memory_threshold:
                     logger.warning(
-                        f"High resource usage - CPU: {cpu_usage}%, Memory: {memory_usage}%"
+                        "High resource usage - CPU: %s%%, Memory: %s%%", cpu_usage, memory_usage
                     )
                 
-                time.sleep(5)  # Check every 5 seconds
+                await asyncio.sleep(5)  # Check every 5 seconds
                 
             except Exception as e:
                 logger.error(f"Error in resource monitoring: {str(e)}")
-                time.sleep(10)
+                await asyncio.sleep(10)
+    
+    def _sample_disk_usage(self) -> float:
+        """Disk usage percentage, re-read at most once per DISK_SAMPLE_INTERVAL"""
+        now = time.monotonic()
+        if self._disk_sampled_at is None or now - self._disk_sampled_at >= self.DISK_SAMPLE_INTERVAL:
+            self._disk_sampled_at = now
+            self._disk_usage = psutil.disk_usage('/').percent
+        return self._disk_usage
     
     def _update_feature_flags(self, cpu_usage: float, memory_usage: float):
         """Update feature flags based on current resource usage"""
-        # Moderate usage - disable advanced analytics
-        if cpu_usage > self.cpu_threshold or memory_usage > self.memory_threshold:
-            self.feature_flags["advanced_analytics"] = False
-            logger.info("Advanced analytics disabled due to resource constraints")
-        else:
-            self.feature_flags["advanced_analytics"] = True
+        load_flags = dict(DEFAULT_FEATURE_FLAGS)
+        for cpu_limit, memory_limit, flags, level, message in self._load_tiers:
+            if cpu_usage > cpu_limit or memory_usage > memory_limit:
+                load_flags.update(flags)
+                logger.log(level, message)
+                break
         
-        # High usage - disable more features
-        if cpu_usage > 80 or memory_usage > 85:
-            self.feature_flags["relationship_mapping"] = False
-            self.feature_flags["content_generation"] = False
-            logger.warning("Additional features disabled due to high resource usage")
-        elif cpu_usage < 70 and memory_usage < 75:
-            self.feature_flags["relationship_mapping"] = True
-            self.feature_flags["content_generation"] = True
+        # Hold shed features off between the recovery and high limits so they don't flap
+        if cpu_usage >= self.RECOVERY_CPU or memory_usage >= self.RECOVERY_MEMORY:
+            for feature in self.RECOVERY_FEATURES:
+                if not self._load_flags[feature]:
+                    load_flags[feature] = False
         
-        # Critical usage - only core features
-        if cpu_usage > 90 or memory_usage > 95:
-            self.feature_flags = {key: False for key in self.feature_flags}
-            self.feature_flags["core_operations"] = True
-            logger.critical("System under extreme load - only core operations enabled")
+        self._load_flags = load_flags
+        self._publish_feature_flags()
+    
+    def _publish_feature_flags(self):
+        """Combine load and manual flags in one assignment and publish a read-only view"""
+        self.feature_flags = {**self._load_flags, **self._feature_overrides}
+        self._flags_view = MappingProxyType(self.feature_flags)
     
-    def get_current_usage(self) -> Dict[str, float]:
-        """Get current resource usage"""
-        return self.current_usage.copy()
+    def get_current_usage(self) -> Mapping[str, float]:
+        """Get current resource usage as a read-only mapping"""
+        return self._usage_view
     
-    def get_enabled_features(self) -> Dict[str, bool]:
-        """Get current feature flags"""
-        return self.feature_flags.copy()
+    def get_enabled_features(self) -> Mapping[str, bool]:
+        """Get current feature flags as a read-only mapping"""
+        return self._flags_view
     
     def is_feature_enabled(self, feature: str) -> bool:
         """Check if a specific feature is enabled"""
         return self.feature_flags.get(feature, False)
     
     def force_feature_state(self, feature: str, enabled: bool):
-        """Force a feature to be enabled or disabled"""
-        self.feature_flags[feature] = enabled
+        """Force a feature to be enabled or disabled, whatever the resource usage"""
+        self._feature_overrides[feature] = enabled
+        self._publish_feature_flags()
         logger.info(f"Feature {feature} {'enabled' if enabled else 'disabled'} manually")
     
     def get_memory_usage(self) -> float:
@@ -127,17 +178,19 @@ class ResourceMonitor:
             return 0.0
     
     def disable_feature(self, feature: str):
-        """Disable a specific feature"""
+        """Disable a specific feature until enable_feature is called"""
         if feature in self.feature_flags:
-            self.feature_flags[feature] = False
+            self._feature_overrides[feature] = False
+            self._publish_feature_flags()
             logger.info(f"Feature disabled: {feature}")
         else:
             logger.warning(f"Unknown feature: {feature}")
     
     def enable_feature(self, feature: str):
-        """Enable a specific feature"""
+        """Lift a manual override; the feature follows resource usage again"""
         if feature in self.feature_flags:
-            self.feature_flags[feature] = True
+            self._feature_overrides.pop(feature, None)
+            self._publish_feature_flags()
             logger.info(f"Feature enabled: {feature}")
         else:
             logger.warning(f"Unknown feature: {feature}")
@@ -2,13 +2,28 @@
 Tenant Context Middleware for Zero Gate ESO Platform
 Handles multi-tenant request processing and validation
 """
+import itertools
 import logging
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger("zero-gate.tenant-context")
 
+# Every casing of "true", so the admin header is matched without lowercasing it
+_ADMIN_MODE_VALUES = frozenset(map("".join, itertools.product(*zip("true", "TRUE"))))
+
+@dataclass(slots=True, frozen=True)
+class TenantRequestContext:
+    """Tenant context attached to each request as request.state.tenant_ctx"""
+    tenant_id: Optional[str]
+    user_id: Optional[str]
+    admin_mode: bool
+
+# Context seen by requests that did not pass through TenantMiddleware
+_NO_TENANT_CONTEXT = TenantRequestContext(None, None, False)
+
 class TenantMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
@@ -18,26 +33,27 @@ class TenantMiddleware(BaseHTTPMiddleware):
         # Extract tenant context from headers or session
         tenant_id = request.headers.get("X-Tenant-ID")
         user_id = request.headers.get("X-User-ID")
-        admin_mode = request.headers.get("X-Admin-Mode", "false").lower() == "true"
+        admin_mode = request.headers.get("X-Admin-Mode") in _ADMIN_MODE_VALUES
         
         # Add tenant context to request state
-        request.state.tenant_id = tenant_id
-        request.state.user_id = user_id
-        request.state.admin_mode = admin_mode
+        request.state.tenant_ctx = TenantRequestContext(tenant_id, user_id, admin_mode)
         
-        logger.debug(f"Processing request with tenant_id: {tenant_id}, user_id: {user_id}, admin_mode: {admin_mode}")
+        logger.debug("Processing request with tenant_id: %s, user_id: %s, admin_mode: %s", tenant_id, user_id, admin_mode)
         
         response = await call_next(request)
         return response
 
+def _tenant_context(request: Request) -> TenantRequestContext:
+    return getattr(request.state, 'tenant_ctx', _NO_TENANT_CONTEXT)
+
 def get_current_tenant(request: Request) -> Optional[str]:
     """Get current tenant ID from request"""
-    return getattr(request.state, 'tenant_id', None)
+    return _tenant_context(request).tenant_id
 
 def get_current_user(request: Request) -> Optional[str]:
     """Get current user ID from request"""
-    return getattr(request.state, 'user_id', None)
+    return _tenant_context(request).user_id
 
 def is_admin_mode(request: Request) -> bool:
     """Check if request is in admin mode"""
-    return getattr(request.state, 'admin_mode', False)
\ No newline at end of file
+    return _tenant_context(request).admin_mode